@@ -3,46 +3,51 @@
 Analisis: PUT SPY $690 - Vale la pena?
 """
 
-import yaml
-import yfinance as yf
+import sys
+import numpy as np
+from concurrent.futures import ThreadPoolExecutor
 from datetime import datetime, timedelta
-from alpaca.data.historical import StockHistoricalDataClient
-from alpaca.data.requests import StockBarsRequest
 from alpaca.data.timeframe import TimeFrame, TimeFrameUnit
 
+from data_cache import get_bars, get_front_month_chain, strike_row, strike_window
+from session import get_client
+
 symbol = 'SPY'
 target_strike = 690.0
 
-with open('config.yaml', 'r') as f:
-    config = yaml.safe_load(f)
-
-client = StockHistoricalDataClient(
-    config['alpaca']['api_key'],
-    config['alpaca']['api_secret']
+# Escenarios: (descripcion, valor estimado del put bajo-alto; None = expira sin valor)
+SCENARIOS = (
+    ('SPY baja a 689', 1.0, 1.5),
+    ('SPY baja a 688 (max pain)', 2.0, 2.5),
+    ('SPY se queda en 692-693', None, None),
+    ('SPY sube a 695', None, None),
 )
 
+client = get_client()
+
+# Barras (Alpaca) y opciones (Yahoo) son independientes: se piden en paralelo
+with ThreadPoolExecutor(max_workers=2) as executor:
+    bars_future = executor.submit(
+        get_bars, client, symbol,
+        TimeFrame(1, TimeFrameUnit.Minute),
+        datetime.now() - timedelta(hours=2)
+    )
+    chain_future = executor.submit(get_front_month_chain, symbol)
+    bars = bars_future.result()
+    exp, chain = chain_future.result()
+
 # Precio actual
-req = StockBarsRequest(
-    symbol_or_symbols=symbol,
-    timeframe=TimeFrame(1, TimeFrameUnit.Minute),
-    start=datetime.now() - timedelta(hours=2)
-)
-bars = client.get_stock_bars(req)
-price = float(bars.data[symbol][-1].close)
-vwap = float(bars.data[symbol][-1].vwap)
+bars_list = bars.data[symbol]
+price = float(bars_list[-1].close)
+vwap = float(bars_list[-1].vwap)
 
 # Datos de hoy
-df_today = [b for b in bars.data[symbol]]
-high_today = max(b.high for b in df_today)
-low_today = min(b.low for b in df_today)
-
-# Opciones
-ticker = yf.Ticker(symbol)
-exp = ticker.options[0]
-chain = ticker.option_chain(exp)
+n_bars = len(bars_list)
+high_today = float(np.fromiter((b.high for b in bars_list), dtype=np.float64, count=n_bars).max())
+low_today = float(np.fromiter((b.low for b in bars_list), dtype=np.float64, count=n_bars).min())
 
 # El put de 690
-put_690 = chain.puts[chain.puts['strike'] == target_strike]
+put_690 = strike_row(chain.puts, target_strike)
 
 print('=' * 70)
 print(f'    ANALISIS: PUT SPY 690 - 0DTE')
@@ -53,8 +58,8 @@ print(f'  TARGET STRIKE:  {target_strike:.2f}')
 print(f'  DISTANCIA:      {price - target_strike:.2f} ({(price - target_strike)/price*100:.2f}%)')
 print()
 
-if not put_690.empty:
-    p = put_690.iloc[0]
+if put_690 is not None:
+    p = put_690
     print(f'  PUT 690 DATOS ACTUALES:')
     print(f'    Bid:    {p.bid:.2f}')
     print(f'    Ask:    {p.ask:.2f}')
@@ -87,10 +92,10 @@ print(f'      El precio tiende a ir hacia max pain')
 favorable += 1
 
 # Put/Call ratio
-calls_near = chain.calls[(chain.calls['strike'] >= price - 10) & (chain.calls['strike'] <= price + 10)]
-puts_near = chain.puts[(chain.puts['strike'] >= price - 10) & (chain.puts['strike'] <= price + 10)]
-call_vol = calls_near['volume'].sum()
-put_vol = puts_near['volume'].sum()
+calls_near = strike_window(chain.calls, price - 10, price + 10)
+puts_near = strike_window(chain.puts, price - 10, price + 10)
+call_vol = chain.calls['volume'][calls_near].sum()
+put_vol = chain.puts['volume'][puts_near].sum()
 pcr = put_vol / call_vol if call_vol > 0 else 1
 
 if pcr > 1:
@@ -100,7 +105,9 @@ else:
     print(f'    - Put/Call Ratio ({pcr:.2f}) no muy favorable')
 
 # Unusual activity
-unusual_puts = len(puts_near[puts_near['volume'] > puts_near['openInterest'] * 2])
+unusual_puts = int(np.count_nonzero(
+    chain.puts['volume'][puts_near] > chain.puts['openInterest'][puts_near] * 2
+))
 if unusual_puts > 5:
     print(f'    + Unusual activity en puts ({unusual_puts} strikes)')
     print(f'      Smart money apostando a caida')
@@ -148,8 +155,8 @@ print('=' * 70)
 print('  EL TRADE')
 print('=' * 70)
 
-if not put_690.empty:
-    p = put_690.iloc[0]
+if put_690 is not None:
+    p = put_690
     cost = p.ask
     print()
     print(f'    SI COMPRAS PUT 690:')
@@ -159,21 +166,20 @@ if not put_690.empty:
     print()
     print(f'    ESCENARIOS:')
     print()
-    print(f'    1. SPY baja a 689:')
-    print(f'       Put valdria ~1.00-1.50')
-    print(f'       Ganancia: {((1.0 - cost)/cost)*100:.0f}% a {((1.5 - cost)/cost)*100:.0f}%')
-    print()
-    print(f'    2. SPY baja a 688 (max pain):')
-    print(f'       Put valdria ~2.00-2.50')
-    print(f'       Ganancia: {((2.0 - cost)/cost)*100:.0f}% a {((2.5 - cost)/cost)*100:.0f}%')
-    print()
-    print(f'    3. SPY se queda en 692-693:')
-    print(f'       Put expira sin valor')
-    print(f'       Pierdes: 100% ({cost * 100:.0f} USD)')
-    print()
-    print(f'    4. SPY sube a 695:')
-    print(f'       Put expira sin valor')
-    print(f'       Pierdes: 100% ({cost * 100:.0f} USD)')
+    blocks = []
+    for i, (label, lo, hi) in enumerate(SCENARIOS, 1):
+        if lo is None:
+            outcome = (
+                '       Put expira sin valor\n'
+                f'       Pierdes: 100% ({cost * 100:.0f} USD)\n'
+            )
+        else:
+            outcome = (
+                f'       Put valdria ~{lo:.2f}-{hi:.2f}\n'
+                f'       Ganancia: {(lo - cost) / cost * 100:.0f}% a {(hi - cost) / cost * 100:.0f}%\n'
+            )
+        blocks.append(f'    {i}. {label}:\n{outcome}')
+    sys.stdout.write('\n'.join(blocks))
 
 print()
 print('=' * 70)
@@ -1,101 +1,41 @@
 #!/usr/bin/env python3
 """Analisis SPY en tiempo real"""
 
-import yaml
-import pandas as pd
-import numpy as np
 from datetime import datetime, timedelta
-from alpaca.data.historical import StockHistoricalDataClient
-from alpaca.data.requests import StockBarsRequest
 from alpaca.data.timeframe import TimeFrame, TimeFrameUnit
 
-with open('config.yaml', 'r') as f:
-    config = yaml.safe_load(f)
+from data_cache import bar_columns, get_bars
+from indicators import compute_all
+from session import get_client
 
-client = StockHistoricalDataClient(
-    config['alpaca']['api_key'],
-    config['alpaca']['api_secret']
-)
+client = get_client()
 
 print('=' * 60)
 print('    ANALISIS SPY EN TIEMPO REAL')
 print('=' * 60)
 
-req = StockBarsRequest(
-    symbol_or_symbols='SPY',
-    timeframe=TimeFrame(15, TimeFrameUnit.Minute),
-    start=datetime.now() - timedelta(days=2)
+bars = get_bars(
+    client, 'SPY',
+    TimeFrame(15, TimeFrameUnit.Minute),
+    datetime.now() - timedelta(days=2)
 )
-bars = client.get_stock_bars(req)
-
-df = pd.DataFrame([{
-    'timestamp': b.timestamp,
-    'open': b.open, 'high': b.high, 'low': b.low,
-    'close': b.close, 'volume': b.volume, 'vwap': b.vwap
-} for b in bars.data['SPY']])
-df['timestamp'] = pd.to_datetime(df['timestamp'])
-df.set_index('timestamp', inplace=True)
-
-close = df['close']
-high = df['high']
-low = df['low']
-
-# RSI
-delta = close.diff()
-gain = delta.where(delta > 0, 0).rolling(7).mean()
-loss = (-delta.where(delta < 0, 0)).rolling(7).mean()
-rs = gain / loss.replace(0, np.nan)
-df['rsi'] = 100 - (100 / (1 + rs))
-
-# MACD
-ema_fast = close.ewm(span=6).mean()
-ema_slow = close.ewm(span=13).mean()
-df['macd_hist'] = ema_fast - ema_slow - (ema_fast - ema_slow).ewm(span=5).mean()
 
-# EMAs
-df['ema9'] = close.ewm(span=9).mean()
-df['ema21'] = close.ewm(span=21).mean()
-df['ema50'] = close.ewm(span=50).mean()
+# Columnas (struct-of-arrays) extraidas en bloque, sin un dict por barra
+bars_list = bars.data['SPY']
+h, l, c, v, w = bar_columns(bars_list, 'high', 'low', 'close', 'volume', 'vwap')
 
-# ATR
-tr = pd.concat([high - low, abs(high - close.shift()), abs(low - close.shift())], axis=1).max(axis=1)
-df['atr'] = tr.rolling(14).mean()
-
-# ADX
-plus_dm = high.diff()
-minus_dm = -low.diff()
-plus_dm = plus_dm.where((plus_dm > minus_dm) & (plus_dm > 0), 0)
-minus_dm = minus_dm.where((minus_dm > plus_dm) & (minus_dm > 0), 0)
-atr_calc = df['atr'].replace(0, np.nan)
-plus_di = 100 * (plus_dm.rolling(14).mean() / atr_calc)
-minus_di = 100 * (minus_dm.rolling(14).mean() / atr_calc)
-dx = 100 * abs(plus_di - minus_di) / (plus_di + minus_di).replace(0, np.nan)
-df['adx'] = dx.rolling(14).mean()
-
-# Volume
-df['vol_sma'] = df['volume'].rolling(20).mean()
-df['vol_ratio'] = df['volume'] / df['vol_sma'].replace(0, np.nan)
-df['mom'] = close.pct_change(5) * 100
+ind = compute_all(h, l, c, v)
 
 # Current and previous
-row = df.iloc[-1]
-prev = df.iloc[-2]
-
-price = float(row['close'])
-vwap = float(row['vwap'])
-ema9 = float(row['ema9'])
-ema21 = float(row['ema21'])
-ema50 = float(row['ema50'])
-rsi = float(row['rsi'])
-adx = float(row['adx'])
-macd = float(row['macd_hist'])
-atr = float(row['atr'])
-vol = float(row['vol_ratio'])
-mom = float(row['mom'])
+price, vwap = float(c[-1]), float(w[-1])
+ema9, ema21, ema50, rsi, adx, macd, atr, vol, mom = (
+    float(ind[k][-1]) for k in ('ema9', 'ema21', 'ema50', 'rsi', 'adx', 'macd_hist', 'atr', 'vol_ratio', 'mom')
+)
+prev_close, prev_vwap, prev_macd = float(c[-2]), float(w[-2]), float(ind['macd_hist'][-2])
 
 print()
 print(f'PRECIO ACTUAL: ${price:.2f}')
-print(f'Timestamp: {row.name}')
+print(f'Timestamp: {bars_list[-1].timestamp}')
 print()
 print('NIVELES CLAVE:')
 vwap_pos = 'ARRIBA' if price > vwap else 'ABAJO'
@@ -129,10 +69,10 @@ print(f'  Bullish Stack: {bull_str}')
 print(f'  Bearish Stack: {bear_str}')
 print()
 print('CRUCES RECIENTES:')
-vwap_cross_up = price > vwap and float(prev['close']) <= float(prev['vwap'])
-vwap_cross_dn = price < vwap and float(prev['close']) >= float(prev['vwap'])
-macd_cross_up = macd > 0 and float(prev['macd_hist']) <= 0
-macd_cross_dn = macd < 0 and float(prev['macd_hist']) >= 0
+vwap_cross_up = price > vwap and prev_close <= prev_vwap
+vwap_cross_dn = price < vwap and prev_close >= prev_vwap
+macd_cross_up = macd > 0 and prev_macd <= 0
+macd_cross_dn = macd < 0 and prev_macd >= 0
 
 vwap_cross_str = 'ALCISTA!' if vwap_cross_up else ('BAJISTA!' if vwap_cross_dn else 'No')
 macd_cross_str = 'ALCISTA!' if macd_cross_up else ('BAJISTA!' if macd_cross_dn else 'No')
@@ -140,27 +80,15 @@ print(f'  VWAP cruce: {vwap_cross_str}')
 print(f'  MACD cruce: {macd_cross_str}')
 print()
 
-# Count signals
-b, s = 0, 0
-if price > vwap: b += 1
-else: s += 1
-if ema9 > ema21: b += 1
-else: s += 1
-if stack_bull: b += 1
-elif stack_bear: s += 1
-if macd > 0: b += 1
-elif macd < 0: s += 1
-if 50 < rsi < 70: b += 1
-elif 30 < rsi < 50: s += 1
-if mom > 0.1: b += 1
-elif mom < -0.1: s += 1
-if vol > 1.2:
-    if b > s: b += 1
-    elif s > b: s += 1
-if vwap_cross_up: b += 1
-if vwap_cross_dn: s += 1
-if macd_cross_up: b += 1
-if macd_cross_dn: s += 1
+# Count signals (sumas de booleanos, sin cadena de if/elif)
+bull = (price > vwap, ema9 > ema21, stack_bull, macd > 0, 50 < rsi < 70, mom > 0.1)
+bear = (price <= vwap, ema9 <= ema21, stack_bear, macd < 0, 30 < rsi < 50, mom < -0.1)
+b, s = sum(bull), sum(bear)
+# Volumen alto refuerza al lado que va ganando (antes de sumar los cruces)
+vol_boost = vol > 1.2
+b, s = b + (vol_boost & (b > s)), s + (vol_boost & (s > b))
+b += vwap_cross_up + macd_cross_up
+s += vwap_cross_dn + macd_cross_dn
 
 print(f'SCORE: Bullish={b} vs Bearish={s}')
 print()
@@ -3,13 +3,13 @@
 AUDITORIA DE DATOS - Verificacion de fuentes
 """
 
-import yaml
-import yfinance as yf
+import numpy as np
 from datetime import datetime, timedelta
-from alpaca.data.historical import StockHistoricalDataClient
-from alpaca.data.requests import StockBarsRequest
 from alpaca.data.timeframe import TimeFrame, TimeFrameUnit
 
+from data_cache import contract, get_bars, get_front_month_chain, strike_row, strike_window
+from session import get_client
+
 print('=' * 70)
 print('    AUDITORIA DE DATOS - VERIFICACION')
 print('=' * 70)
@@ -21,20 +21,13 @@ print()
 print('1. PRECIO (Alpaca API)')
 print('-' * 70)
 
-with open('config.yaml', 'r') as f:
-    config = yaml.safe_load(f)
-
-client = StockHistoricalDataClient(
-    config['alpaca']['api_key'],
-    config['alpaca']['api_secret']
-)
+client = get_client()
 
-req = StockBarsRequest(
-    symbol_or_symbols=symbol,
-    timeframe=TimeFrame(1, TimeFrameUnit.Minute),
-    start=datetime.now() - timedelta(minutes=10)
+bars = get_bars(
+    client, symbol,
+    TimeFrame(1, TimeFrameUnit.Minute),
+    datetime.now() - timedelta(minutes=10)
 )
-bars = client.get_stock_bars(req)
 last_bar = bars.data[symbol][-1]
 
 print(f'   Fuente: Alpaca Markets API')
@@ -55,22 +48,19 @@ print()
 print('2. OPCIONES (Yahoo Finance API)')
 print('-' * 70)
 
-ticker = yf.Ticker(symbol)
-exp = ticker.options[0]
-chain = ticker.option_chain(exp)
+exp, chain = get_front_month_chain(symbol)
 
 print(f'   Fuente: Yahoo Finance (yfinance library)')
 print(f'   Tipo: Datos de opciones publicos')
 print(f'   Expiracion: {exp}')
-print(f'   Total Calls en cadena: {len(chain.calls)}')
-print(f'   Total Puts en cadena: {len(chain.puts)}')
+print(f'   Total Calls en cadena: {len(chain.calls["strike"])}')
+print(f'   Total Puts en cadena: {len(chain.puts["strike"])}')
 print()
 
 # Muestra ejemplo de datos reales
 print('   EJEMPLO - Call Strike 693:')
-call_example = chain.calls[chain.calls['strike'] == 693.0]
-if not call_example.empty:
-    c = call_example.iloc[0]
+c = strike_row(chain.calls, 693.0)
+if c is not None:
     print(f'     Strike: {c.strike}')
     print(f'     Last Price: ${c.lastPrice}')
     print(f'     Bid: ${c.bid}')
@@ -90,11 +80,11 @@ print('-' * 70)
 price = float(last_bar.close)
 
 # Put/Call Ratio
-calls_near = chain.calls[(chain.calls['strike'] >= price - 20) & (chain.calls['strike'] <= price + 20)]
-puts_near = chain.puts[(chain.puts['strike'] >= price - 20) & (chain.puts['strike'] <= price + 20)]
+calls_near = strike_window(chain.calls, price - 20, price + 20)
+puts_near = strike_window(chain.puts, price - 20, price + 20)
 
-call_vol = calls_near['volume'].sum()
-put_vol = puts_near['volume'].sum()
+call_vol = chain.calls['volume'][calls_near].sum()
+put_vol = chain.puts['volume'][puts_near].sum()
 pcr = put_vol / call_vol if call_vol > 0 else 0
 
 print(f'   PUT/CALL RATIO:')
@@ -105,11 +95,11 @@ print(f'     Resultado: {put_vol:,.0f} / {call_vol:,.0f} = {pcr:.4f}')
 print()
 
 # Walls
-call_wall_idx = calls_near['openInterest'].idxmax()
-put_wall_idx = puts_near['openInterest'].idxmax()
+call_wall_idx = calls_near.start + int(np.argmax(chain.calls['openInterest'][calls_near]))
+put_wall_idx = puts_near.start + int(np.argmax(chain.puts['openInterest'][puts_near]))
 
-call_wall_row = calls_near.loc[call_wall_idx]
-put_wall_row = puts_near.loc[put_wall_idx]
+call_wall_row = contract(chain.calls, call_wall_idx)
+put_wall_row = contract(chain.puts, put_wall_idx)
 
 print(f'   CALL WALL:')
 print(f'     Formula: Strike con MAYOR Open Interest en Calls')
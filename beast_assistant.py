@@ -10,77 +10,286 @@ Uso:
   python beast_assistant.py --telegram   # Modo Telegram Bot
 """
 
-import yaml
-import yfinance as yf
-import pandas as pd
+import asyncio
 import numpy as np
-from datetime import datetime, timedelta
+from concurrent.futures import ThreadPoolExecutor
+from dataclasses import dataclass
+from datetime import datetime, timedelta, timezone
 from typing import Optional, Dict, Any
 import re
 import sys
+import threading
+import time
 
 # Alpaca
-from alpaca.data.historical import StockHistoricalDataClient
 from alpaca.data.requests import StockBarsRequest
 from alpaca.data.timeframe import TimeFrame, TimeFrameUnit
 
+from data_cache import bar_columns, bar_epochs, contract, get_front_month_chain, strike_window
+from indicators import ewm_last, ewm_weights, rsi_sma_last, span_to_alpha
+from session import get_client, load_config
+
+# EMA9 / EMA21: solo se usa el ultimo valor, un producto punto con pesos precalculados
+EMA_SPANS = (9, 21)
+EMA_ALPHAS = span_to_alpha(EMA_SPANS)
+
+# Cache de precios: una entrada por simbolo, de 1 minuto, como maximo PRICE_CACHE_SIZE
+PRICE_CACHE_TTL = 60
+PRICE_CACHE_SIZE = 256
+# Ventana minima que se pide a Alpaca; las consultas mas cortas se recortan del cache
+PRICE_WINDOW_MINUTES = 120
+
+# Routing de process_query: patrones compilados y palabras clave, creados una vez
+SYMBOL_RE = re.compile(r'\b([A-Za-z]{1,5})\b')
+STRIKE_RE = re.compile(r'\b(\d{2,4}(?:\.\d{1,2})?)\b')
+
+# Palabras comunes en español e inglés que NO son símbolos
+COMMON_WORDS = frozenset({
+    # English
+    'A', 'I', 'THE', 'TO', 'FOR', 'AND', 'OR', 'IF', 'MY', 'ME',
+    'IT', 'IS', 'AT', 'ON', 'IN', 'UP', 'DO', 'GO', 'NO', 'SO',
+    'PUT', 'CALL', 'WILL', 'CAN', 'HOW', 'WHAT', 'CHECK', 'ANALYZE',
+    'NEED', 'MAKE', 'GET', 'BUY', 'SELL', 'FLOW', 'PRICE', 'TARGET',
+    # Español
+    'EL', 'LA', 'LOS', 'LAS', 'UN', 'UNA', 'DE', 'EN', 'QUE', 'Y',
+    'ES', 'SE', 'CON', 'POR', 'PARA', 'SU', 'AL', 'DEL', 'SI', 'NO',
+    'COMO', 'MAS', 'PERO', 'SUS', 'LE', 'YA', 'O', 'ESTE', 'HA',
+    'MI', 'ME', 'SIN', 'SOBRE', 'TODO', 'ESTA', 'ENTRE', 'CUANDO',
+    'MUY', 'SER', 'HAY', 'PUEDE', 'TODOS', 'ASI', 'NOS', 'OTROS',
+    'VA', 'IR', 'VER', 'DAR', 'BIEN', 'VAS', 'DIME', 'DAME',
+    'ANALIZA', 'CHECA', 'REVISA', 'PRECIO', 'CUANTO', 'DONDE',
+    'LLEGARA', 'SUBIRA', 'BAJARA', 'OPCIONES', 'AYUDA', 'OF', 'THE'
+})
+
+PUT_WORDS = (
+    'put', 'puts', 'baja', 'bajar', 'bajara', 'caer', 'caera',
+)
+CALL_WORDS = (
+    'call', 'calls', 'sube', 'subir', 'subira', 'arriba',
+)
+FLOW_WORDS = (
+    'flow', 'opciones', 'options', 'wall', 'pain', 'calls', 'puts',
+    'volumen de opciones',
+)
+TARGET_WORDS = (
+    'llegara', 'llegará', 'will it', 'make it', 'target', 'reach', 'tocara',
+    'tocará', 'alcanzara', 'alcanzará', 'puede llegar',
+)
+ANALYZE_WORDS = (
+    'analiza', 'analyze', 'check', 'checa', 'checar', 'como esta', 'cómo está',
+    'how is', 'revisa', 'revisar', 'dime de', 'que opinas', 'qué opinas',
+    'analisis', 'análisis', 'escanea', 'scan',
+)
+PRICE_WORDS = (
+    'precio', 'price', 'cuanto', 'cuánto', 'how much', 'a cuanto', 'a cuánto',
+    'en cuanto', 'cotiza',
+)
+DIRECTION_WORDS = (
+    'va a subir', 'va a bajar', 'sube o baja', 'up or down', 'going up',
+    'going down', 'direccion', 'dirección', 'tendencia',
+)
+HELP_WORDS = (
+    'ayuda', 'help', 'comandos', 'commands', 'que puedes', 'qué puedes',
+    'opciones', 'como funciona', 'cómo funciona',
+)
+
+
+def _keyword_re(words) -> re.Pattern:
+    """Una sola alternacion compilada: un barrido en C en vez de un `in` por palabra"""
+    return re.compile('|'.join(map(re.escape, words)))
+
+
+PUT_RE = _keyword_re(PUT_WORDS)
+CALL_RE = _keyword_re(CALL_WORDS)
+FLOW_RE = _keyword_re(FLOW_WORDS)
+TARGET_RE = _keyword_re(TARGET_WORDS)
+ANALYZE_RE = _keyword_re(ANALYZE_WORDS)
+PRICE_RE = _keyword_re(PRICE_WORDS)
+DIRECTION_RE = _keyword_re(DIRECTION_WORDS)
+HELP_RE = _keyword_re(HELP_WORDS)
+
+# Plantillas de respuesta: un solo str.format por respuesta
+RULE = '=' * 50
+
+ANALYZE_TEMPLATE = (
+    RULE + "\n"
+    "  {symbol} - ANALISIS\n"
+    + RULE + "\n"
+    "\n"
+    "  PRECIO: ${price:.2f}\n"
+    "  VWAP:   ${vwap:.2f} {vwap_tag}\n"
+    "  High:   ${high:.2f}\n"
+    "  Low:    ${low:.2f}\n"
+    "\n"
+    "  TECNICOS:\n"
+    "    EMA9:  ${ema9:.2f}\n"
+    "    EMA21: ${ema21:.2f}\n"
+    "    RSI:   {rsi:.1f}\n"
+    "    Mom:   {momentum:+.2f}%\n"
+    "\n"
+    "  SCORE: Bulls {bullish} vs Bears {bearish}\n"
+    "\n"
+    "  >> {trend}\n"
+    + RULE
+)
+
+TARGET_TEMPLATE = (
+    RULE + "\n"
+    "  {symbol} {option_type} ${strike}\n"
+    + RULE + "\n"
+    "\n"
+    "  Precio actual: ${price:.2f}\n"
+    "  Target:        ${strike:.2f}\n"
+    "  Distancia:     ${distance:.2f} ({distance_pct:.2f}%)\n"
+    "  ATRs needed:   {atrs_needed:.1f}\n"
+    "\n"
+    "  Mas cercano hoy: ${closest:.2f}\n"
+    "  Ya toco target?: {touched}\n"
+    "\n"
+    "  PROBABILIDAD: {prob}\n"
+    "\n"
+    "  >> {advice}\n"
+    + RULE
+)
+
+FLOW_TEMPLATE = (
+    RULE + "\n"
+    "  {symbol} - FLOW DE OPCIONES\n"
+    + RULE + "\n"
+    "\n"
+    "  Expiracion: {expiration}\n"
+    "  Precio:     ${price:.2f}\n"
+    "\n"
+    "  VOLUMEN:\n"
+    "    Calls: {call_vol:,.0f}\n"
+    "    Puts:  {put_vol:,.0f}\n"
+    "    P/C Ratio: {pcr:.2f}\n"
+    "\n"
+    "{walls}"
+    "  MAX PAIN:  ${max_pain:.0f}\n"
+    "\n"
+    "{signals}"
+    "\n"
+    "  SCORE: Bulls {bulls} vs Bears {bears}\n"
+    "  >> {verdict}\n"
+    + RULE
+)
+WALL_LINE = "  {label} ${strike:.0f} ({oi:,.0f} OI)\n"
+
+# Reglas de score del flow: (bulls, bears, explicacion) por resultado
+PCR_RULES = (                       # indice = (pcr >= 0.9) + (pcr > 1.1)
+    (2, 0, "  + P/C < 0.9 = Bullish\n"),
+    (0, 0, ""),
+    (0, 2, "  + P/C > 1.1 = Bearish\n"),
+)
+MAX_PAIN_RULES = (                  # indice = price > max_pain
+    (1, 0, "  + Precio abajo de Max Pain = puede subir\n"),
+    (0, 1, "  + Precio arriba de Max Pain = puede bajar\n"),
+)
+FLOW_VERDICTS = ("FLOW FAVORECE: PUTS", "FLOW: NEUTRAL", "FLOW FAVORECE: CALLS")  # indice = signo(bulls - bears) + 1
+
+
+@dataclass
+class Bars:
+    """Barras de 1 minuto como columnas NumPy (struct-of-arrays); ts en segundos epoch"""
+    ts: np.ndarray
+    open: np.ndarray
+    high: np.ndarray
+    low: np.ndarray
+    close: np.ndarray
+    volume: np.ndarray
+    vwap: np.ndarray
+    
+    def since(self, t: float) -> 'Bars':
+        """Vista de las barras con ts >= t (sin copiar)"""
+        i = int(np.searchsorted(self.ts, t))
+        return Bars(self.ts[i:], self.open[i:], self.high[i:], self.low[i:],
+                    self.close[i:], self.volume[i:], self.vwap[i:])
+
+
 class BeastAssistant:
     """Asistente de trading interactivo"""
     
     def __init__(self):
-        with open('config.yaml', 'r') as f:
-            self.config = yaml.safe_load(f)
-        
-        self.client = StockHistoricalDataClient(
-            self.config['alpaca']['api_key'],
-            self.config['alpaca']['api_secret']
-        )
+        # config.yaml y el cliente Alpaca se comparten en el proceso (session.py)
+        self.config = load_config()
+        self.client = get_client()
         
-        # Cache para no repetir llamadas
+        # Cache para no repetir llamadas: simbolo -> (time.monotonic(), minutos pedidos, barras)
         self.cache = {}
-        self.cache_time = {}
-        
-    def get_price_data(self, symbol: str, minutes: int = 60) -> pd.DataFrame:
-        """Obtiene datos de precio con cache"""
-        cache_key = f"{symbol}_{minutes}"
-        now = datetime.now()
-        
-        # Cache de 1 minuto
-        if cache_key in self.cache:
-            if (now - self.cache_time[cache_key]).seconds < 60:
-                return self.cache[cache_key]
-        
+        # process_query corre en hilos (pool de I/O, bot de Telegram)
+        self.cache_lock = threading.Lock()
+        
+        # Pool compartido para pedir Alpaca y Yahoo en paralelo
+        self.io_pool = ThreadPoolExecutor(max_workers=4)
+        
+        # Pesos EMA para la ventana mas larga (una barra por minuto)
+        self.ema_weights = ewm_weights(EMA_ALPHAS, PRICE_WINDOW_MINUTES + 1)
+        
+    def get_price_data(self, symbol: str, minutes: int = 60) -> Optional[Bars]:
+        """
+        Obtiene datos de precio con cache (None si no hay barras).
+        
+        Se pide una sola ventana por simbolo (al menos PRICE_WINDOW_MINUTES)
+        y las consultas mas cortas se recortan de ella, asi precio -> analisis
+        -> flow del mismo simbolo comparten una llamada a Alpaca.
+        """
+        # Cache de 1 minuto (reloj monotonico: un ajuste de hora no lo invalida)
+        hit = self.cache.get(symbol)
+        if hit is not None and time.monotonic() - hit[0] < PRICE_CACHE_TTL and hit[1] >= minutes:
+            data = hit[2].since(time.time() - minutes * 60)
+            return data if len(data.close) else None
+        
+        return self.get_price_data_bulk([symbol], minutes).get(symbol)
+    
+    def get_price_data_bulk(self, symbols, minutes: int = 60) -> Dict[str, Bars]:
+        """
+        Barras de varios simbolos en una sola peticion a Alpaca.
+        
+        Cada simbolo queda en el cache igual que con get_price_data; los
+        simbolos sin barras no aparecen en el resultado.
+        """
+        symbols = list(symbols)
+        stamp = time.monotonic()
+        cutoff = time.time() - minutes * 60
+        window = max(minutes, PRICE_WINDOW_MINUTES)
         req = StockBarsRequest(
-            symbol_or_symbols=symbol,
+            symbol_or_symbols=symbols,
             timeframe=TimeFrame(1, TimeFrameUnit.Minute),
-            start=now - timedelta(minutes=minutes)
+            start=datetime.now(timezone.utc) - timedelta(minutes=window)
         )
         bars = self.client.get_stock_bars(req)
         
-        if symbol not in bars.data:
-            return pd.DataFrame()
-        
-        df = pd.DataFrame([{
-            'timestamp': b.timestamp,
-            'open': float(b.open),
-            'high': float(b.high),
-            'low': float(b.low),
-            'close': float(b.close),
-            'volume': float(b.volume),
-            'vwap': float(b.vwap)
-        } for b in bars.data[symbol]])
-        
-        self.cache[cache_key] = df
-        self.cache_time[cache_key] = now
-        
-        return df
+        fetched = {}
+        for symbol in symbols:
+            bar_list = bars.data.get(symbol)
+            if bar_list:
+                # Columnas en bloque (attrgetter en C, sin bytecode por barra)
+                fetched[symbol] = Bars(bar_epochs(bar_list),
+                                       *bar_columns(bar_list, 'open', 'high', 'low', 'close', 'volume', 'vwap'))
+        
+        # Purga lo vencido y, si sigue lleno, las entradas mas viejas
+        with self.cache_lock:
+            for key in [k for k, (t, _, _) in self.cache.items() if stamp - t >= PRICE_CACHE_TTL]:
+                del self.cache[key]
+            for symbol, data in fetched.items():
+                self.cache.pop(symbol, None)
+                if len(self.cache) >= PRICE_CACHE_SIZE:
+                    del self.cache[next(iter(self.cache))]
+                self.cache[symbol] = (stamp, window, data)
+        
+        result = {}
+        for symbol, data in fetched.items():
+            data = data.since(cutoff)
+            if len(data.close):
+                result[symbol] = data
+        return result
     
     def get_options_data(self, symbol: str) -> Dict:
-        """Obtiene datos de opciones"""
+        """Obtiene datos de opciones (cache en disco de data_cache, columnas NumPy)"""
         try:
-            ticker = yf.Ticker(symbol)
-            exp = ticker.options[0]  # Primera expiracion (0DTE si existe)
-            chain = ticker.option_chain(exp)
+            # Primera expiracion (0DTE si existe)
+            exp, chain = get_front_month_chain(symbol)
             
             return {
                 'expiration': exp,
@@ -91,101 +300,57 @@ class BeastAssistant:
             return {'error': str(e)}
     
     def analyze_symbol(self, symbol: str) -> str:
-        """Analisis completo de un simbolo"""
-        symbol = symbol.upper()
-        df = self.get_price_data(symbol, 120)
+        """Analisis completo de un simbolo (ya en mayusculas, ver process_query)"""
+        bars = self.get_price_data(symbol, 120)
         
-        if df.empty:
+        if bars is None:
             return f"No pude obtener datos para {symbol}"
         
-        price = df['close'].iloc[-1]
-        vwap = df['vwap'].iloc[-1]
-        high = df['high'].max()
-        low = df['low'].min()
+        price = bars.close[-1]
+        vwap = bars.vwap[-1]
+        high = bars.high.max()
+        low = bars.low.min()
         
         # Calculos tecnicos
-        df['ema9'] = df['close'].ewm(span=9).mean()
-        df['ema21'] = df['close'].ewm(span=21).mean()
-        df['rsi'] = self._calc_rsi(df['close'])
-        
-        ema9 = df['ema9'].iloc[-1]
-        ema21 = df['ema21'].iloc[-1]
-        rsi = df['rsi'].iloc[-1]
+        ema9, ema21 = ewm_last(bars.close, EMA_ALPHAS, self.ema_weights)
+        rsi = rsi_sma_last(bars.close)
         
         # Momentum
-        momentum = ((price - df['close'].iloc[-10]) / df['close'].iloc[-10]) * 100
-        
-        # Construir respuesta
-        lines = [
-            f"{'='*50}",
-            f"  {symbol} - ANALISIS",
-            f"{'='*50}",
-            f"",
-            f"  PRECIO: ${price:.2f}",
-            f"  VWAP:   ${vwap:.2f} {'(arriba)' if price > vwap else '(abajo)'}",
-            f"  High:   ${high:.2f}",
-            f"  Low:    ${low:.2f}",
-            f"",
-            f"  TECNICOS:",
-            f"    EMA9:  ${ema9:.2f}",
-            f"    EMA21: ${ema21:.2f}",
-            f"    RSI:   {rsi:.1f}",
-            f"    Mom:   {momentum:+.2f}%",
-            f"",
-        ]
-        
-        # Direccion
-        bullish = 0
-        bearish = 0
-        
-        if price > vwap:
-            bullish += 1
-        else:
-            bearish += 1
-            
-        if ema9 > ema21:
-            bullish += 1
-        else:
-            bearish += 1
-            
-        if rsi > 50:
-            bullish += 1
-        else:
-            bearish += 1
-            
-        if momentum > 0:
-            bullish += 1
-        else:
-            bearish += 1
+        momentum = ((price - bars.close[-10]) / bars.close[-10]) * 100
         
-        lines.append(f"  SCORE: Bulls {bullish} vs Bears {bearish}")
-        lines.append(f"")
+        # Direccion: cada condicion que no es alcista cuenta como bajista
+        signals = (price > vwap, ema9 > ema21, rsi > 50, momentum > 0)
+        bullish = int(sum(signals))
+        bearish = len(signals) - bullish
         
         if bullish > bearish:
-            lines.append(f"  >> TENDENCIA: ALCISTA (CALL)")
+            trend = "TENDENCIA: ALCISTA (CALL)"
         elif bearish > bullish:
-            lines.append(f"  >> TENDENCIA: BAJISTA (PUT)")
+            trend = "TENDENCIA: BAJISTA (PUT)"
         else:
-            lines.append(f"  >> TENDENCIA: NEUTRAL")
-        
-        lines.append(f"{'='*50}")
+            trend = "TENDENCIA: NEUTRAL"
         
-        return "\n".join(lines)
+        return ANALYZE_TEMPLATE.format(
+            symbol=symbol, price=price, vwap=vwap,
+            vwap_tag='(arriba)' if price > vwap else '(abajo)',
+            high=high, low=low, ema9=ema9, ema21=ema21, rsi=rsi, momentum=momentum,
+            bullish=bullish, bearish=bearish, trend=trend
+        )
     
     def analyze_option_target(self, symbol: str, strike: float, option_type: str = 'put') -> str:
         """Analiza probabilidad de llegar a un strike"""
-        symbol = symbol.upper()
-        df = self.get_price_data(symbol, 120)
+        is_put = option_type.lower() == 'put'
+        bars = self.get_price_data(symbol, 120)
         
-        if df.empty:
+        if bars is None:
             return f"No pude obtener datos para {symbol}"
         
-        price = df['close'].iloc[-1]
-        high = df['high'].max()
-        low = df['low'].min()
+        price = bars.close[-1]
+        high = bars.high.max()
+        low = bars.low.min()
         
         # Distancia
-        if option_type.lower() == 'put':
+        if is_put:
             distance = price - strike
             direction = "bajar"
             favorable_if = price < strike
@@ -195,8 +360,7 @@ class BeastAssistant:
             favorable_if = price > strike
         
         # ATR aproximado
-        df['tr'] = df['high'] - df['low']
-        atr = df['tr'].mean()
+        atr = (bars.high - bars.low).mean()
         
         # Cuantos ATRs necesita moverse
         atrs_needed = abs(distance) / atr if atr > 0 else 999
@@ -212,174 +376,112 @@ class BeastAssistant:
             prob = "MUY BAJA (<20%)"
         
         # Ya lo toco hoy?
-        if option_type.lower() == 'put':
+        if is_put:
             touched = low <= strike
             closest = low
         else:
             touched = high >= strike
             closest = high
         
-        lines = [
-            f"{'='*50}",
-            f"  {symbol} {option_type.upper()} ${strike}",
-            f"{'='*50}",
-            f"",
-            f"  Precio actual: ${price:.2f}",
-            f"  Target:        ${strike:.2f}",
-            f"  Distancia:     ${abs(distance):.2f} ({abs(distance)/price*100:.2f}%)",
-            f"  ATRs needed:   {atrs_needed:.1f}",
-            f"",
-            f"  Mas cercano hoy: ${closest:.2f}",
-            f"  Ya toco target?: {'SI!' if touched else 'NO'}",
-            f"",
-            f"  PROBABILIDAD: {prob}",
-            f"",
-        ]
-        
         if touched:
-            lines.append(f"  >> Ya llego una vez, PUEDE volver")
+            advice = "Ya llego una vez, PUEDE volver"
         elif atrs_needed <= 2:
-            lines.append(f"  >> Alcanzable pero necesita momentum")
+            advice = "Alcanzable pero necesita momentum"
         else:
-            lines.append(f"  >> Dificil, necesita catalizador fuerte")
+            advice = "Dificil, necesita catalizador fuerte"
         
-        lines.append(f"{'='*50}")
-        
-        return "\n".join(lines)
+        return TARGET_TEMPLATE.format(
+            symbol=symbol, option_type=option_type.upper(), strike=strike, price=price,
+            distance=abs(distance), distance_pct=abs(distance) / price * 100,
+            atrs_needed=atrs_needed, closest=closest,
+            touched='SI!' if touched else 'NO', prob=prob, advice=advice
+        )
     
     def get_flow_analysis(self, symbol: str) -> str:
         """Analisis de flow de opciones"""
-        symbol = symbol.upper()
-        opts = self.get_options_data(symbol)
+        
+        # Opciones (Yahoo) y precio (Alpaca) son independientes: se piden a la vez
+        opts_future = self.io_pool.submit(self.get_options_data, symbol)
+        bars_future = self.io_pool.submit(self.get_price_data, symbol, 10)
+        opts = opts_future.result()
         
         if 'error' in opts:
             return f"Error obteniendo opciones: {opts['error']}"
         
-        df = self.get_price_data(symbol, 10)
-        if df.empty:
+        bars = bars_future.result()
+        if bars is None:
             return f"No pude obtener precio para {symbol}"
         
-        price = df['close'].iloc[-1]
+        price = bars.close[-1]
         calls = opts['calls']
         puts = opts['puts']
         
-        # Filtrar cerca del precio
-        calls_near = calls[(calls['strike'] >= price - 15) & (calls['strike'] <= price + 15)]
-        puts_near = puts[(puts['strike'] >= price - 15) & (puts['strike'] <= price + 15)]
+        # Filtrar cerca del precio (strikes ordenados: slices)
+        calls_near = strike_window(calls, price - 15, price + 15)
+        puts_near = strike_window(puts, price - 15, price + 15)
         
-        call_vol = calls_near['volume'].sum()
-        put_vol = puts_near['volume'].sum()
+        call_vol = float(calls['volume'][calls_near].sum())
+        put_vol = float(puts['volume'][puts_near].sum())
         pcr = put_vol / call_vol if call_vol > 0 else 1
         
-        # Walls
-        call_wall = calls_near.loc[calls_near['openInterest'].idxmax()] if not calls_near.empty else None
-        put_wall = puts_near.loc[puts_near['openInterest'].idxmax()] if not puts_near.empty else None
-        
-        # Max pain (simplificado)
-        max_pain = puts_near.loc[puts_near['openInterest'].idxmax()]['strike'] if not puts_near.empty else price
-        
-        lines = [
-            f"{'='*50}",
-            f"  {symbol} - FLOW DE OPCIONES",
-            f"{'='*50}",
-            f"",
-            f"  Expiracion: {opts['expiration']}",
-            f"  Precio:     ${price:.2f}",
-            f"",
-            f"  VOLUMEN:",
-            f"    Calls: {call_vol:,.0f}",
-            f"    Puts:  {put_vol:,.0f}",
-            f"    P/C Ratio: {pcr:.2f}",
-            f"",
-        ]
+        # Walls: un argmax de OI por lado
+        call_wall = self._oi_wall(calls, calls_near)
+        put_wall = self._oi_wall(puts, puts_near)
         
+        # Max pain (simplificado): el strike del put wall
+        max_pain = put_wall.strike if put_wall is not None else price
+        
+        walls = ''
         if call_wall is not None:
-            lines.append(f"  CALL WALL: ${call_wall['strike']:.0f} ({call_wall['openInterest']:,.0f} OI)")
+            walls += WALL_LINE.format(label='CALL WALL:', strike=call_wall.strike, oi=call_wall.openInterest)
         if put_wall is not None:
-            lines.append(f"  PUT WALL:  ${put_wall['strike']:.0f} ({put_wall['openInterest']:,.0f} OI)")
-        
-        lines.append(f"  MAX PAIN:  ${max_pain:.0f}")
-        lines.append(f"")
-        
-        # Score
-        bulls = 0
-        bears = 0
-        
-        if pcr < 0.9:
-            bulls += 2
-            lines.append(f"  + P/C < 0.9 = Bullish")
-        elif pcr > 1.1:
-            bears += 2
-            lines.append(f"  + P/C > 1.1 = Bearish")
-        
-        if price > max_pain:
-            bears += 1
-            lines.append(f"  + Precio arriba de Max Pain = puede bajar")
-        else:
-            bulls += 1
-            lines.append(f"  + Precio abajo de Max Pain = puede subir")
-        
-        lines.append(f"")
-        lines.append(f"  SCORE: Bulls {bulls} vs Bears {bears}")
-        
-        if bulls > bears:
-            lines.append(f"  >> FLOW FAVORECE: CALLS")
-        elif bears > bulls:
-            lines.append(f"  >> FLOW FAVORECE: PUTS")
-        else:
-            lines.append(f"  >> FLOW: NEUTRAL")
-        
-        lines.append(f"{'='*50}")
-        
-        return "\n".join(lines)
+            walls += WALL_LINE.format(label='PUT WALL: ', strike=put_wall.strike, oi=put_wall.openInterest)
+        
+        # Score: cada regla es una fila de su tabla
+        pcr_bulls, pcr_bears, pcr_msg = PCR_RULES[int(pcr >= 0.9) + int(pcr > 1.1)]
+        mp_bulls, mp_bears, mp_msg = MAX_PAIN_RULES[int(price > max_pain)]
+        bulls = pcr_bulls + mp_bulls
+        bears = pcr_bears + mp_bears
+        signals = pcr_msg + mp_msg
+        verdict = FLOW_VERDICTS[(bulls > bears) - (bulls < bears) + 1]
+        
+        return FLOW_TEMPLATE.format(
+            symbol=symbol, expiration=opts['expiration'], price=price,
+            call_vol=call_vol, put_vol=put_vol, pcr=pcr, walls=walls, max_pain=max_pain,
+            signals=signals, bulls=bulls, bears=bears, verdict=verdict
+        )
     
-    def _calc_rsi(self, series: pd.Series, period: int = 14) -> pd.Series:
-        delta = series.diff()
-        gain = (delta.where(delta > 0, 0)).rolling(window=period).mean()
-        loss = (-delta.where(delta < 0, 0)).rolling(window=period).mean()
-        rs = gain / loss
-        return 100 - (100 / (1 + rs))
+    @staticmethod
+    def _oi_wall(side: Dict[str, np.ndarray], window: slice):
+        """Contrato con mayor open interest dentro de la ventana (None si esta vacia)"""
+        oi = side['openInterest'][window]
+        if oi.size == 0:
+            return None
+        return contract(side, window.start + int(np.argmax(oi)))
     
     def process_query(self, query: str) -> str:
         """Procesa una pregunta en lenguaje natural (Español e Inglés)"""
         query_lower = query.lower().strip()
         
-        # Detectar simbolo
-        symbols = re.findall(r'\b([A-Za-z]{1,5})\b', query.upper())
-        # Palabras comunes en español e inglés que NO son símbolos
-        common_words = {
-            # English
-            'A', 'I', 'THE', 'TO', 'FOR', 'AND', 'OR', 'IF', 'MY', 'ME', 
-            'IT', 'IS', 'AT', 'ON', 'IN', 'UP', 'DO', 'GO', 'NO', 'SO',
-            'PUT', 'CALL', 'WILL', 'CAN', 'HOW', 'WHAT', 'CHECK', 'ANALYZE',
-            'NEED', 'MAKE', 'GET', 'BUY', 'SELL', 'FLOW', 'PRICE', 'TARGET',
-            # Español
-            'EL', 'LA', 'LOS', 'LAS', 'UN', 'UNA', 'DE', 'EN', 'QUE', 'Y',
-            'ES', 'SE', 'CON', 'POR', 'PARA', 'SU', 'AL', 'DEL', 'SI', 'NO',
-            'COMO', 'MAS', 'PERO', 'SUS', 'LE', 'YA', 'O', 'ESTE', 'HA',
-            'MI', 'ME', 'SIN', 'SOBRE', 'TODO', 'ESTA', 'ENTRE', 'CUANDO',
-            'MUY', 'SER', 'HAY', 'PUEDE', 'TODOS', 'ASI', 'NOS', 'OTROS',
-            'VA', 'IR', 'VER', 'DAR', 'BIEN', 'VAS', 'DIME', 'DAME',
-            'ANALIZA', 'CHECA', 'REVISA', 'PRECIO', 'CUANTO', 'DONDE',
-            'LLEGARA', 'SUBIRA', 'BAJARA', 'OPCIONES', 'AYUDA', 'OF', 'THE'
-        }
-        symbols = [s for s in symbols if s not in common_words and len(s) >= 2]
+        # Detectar simbolo: se normaliza aqui una vez, los analizadores
+        # reciben el simbolo ya en mayusculas
+        symbols = SYMBOL_RE.findall(query.upper())
+        symbols = [s for s in symbols if s not in COMMON_WORDS and len(s) >= 2]
         
         symbol = symbols[0] if symbols else 'SPY'
         
         # Detectar strike (numero)
-        strikes = re.findall(r'\b(\d{2,4}(?:\.\d{1,2})?)\b', query)
+        strikes = STRIKE_RE.findall(query)
         strike = float(strikes[0]) if strikes else None
         
         # Detectar tipo de opcion (español e inglés)
-        is_put = any(w in query_lower for w in ['put', 'puts', 'baja', 'bajar', 'bajara', 'caer', 'caera'])
-        is_call = any(w in query_lower for w in ['call', 'calls', 'sube', 'subir', 'subira', 'arriba'])
+        is_put = PUT_RE.search(query_lower) is not None
+        is_call = CALL_RE.search(query_lower) is not None
         
         # === COMANDOS ===
         
         # FLOW / OPCIONES
-        if any(w in query_lower for w in ['flow', 'opciones', 'options', 'wall', 'pain', 
-                                           'calls', 'puts', 'volumen de opciones']):
+        if FLOW_RE.search(query_lower):
             return self.get_flow_analysis(symbol)
         
         # STRIKE ESPECÍFICO
@@ -388,9 +490,7 @@ class BeastAssistant:
             return self.analyze_option_target(symbol, strike, opt_type)
         
         # LLEGARÁ A X?
-        elif any(w in query_lower for w in ['llegara', 'llegará', 'will it', 'make it', 
-                                             'target', 'reach', 'tocara', 'tocará',
-                                             'alcanzara', 'alcanzará', 'puede llegar']):
+        elif TARGET_RE.search(query_lower):
             if strike:
                 # Heuristica: si el strike es menor al precio típico, es put
                 opt_type = 'put' if is_put or strike < 500 else 'call'
@@ -399,32 +499,23 @@ class BeastAssistant:
                 return self.analyze_symbol(symbol)
         
         # ANÁLISIS
-        elif any(w in query_lower for w in ['analiza', 'analyze', 'check', 'checa', 'checar',
-                                             'como esta', 'cómo está', 'how is', 'revisa',
-                                             'revisar', 'dime de', 'que opinas', 'qué opinas',
-                                             'analisis', 'análisis', 'escanea', 'scan']):
+        elif ANALYZE_RE.search(query_lower):
             return self.analyze_symbol(symbol)
         
         # PRECIO
-        elif any(w in query_lower for w in ['precio', 'price', 'cuanto', 'cuánto', 
-                                             'how much', 'a cuanto', 'a cuánto', 
-                                             'en cuanto', 'cotiza']):
-            df = self.get_price_data(symbol, 10)
-            if not df.empty:
-                price = df['close'].iloc[-1]
+        elif PRICE_RE.search(query_lower):
+            bars = self.get_price_data(symbol, 10)
+            if bars is not None:
+                price = bars.close[-1]
                 return f"{symbol}: ${price:.2f}"
             return f"No pude obtener precio de {symbol}"
         
         # DIRECCIÓN
-        elif any(w in query_lower for w in ['va a subir', 'va a bajar', 'sube o baja',
-                                             'up or down', 'going up', 'going down',
-                                             'direccion', 'dirección', 'tendencia']):
+        elif DIRECTION_RE.search(query_lower):
             return self.analyze_symbol(symbol)
         
         # AYUDA
-        elif any(w in query_lower for w in ['ayuda', 'help', 'comandos', 'commands',
-                                             'que puedes', 'qué puedes', 'opciones',
-                                             'como funciona', 'cómo funciona']):
+        elif HELP_RE.search(query_lower):
             return self.get_help()
         
         # DEFAULT: analisis
@@ -510,16 +601,14 @@ def run_telegram_bot():
     
     async def handle_message(update: Update, context: ContextTypes.DEFAULT_TYPE):
         query = update.message.text
-        response = assistant.process_query(query)
+        # Alpaca/Yahoo son bloqueantes: se corren en un hilo para no frenar el event loop
+        response = await asyncio.to_thread(assistant.process_query, query)
         # Telegram tiene limite de 4096 chars
         if len(response) > 4000:
             response = response[:4000] + "..."
         await update.message.reply_text(f"```\n{response}\n```", parse_mode='Markdown')
     
-    with open('config.yaml', 'r') as f:
-        config = yaml.safe_load(f)
-    
-    token = config['notifications']['telegram']['bot_token']
+    token = assistant.config['notifications']['telegram']['bot_token']
     
     app = Application.builder().token(token).build()
     app.add_handler(CommandHandler("start", start))
@@ -21,14 +21,16 @@ import os
 import sys
 import asyncio
 import logging
+import time
 import warnings
 from datetime import datetime, timedelta, time as dtime
-from typing import Dict, List, Tuple, Optional, Any
+from typing import Dict, List, NamedTuple, Tuple, Optional, Any
 from dataclasses import dataclass, field
+from collections import namedtuple
+from bisect import bisect_left
+from zoneinfo import ZoneInfo
 from enum import Enum
 import json
-import yaml
-from collections import deque
 
 # Suppress warnings
 warnings.filterwarnings('ignore')
@@ -39,18 +41,14 @@ import pandas as pd
 import joblib
 from scipy import stats
 
-# Technical Analysis
+# Compiled tree ensembles (optional): the 0DTE models are turned into
+# native shared libraries at startup and predicted through those
 try:
-    import talib
-    TALIB_AVAILABLE = True
+    import treelite
+    import tl2cgen
+    TREELITE_AVAILABLE = True
 except ImportError:
-    TALIB_AVAILABLE = False
-    print("[WARNING] TA-Lib not available, using pandas-ta")
-
-try:
-    import pandas_ta as ta
-except ImportError:
-    ta = None
+    TREELITE_AVAILABLE = False
 
 # Market Data
 from alpaca.data.historical import StockHistoricalDataClient, OptionHistoricalDataClient
@@ -70,6 +68,70 @@ except ImportError:
 # Telegram
 import aiohttp
 
+# Telegram payload encoding: orjson when installed (optional), else the stdlib
+try:
+    import orjson
+    ORJSON_AVAILABLE = True
+except ImportError:
+    ORJSON_AVAILABLE = False
+
+# Option chains cached on disk for a minute (shared with the analysis scripts)
+from data_cache import get_expirations, load_chain, strike_window
+
+# config.yaml parsed once per process (libyaml's C loader when available)
+from session import CONFIG_PATH, load_config as load_yaml_config
+
+# Indicator kernels (Numba when installed, plain Python loops otherwise)
+from indicators import (adx_wilder, ewm_multi_noadjust, ewm_step_noadjust, quality_score, rolling_mean,
+                        rsi_wilder, span_to_alpha, strength_score, true_range)
+
+# EMA stack spans and their smoothing factors (one kernel pass for all six)
+EMA_STACK_SPANS = (9, 20, 21, 50, 100, 200)
+EMA_STACK_ALPHAS = span_to_alpha(EMA_STACK_SPANS)
+EMA_STACK_KEYS = tuple(f'ema{span}' for span in EMA_STACK_SPANS)
+
+# Content type of the Telegram request bodies (encoded in send_telegram)
+JSON_HEADERS = {'Content-Type': 'application/json'}
+
+# Bar columns fetch_bars returns (BarSet.df also carries trade_count)
+BAR_COLUMNS = ['open', 'high', 'low', 'close', 'volume', 'vwap']
+
+# Best option flow calculate_quality_score can reward (ceiling before fetching flow)
+BEST_CASE_FLOW = {'call_pct': 100.0, 'unusual_activity': True}
+
+# Option-flow chain fetches in flight at once during a scan
+FLOW_CONCURRENCY = 10
+
+# Bar fetches in flight at once in the pattern scan (Alpaca rate limit)
+PATTERN_CONCURRENCY = 8
+
+# Seconds update_market_state reuses the last VIX/SPY snapshot
+MARKET_STATE_TTL = 30
+
+# Exchange time zone: session times and time-of-day logic run on ET
+# whatever the server's local zone is
+ET = ZoneInfo("America/New_York")
+
+# Regular session (ET) and how long before the open the morning brief goes out
+MARKET_OPEN = dtime(9, 30)
+MARKET_CLOSE = dtime(16, 0)
+MORNING_BRIEF_LEAD = timedelta(minutes=5)
+
+# Scanner indicator settings
+MACD_FAST, MACD_SLOW, MACD_SIGNAL = 6, 26, 5
+RSI_PERIOD = 7
+ATR_PERIOD = ADX_PERIOD = 14
+VOLUME_SMA_PERIOD = 20
+
+# EMAs carried in IndicatorState: the stack, then the MACD fast/slow lines
+STATE_EMA_ALPHAS = span_to_alpha(EMA_STACK_SPANS + (MACD_FAST, MACD_SLOW))
+MACD_SIGNAL_ALPHA = span_to_alpha([MACD_SIGNAL])
+# Bars behind the last ATR value: ATR_PERIOD bars of TR, and TR needs the previous close
+INDICATOR_TAIL = ATR_PERIOD + 1
+
+# Strength scores kept per symbol (one per scan) for reversal detection
+STRENGTH_HISTORY_LEN = 30
+
 # =============================================================================
 # CONFIGURATION
 # =============================================================================
@@ -146,9 +208,113 @@ class TimePhase(Enum):
     POWER = "POWER"          # 15:00 - 16:00
     CLOSED = "CLOSED"
 
-@dataclass
+# First minute of the day (hour * 60 + minute) of each phase
+PHASE_STARTS = (
+    (0, TimePhase.PREMARKET),
+    (9 * 60 + 30, TimePhase.ORB),
+    (9 * 60 + 45, TimePhase.BREAKOUT),
+    (11 * 60, TimePhase.REVERSAL),
+    (15 * 60, TimePhase.POWER),
+    (16 * 60, TimePhase.CLOSED),
+)
+# Phase of every minute of the day, indexed by hour * 60 + minute
+PHASE_BY_MINUTE: Tuple[TimePhase, ...] = tuple(
+    phase
+    for (start, phase), (end, _) in zip(PHASE_STARTS, PHASE_STARTS[1:] + ((24 * 60, None),))
+    for _ in range(start, end)
+)
+# Regimes in VIX order; update_market_state bisects the config thresholds
+REGIMES = (MarketRegime.GREEN, MarketRegime.YELLOW, MarketRegime.RED)
+# Ensemble vote (0 down, 1 neutral, 2 up) -> direction
+ENSEMBLE_DIRECTIONS = (Direction.PUT, Direction.NEUTRAL, Direction.CALL)
+# Quality score scaling per regime and bonus per time phase (others: 1.0 / 0)
+REGIME_QUALITY_MULT = {MarketRegime.GREEN: 1.1, MarketRegime.RED: 0.7}
+PHASE_QUALITY_BONUS = {TimePhase.POWER: 10, TimePhase.ORB: 5}
+
+# Telegram message parts, built once at import
+SIGNAL_TYPE_TAGS = {
+    SignalType.POWER_HOUR: "[PWR]",
+    SignalType.ORB_BREAKOUT: "[ORB]",
+    SignalType.TRAP: "[TRAP]",
+    SignalType.CAPITULATION: "[CAP]",
+    SignalType.EARLY_WARNING: "[WARN]",
+    SignalType.REGULAR: "[REG]"
+}
+REGIME_TAGS = {
+    MarketRegime.GREEN: "[GREEN]",
+    MarketRegime.YELLOW: "[YELLOW]",
+    MarketRegime.RED: "[RED]"
+}
+
+# format_signal_alert fills it with s=<Signal> plus the derived fields
+ALERT_TEMPLATE = """
+{emoji} <b>BEAST SIGNAL: {s.symbol}</b> {emoji}
+
+<b>Direction:</b> {s.direction.value}
+<b>Signal Type:</b> {type_tag} {s.signal_type.value}
+
+<b>Scores:</b>
+- Strength: {s.strength_score}/10
+- Quality: {s.quality_score}/100
+- AI Confidence: {s.ai_confidence:.0f}%
+
+<b>Levels:</b>
+- Entry: ${s.entry_price:.2f}
+- Target: ${s.target_price:.2f}
+- Stop: ${s.stop_price:.2f}
+
+<b>Option Flow:</b>
+- Calls: {s.call_pct:.0f}% | Puts: {s.put_pct:.0f}%
+- Magnet Strike: ${magnet}
+- Unusual Activity: {unusual}
+
+<b>Key Levels:</b>
+- VWAP: ${s.vwap:.2f}
+- ORB: ${s.orb_low:.2f} - ${s.orb_high:.2f}
+- Pivot: ${s.pivot:.2f}
+
+<b>Reasons:</b>
+{reasons}
+
+Time: {s.timestamp:%H:%M:%S}
+"""
+
+# Morning brief blocks that don't depend on the data
+BRIEF_PLAYBOOK = {
+    MarketRegime.GREEN: """
+[OK] Full risk-on mode
+[OK] Normal position sizes
+[OK] All signal types valid
+""",
+    MarketRegime.YELLOW: """
+[!!] Elevated volatility
+[!!] Reduce position sizes 50%
+[!!] Focus on Power Hour signals only
+""",
+    MarketRegime.RED: """
+[XX] HIGH VOLATILITY - CAUTION
+[XX] No new trades recommended
+[XX] Wait for VIX to cool down
+"""
+}
+BRIEF_FOOTER = """
+<b>KEY TIMES TODAY:</b>
+- 9:30-9:45: ORB Phase (watch breakouts)
+- 9:45-11:00: Breakout Phase (best momentum)
+- 11:00-15:00: Reversal Phase (mean reversion)
+- 15:00-16:00: Power Hour (highest conviction)
+
+<b>FOCUS SYMBOLS:</b>
+SPY, QQQ, NVDA, TSLA, AMD, META
+
+===================================
+        BEAST ENGINE READY
+===================================
+"""
+
+@dataclass(slots=True)
 class Signal:
-    """Trading Signal"""
+    """Trading Signal (slotted: signals_today keeps a day's worth of them)"""
     symbol: str
     direction: Direction
     signal_type: SignalType
@@ -159,7 +325,7 @@ class Signal:
     target_price: float
     stop_price: float
     strike: Optional[float] = None
-    reasons: List[str] = field(default_factory=list)
+    reasons: Tuple[str, ...] = ()
     timestamp: datetime = field(default_factory=datetime.now)
     
     # Option flow data
@@ -187,6 +353,42 @@ class MarketState:
     phase: TimePhase = TimePhase.CLOSED
     is_trading_day: bool = True
 
+# OHLCV columns of a bar frame as float64 NumPy arrays
+BarArrays = namedtuple('BarArrays', 'o h l c v')
+OHLCV_COLUMNS = ('open', 'high', 'low', 'close', 'volume')
+
+class StepState(NamedTuple):
+    """Running indicator state after one bar, besides the EMA / signal values"""
+    ema_wt: np.ndarray       # pending EMA weights (see ewm_step_noadjust)
+    signal_wt: np.ndarray
+    rsi_avg: np.ndarray      # Wilder (avg_gain, avg_loss)
+    adx_state: np.ndarray    # Wilder TR/DM sums and ADX (see adx_wilder)
+
+@dataclass
+class IndicatorState:
+    """Per-symbol indicator state carried from one scan to the next"""
+    index: np.ndarray        # bar timestamps (ns) the arrays below line up with
+    ema: np.ndarray          # (8, n) EMA stack rows, then MACD fast / slow
+    signal: np.ndarray       # (1, n) MACD signal line
+    tp_vol: np.ndarray       # typical price * volume per bar
+    volume: np.ndarray
+    tp_vol_sum: float        # VWAP sums over the current bars
+    vol_sum: float
+    step: StepState          # state at the last bar
+    before_last: StepState   # and at the bar before, to re-step a revised last bar
+    arrays: BarArrays        # OHLCV arrays of the current bars
+    indicators: Dict[str, Any]
+
+@dataclass
+class ScanCandidate:
+    """Symbol that passed the strength filter, waiting for its AI prediction"""
+    symbol: str
+    df: pd.DataFrame
+    indicators: Dict[str, Any]
+    strength_score: int
+    current_price: float
+    option_flow: Dict
+
 # =============================================================================
 # BEAST ENGINE - MAIN CLASS
 # =============================================================================
@@ -224,11 +426,30 @@ class BeastEngine:
         # Load AI Models
         self.models = self._load_models()
         
+        # Feature row for the 0DTE model, filled in place by prepare_ai_features
+        feature_names = self.models.get('0dte', {}).get('features', [])
+        self.feature_index = {name: i for i, name in enumerate(feature_names)}
+        self.feature_buffer = np.zeros((1, len(feature_names)), dtype=np.float32)
+        
         # State tracking
         self.market_state = MarketState()
+        self.market_state_time: Optional[float] = None  # time.monotonic() of the last update
         self.daily_trades = 0
         self.signals_today: List[Signal] = []
-        self.strength_history: Dict[str, deque] = {}  # For reversal detection
+        # Strength history for reversal detection: one int8 ring buffer row
+        # per symbol (row index in strength_rows), write counts in strength_count
+        self.strength_rows: Dict[str, int] = {}
+        self.strength_history = np.zeros((config.max_symbols_to_scan, STRENGTH_HISTORY_LEN), dtype=np.int8)
+        self.strength_count = np.zeros(config.max_symbols_to_scan, dtype=np.int64)
+        self.indicator_state: Dict[str, IndicatorState] = {}  # Scanner indicators per symbol
+        # Universe bars kept between scans (see update_universe_bars), and
+        # the (symbols, timeframe, days) they were fetched for
+        self.universe_bars: Dict[str, pd.DataFrame] = {}
+        self.universe_bars_key = None
+        
+        # Previous session (high, low, close) per symbol, for the pivots
+        self.prev_session: Dict[str, Optional[Tuple[float, float, float]]] = {}
+        self.prev_session_date = None
         
         # Cache for ORB levels
         self.orb_cache: Dict[str, Dict] = {}
@@ -236,6 +457,10 @@ class BeastEngine:
         # Universe of tradeable symbols
         self.universe: List[str] = []
         
+        # Telegram HTTP session, opened on the first send and kept alive
+        self.http_session: Optional[aiohttp.ClientSession] = None
+        self.telegram_url = f"https://api.telegram.org/bot{config.telegram_bot_token}/sendMessage"
+        
         self.logger.info("=" * 60)
         self.logger.info("    BEAST ENGINE INITIALIZED")
         self.logger.info("=" * 60)
@@ -271,13 +496,14 @@ class BeastEngine:
         # Load 0DTE model (primary)
         if os.path.exists(self.config.model_0dte_path):
             try:
-                data = joblib.load(self.config.model_0dte_path)
+                data = joblib.load(self.config.model_0dte_path, mmap_mode='r')
                 models['0dte'] = {
                     'rf': data.get('rf_model'),
                     'xgb': data.get('xgb_model'),
                     'lgb': data.get('lgb_model'),
                     'features': data.get('feature_names', [])
                 }
+                models['0dte']['compiled'] = self._compile_models(models['0dte'], self.config.model_0dte_path)
                 self.logger.info(f"[MODEL] Loaded 0DTE model ({len(models['0dte']['features'])} features)")
             except Exception as e:
                 self.logger.error(f"[MODEL] Failed to load 0DTE model: {e}")
@@ -285,7 +511,7 @@ class BeastEngine:
         # Load ensemble model
         if os.path.exists(self.config.model_ensemble_path):
             try:
-                data = joblib.load(self.config.model_ensemble_path)
+                data = joblib.load(self.config.model_ensemble_path, mmap_mode='r')
                 models['ensemble'] = data
                 self.logger.info("[MODEL] Loaded ensemble model")
             except Exception as e:
@@ -293,42 +519,114 @@ class BeastEngine:
         
         return models
     
+    def _compile_models(self, model_data: Dict[str, Any], model_path: str) -> Dict[str, Any]:
+        """
+        Compile the RF/XGB/LGB models to shared libraries with TreeLite
+        
+        Each library is written next to the model file (<model>_<key>.so)
+        and rebuilt only when the model file is newer. A model whose
+        compiled probabilities don't match predict_proba on the rows from
+        _probe_rows is left on the stock predictor. Returns
+        {key: tl2cgen.Predictor}.
+        """
+        compiled = {}
+        if not TREELITE_AVAILABLE:
+            return compiled
+        
+        base = os.path.splitext(model_path)[0]
+        n_features = len(model_data['features'])
+        
+        for key in ('rf', 'xgb', 'lgb'):
+            model = model_data.get(key)
+            if model is None:
+                continue
+            libpath = f"{base}_{key}.so"
+            try:
+                if key == 'xgb':
+                    tl_model = treelite.frontend.from_xgboost(model.get_booster())
+                elif key == 'lgb':
+                    tl_model = treelite.frontend.from_lightgbm(model.booster_)
+                else:
+                    tl_model = treelite.sklearn.import_model(model)
+                if not os.path.exists(libpath) or os.path.getmtime(libpath) < os.path.getmtime(model_path):
+                    tl2cgen.export_lib(tl_model, toolchain='gcc', libpath=libpath,
+                                       params={'parallel_comp': os.cpu_count() or 1})
+                predictor = tl2cgen.Predictor(libpath)
+                
+                probe = self._probe_rows(tl_model, n_features)
+                expected = model.predict_proba(probe)
+                proba = predictor.predict(tl2cgen.DMatrix(probe)).reshape(expected.shape[0], -1)
+                if proba.shape != expected.shape or not np.allclose(proba, expected, atol=1e-4):
+                    self.logger.warning(f"[MODEL] Compiled {key} doesn't match predict_proba, using stock predictor")
+                    continue
+                compiled[key] = predictor
+            except Exception as e:
+                self.logger.warning(f"[MODEL] Could not compile {key}: {e}")
+        
+        if compiled:
+            self.logger.info(f"[MODEL] Compiled 0DTE models: {', '.join(compiled)}")
+        return compiled
+    
+    @staticmethod
+    def _probe_rows(tl_model, n_features: int, rows: int = 256) -> np.ndarray:
+        """
+        Rows to check a compiled model against predict_proba: an all-zeros
+        row plus random rows spread over the range of each feature's split
+        thresholds (and a little past both ends), so they take the trees'
+        real split paths. Features the trees never split on stay 0.
+        """
+        lo = np.full(n_features, np.inf)
+        hi = np.full(n_features, -np.inf)
+        for tree in json.loads(tl_model.dump_as_json(pretty_print=False))['trees']:
+            for node in tree['nodes']:
+                if 'threshold' in node:
+                    f = node['split_feature_id']
+                    lo[f] = min(lo[f], node['threshold'])
+                    hi[f] = max(hi[f], node['threshold'])
+        
+        split = np.isfinite(lo)
+        lo, hi = np.where(split, lo, 0.0), np.where(split, hi, 0.0)
+        pad = np.maximum(0.1 * (hi - lo), 1e-3 * np.maximum(np.abs(hi), 1.0))
+        rng = np.random.default_rng(0)
+        X = (lo - pad) + rng.random((rows, n_features)) * (hi - lo + 2 * pad)
+        X[:, ~split] = 0.0
+        return np.vstack((np.zeros((1, n_features)), X)).astype(np.float32)
+    
     # =========================================================================
     # MARKET DATA
     # =========================================================================
     
+    @staticmethod
+    def _bars_request(symbols, timeframe: str, days: int,
+                      start: Optional[datetime] = None) -> StockBarsRequest:
+        """Bars request for one symbol or a list of them (the last `days`, or from start)"""
+        tf_map = {
+            "1Min": TimeFrame.Minute,
+            "5Min": TimeFrame(5, "Min"),
+            "15Min": TimeFrame(15, "Min"),
+            "1Hour": TimeFrame.Hour,
+            "1Day": TimeFrame.Day
+        }
+        
+        return StockBarsRequest(
+            symbol_or_symbols=symbols,
+            timeframe=tf_map.get(timeframe, TimeFrame.Minute),
+            start=start if start is not None else datetime.now() - timedelta(days=days)
+        )
+    
     async def fetch_bars(self, symbol: str, timeframe: str = "1Min", 
                         days: int = 1) -> pd.DataFrame:
         """Fetch OHLCV bars for a symbol"""
         try:
-            tf_map = {
-                "1Min": TimeFrame.Minute,
-                "5Min": TimeFrame(5, "Min"),
-                "15Min": TimeFrame(15, "Min"),
-                "1Hour": TimeFrame.Hour,
-                "1Day": TimeFrame.Day
-            }
+            request = self._bars_request(symbol, timeframe, days)
             
-            request = StockBarsRequest(
-                symbol_or_symbols=symbol,
-                timeframe=tf_map.get(timeframe, TimeFrame.Minute),
-                start=datetime.now() - timedelta(days=days)
-            )
-            
-            bars = self.stock_client.get_stock_bars(request)
+            # Blocking HTTP call: run it off the event loop so concurrent fetches overlap
+            bars = await asyncio.to_thread(self.stock_client.get_stock_bars, request)
             
             if symbol in bars.data:
-                df = pd.DataFrame([{
-                    'timestamp': bar.timestamp,
-                    'open': bar.open,
-                    'high': bar.high,
-                    'low': bar.low,
-                    'close': bar.close,
-                    'volume': bar.volume,
-                    'vwap': bar.vwap
-                } for bar in bars.data[symbol]])
-                
-                df.set_index('timestamp', inplace=True)
+                # BarSet.df is already columnar, indexed by (symbol, timestamp)
+                df = bars.df.xs(symbol, level=0)[BAR_COLUMNS]
+                df.index.name = 'timestamp'
                 return df
             
             return pd.DataFrame()
@@ -337,20 +635,82 @@ class BeastEngine:
             self.logger.error(f"[DATA] Error fetching {symbol}: {e}")
             return pd.DataFrame()
     
+    async def fetch_bars_universe(self, symbols: List[str], timeframe: str = "1Min",
+                                  days: int = 1, start: Optional[datetime] = None) -> Dict[str, pd.DataFrame]:
+        """
+        Fetch OHLCV bars for many symbols with one request
+        Returns {symbol: frame like fetch_bars'}; symbols without bars are left out
+        """
+        try:
+            bars = await asyncio.to_thread(self.stock_client.get_stock_bars,
+                                           self._bars_request(list(symbols), timeframe, days, start))
+        except Exception as e:
+            self.logger.error(f"[DATA] Error fetching bars for {len(symbols)} symbols: {e}")
+            return {}
+        
+        if not bars.data:
+            return {}
+        
+        frames = {}
+        for symbol, df in bars.df.groupby(level=0):
+            df = df.droplevel(0)[BAR_COLUMNS]
+            df.index.name = 'timestamp'
+            frames[symbol] = df
+        return frames
+    
+    async def update_universe_bars(self, symbols: List[str], timeframe: str = "1Min",
+                                   days: int = 1) -> Dict[str, pd.DataFrame]:
+        """
+        Universe bars for the last `days`, kept between scans
+        
+        The first call (or one for other symbols / timeframe / days) fetches
+        the whole window. Later calls only fetch from the oldest last bar
+        on, splice those bars onto the kept frames (refetched bars replace
+        the kept ones) and drop the bars that slid out of the window, so
+        each scan downloads a few bars per symbol instead of `days` of them.
+        """
+        key = (tuple(symbols), timeframe, days)
+        if key != self.universe_bars_key or not self.universe_bars:
+            self.universe_bars = await self.fetch_bars_universe(symbols, timeframe, days)
+            self.universe_bars_key = key
+            return self.universe_bars
+        
+        since = min(df.index[-1] for df in self.universe_bars.values())
+        new = await self.fetch_bars_universe(symbols, timeframe, days, start=since.to_pydatetime())
+        
+        # Same window start the full request would use (naive start times are UTC to Alpaca)
+        window_start = pd.Timestamp(datetime.now() - timedelta(days=days), tz='UTC')
+        frames = {}
+        for symbol in symbols:
+            old, df = self.universe_bars.get(symbol), new.get(symbol)
+            if old is None:
+                if df is None:
+                    continue
+            elif df is not None:
+                df = pd.concat((old, df))
+                df = df[~df.index.duplicated(keep='last')]
+            else:
+                df = old
+            df = df[df.index >= window_start]
+            if len(df):
+                frames[symbol] = df
+        self.universe_bars = frames
+        return frames
+    
     async def get_vix(self) -> float:
         """Get current VIX price"""
         try:
             if YF_AVAILABLE:
                 vix = yf.Ticker("^VIX")
-                hist = vix.history(period="1d")
+                hist = await asyncio.to_thread(vix.history, period="1d")
                 if not hist.empty:
-                    return float(hist['Close'].iloc[-1])
+                    return float(hist['Close'].iat[-1])
             
             # Fallback: use VIXY ETF
             df = await self.fetch_bars("VIXY", "1Min", 1)
             if not df.empty:
                 # VIXY roughly tracks VIX/10
-                return float(df['close'].iloc[-1]) * 10
+                return float(df['close'].iat[-1]) * 10
             
             return 20.0  # Default
             
@@ -362,107 +722,113 @@ class BeastEngine:
     # TECHNICAL INDICATORS (Pine Script Logic)
     # =========================================================================
     
+    # The calculations run on float64 NumPy columns through the shared
+    # kernels in indicators.py; results are wrapped back into Series
+    # (same index as the input) only on return.
+    
     def calculate_zlema(self, series: pd.Series, period: int) -> pd.Series:
         """Zero-Lag Exponential Moving Average"""
         lag = (period - 1) // 2
-        ema_data = 2 * series - series.shift(lag)
-        return ema_data.ewm(span=period, adjust=False).mean()
+        x = series.to_numpy(dtype=np.float64)
+        ema_data = np.full_like(x, np.nan)
+        ema_data[lag:] = 2 * x[lag:] - x[:len(x) - lag]
+        return pd.Series(ewm_multi_noadjust(ema_data, span_to_alpha([period]))[0], index=series.index)
     
-    def calculate_ema_stack(self, df: pd.DataFrame) -> Dict[str, pd.Series]:
-        """Calculate EMA stack (9, 20, 21, 50, 100, 200)"""
-        close = df['close']
-        return {
-            'ema9': close.ewm(span=9, adjust=False).mean(),
-            'ema20': close.ewm(span=20, adjust=False).mean(),
-            'ema21': close.ewm(span=21, adjust=False).mean(),
-            'ema50': close.ewm(span=50, adjust=False).mean(),
-            'ema100': close.ewm(span=100, adjust=False).mean(),
-            'ema200': close.ewm(span=200, adjust=False).mean(),
-        }
+    def calculate_ema_stack(self, df: pd.DataFrame) -> Dict[str, np.ndarray]:
+        """
+        Calculate EMA stack (9, 20, 21, 50, 100, 200)
+        
+        All six EMAs come from one pass over close; the values are row
+        views of a single (6, n) array, keyed 'ema9' ... 'ema200'.
+        """
+        emas = ewm_multi_noadjust(df['close'].to_numpy(dtype=np.float64), EMA_STACK_ALPHAS)
+        return dict(zip(EMA_STACK_KEYS, emas))
     
     def calculate_macd(self, close: pd.Series, 
                        fast: int = 6, slow: int = 26, signal: int = 5) -> Dict:
         """MACD with 0DTE-optimized parameters (faster than standard)"""
-        ema_fast = close.ewm(span=fast, adjust=False).mean()
-        ema_slow = close.ewm(span=slow, adjust=False).mean()
+        ema_fast, ema_slow = ewm_multi_noadjust(close.to_numpy(dtype=np.float64), span_to_alpha([fast, slow]))
         macd_line = ema_fast - ema_slow
-        signal_line = macd_line.ewm(span=signal, adjust=False).mean()
+        signal_line = ewm_multi_noadjust(macd_line, span_to_alpha([signal]))[0]
         histogram = macd_line - signal_line
         
         return {
-            'macd': macd_line,
-            'signal': signal_line,
-            'histogram': histogram
+            'macd': pd.Series(macd_line, index=close.index),
+            'signal': pd.Series(signal_line, index=close.index),
+            'histogram': pd.Series(histogram, index=close.index)
         }
     
     def calculate_rsi(self, close: pd.Series, period: int = 7) -> pd.Series:
-        """RSI with aggressive period for 0DTE"""
-        delta = close.diff()
-        gain = delta.where(delta > 0, 0).rolling(window=period).mean()
-        loss = (-delta.where(delta < 0, 0)).rolling(window=period).mean()
-        rs = gain / loss.replace(0, np.nan)
-        return 100 - (100 / (1 + rs))
+        """RSI with aggressive period for 0DTE (Wilder smoothing)"""
+        c = close.to_numpy(dtype=np.float64)
+        return pd.Series(rsi_wilder(c, period, np.full(2, np.nan), np.empty(len(c))), index=close.index)
+    
+    def _atr_values(self, df: pd.DataFrame, period: int) -> np.ndarray:
+        """ATR as a NumPy array (rolling mean of the true range)"""
+        tr = true_range(
+            df['high'].to_numpy(dtype=np.float64),
+            df['low'].to_numpy(dtype=np.float64),
+            df['close'].to_numpy(dtype=np.float64)
+        )
+        return rolling_mean(tr, period)
     
     def calculate_atr(self, df: pd.DataFrame, period: int = 14) -> pd.Series:
         """Average True Range"""
-        high = df['high']
-        low = df['low']
-        close = df['close']
-        
-        tr1 = high - low
-        tr2 = abs(high - close.shift())
-        tr3 = abs(low - close.shift())
-        tr = pd.concat([tr1, tr2, tr3], axis=1).max(axis=1)
-        
-        return tr.rolling(window=period).mean()
+        return pd.Series(self._atr_values(df, period), index=df.index)
     
     def calculate_adx(self, df: pd.DataFrame, period: int = 14) -> pd.Series:
-        """Average Directional Index (trend strength)"""
-        high = df['high']
-        low = df['low']
-        close = df['close']
-        
-        plus_dm = high.diff()
-        minus_dm = -low.diff()
-        
-        plus_dm = plus_dm.where((plus_dm > minus_dm) & (plus_dm > 0), 0)
-        minus_dm = minus_dm.where((minus_dm > plus_dm) & (minus_dm > 0), 0)
-        
-        atr = self.calculate_atr(df, period)
-        
-        plus_di = 100 * (plus_dm.rolling(period).mean() / atr)
-        minus_di = 100 * (minus_dm.rolling(period).mean() / atr)
-        
-        dx = 100 * abs(plus_di - minus_di) / (plus_di + minus_di)
-        adx = dx.rolling(period).mean()
-        
-        return adx
+        """Average Directional Index (trend strength, Wilder smoothing)"""
+        a = self._arrays(df)
+        adx = adx_wilder(a.h, a.l, a.c, period, np.zeros(5), np.empty(len(a.c)))
+        return pd.Series(adx, index=df.index)
     
     def calculate_vwap(self, df: pd.DataFrame) -> pd.Series:
         """Volume Weighted Average Price"""
-        typical_price = (df['high'] + df['low'] + df['close']) / 3
-        cumulative_tp_vol = (typical_price * df['volume']).cumsum()
-        cumulative_vol = df['volume'].cumsum()
-        return cumulative_tp_vol / cumulative_vol
-    
-    def calculate_pivots(self, df: pd.DataFrame) -> Dict[str, float]:
-        """Daily Pivot Points"""
-        # Use previous day's data
-        if len(df) < 2:
-            return {'pivot': 0, 'r1': 0, 'r2': 0, 's1': 0, 's2': 0}
+        high = df['high'].to_numpy(dtype=np.float64)
+        low = df['low'].to_numpy(dtype=np.float64)
+        close = df['close'].to_numpy(dtype=np.float64)
+        volume = df['volume'].to_numpy(dtype=np.float64)
+        typical_price = (high + low + close) / 3
+        with np.errstate(divide='ignore', invalid='ignore'):
+            vwap = np.cumsum(typical_price * volume) / np.cumsum(volume)
+        return pd.Series(vwap, index=df.index)
+    
+    async def load_prev_sessions(self, symbols: List[str]):
+        """
+        Previous session's (high, low, close) for the symbols not loaded
+        yet today, from one daily-bar request in a worker thread; kept
+        until the date changes. A failed request leaves them missing, so
+        the next call tries again.
+        """
+        today = datetime.now().date()
+        if self.prev_session_date != today:
+            self.prev_session = {}
+        symbols = [symbol for symbol in symbols if symbol not in self.prev_session]
+        if not symbols:
+            return
         
-        # Get daily aggregation
-        daily = df.resample('D').agg({
-            'high': 'max',
-            'low': 'min', 
-            'close': 'last'
-        }).dropna()
+        try:
+            bars = await asyncio.to_thread(self.stock_client.get_stock_bars, StockBarsRequest(
+                symbol_or_symbols=symbols,
+                timeframe=TimeFrame.Day,
+                start=datetime.now() - timedelta(days=7)
+            ))
+        except Exception as e:
+            self.logger.warning(f"[DATA] Error fetching daily bars: {e}")
+            return
         
-        if len(daily) < 1:
+        self.prev_session_date = today
+        for symbol in symbols:
+            prev = [bar for bar in bars.data.get(symbol, []) if bar.timestamp.date() < today]
+            self.prev_session[symbol] = (prev[-1].high, prev[-1].low, prev[-1].close) if prev else None
+    
+    def calculate_pivots(self, symbol: str) -> Dict[str, float]:
+        """Daily Pivot Points (previous session from load_prev_sessions)"""
+        prev = self.prev_session.get(symbol) if self.prev_session_date == datetime.now().date() else None
+        if prev is None:
             return {'pivot': 0, 'r1': 0, 'r2': 0, 's1': 0, 's2': 0}
         
-        prev = daily.iloc[-1]
-        h, l, c = prev['high'], prev['low'], prev['close']
+        h, l, c = prev
         
         pivot = (h + l + c) / 3
         r1 = 2 * pivot - l
@@ -472,89 +838,256 @@ class BeastEngine:
         
         return {'pivot': pivot, 'r1': r1, 'r2': r2, 's1': s1, 's2': s2}
     
-    def calculate_orb(self, df: pd.DataFrame, minutes: int = 15) -> Dict[str, float]:
-        """Opening Range Breakout levels"""
+    def calculate_orb(self, symbol: str, df: pd.DataFrame, minutes: int = 15) -> Dict[str, float]:
+        """
+        Opening Range Breakout levels
+        
+        Fixed once today's first `minutes` bars exist, so they are cached
+        per symbol for the rest of the day.
+        """
         today = datetime.now().date()
+        cached = self.orb_cache.get(symbol)
+        if cached is not None and cached['date'] == today and cached['minutes'] == minutes:
+            return cached['levels']
         
-        # Filter for today's data
-        today_df = df[df.index.date == today]
+        # Today's bars (the index is sorted, so two binary searches)
+        day_start = pd.Timestamp(today, tz=df.index.tz)
+        start, end = df.index.searchsorted([day_start, day_start + pd.Timedelta(days=1)])
         
-        if len(today_df) < minutes:
+        if end - start < minutes:
             return {'orb_high': 0, 'orb_low': 0}
         
         # First N minutes
-        orb_df = today_df.head(minutes)
-        
-        return {
-            'orb_high': float(orb_df['high'].max()),
-            'orb_low': float(orb_df['low'].min())
+        levels = {
+            'orb_high': float(df['high'].to_numpy()[start:start + minutes].max()),
+            'orb_low': float(df['low'].to_numpy()[start:start + minutes].min())
         }
+        self.orb_cache[symbol] = {'date': today, 'minutes': minutes, 'levels': levels}
+        return levels
+    
+    def compute_indicators(self, symbol: str, df: pd.DataFrame) -> Dict:
+        """
+        Scanner indicator set, carried over from the previous scan.
+        
+        Same bars with the same values as last time: the cached dict. New
+        bars appended (older ones may have dropped off the front): the EMA
+        stack, MACD, Wilder RSI/ADX and the VWAP sums are stepped over the
+        new bars only. A refetched last bar with revised values is stepped
+        again from the state before it. Anything else (first scan, gap or
+        rewrite in the data) is a full recompute. Stepped EMAs, RSI and ADX
+        keep the history of earlier scans instead of restarting at the
+        first bar of the window. ATR only needs the last INDICATOR_TAIL
+        bars, so it is always computed from those. Series values (EMA rows,
+        MACD lines) are plain float64 arrays lined up with df's bars, read
+        by position.
+        """
+        index = df.index.asi8
+        n = len(index)
+        arrays = self._arrays(df)
+        _, high, low, close, volume = arrays
+        state = self.indicator_state.get(symbol)
+        
+        # Where the previous bars sit in this frame (both offsets must agree),
+        # and from which bar on this frame has to be stepped
+        start = kept = first = 0
+        if state is not None:
+            kept = int(np.searchsorted(index, state.index[-1], side='right'))
+            start = int(np.searchsorted(state.index, index[0]))
+            if (kept == 0 or index[kept - 1] != state.index[-1] or start == len(state.index)
+                    or len(state.index) - start != kept or state.index[start] != index[0]):
+                state = None
+        if state is not None:
+            changed = np.zeros(kept, dtype=bool)
+            for old, new in zip(state.arrays, arrays):
+                changed |= old[start:] != new[:kept]
+            if not changed.any():
+                first = kept
+                if start == 0 and kept == n:
+                    return state.indicators
+            elif kept >= 2 and not changed[:-1].any():
+                first = kept - 1
+            else:
+                state = None
+        
+        tp_vol = (high + low + close) / 3 * volume
+        if state is None:
+            ema_avg, signal_avg = np.full(len(STATE_EMA_ALPHAS), close[0]), None
+            step = StepState(np.ones(len(STATE_EMA_ALPHAS)), np.ones(1), np.full(2, np.nan), np.zeros(5))
+            ema_parts, signal_parts = [], []
+            tp_vol_sum = float(tp_vol.sum())
+            vol_sum = float(volume.sum())
+        else:
+            ema_avg, signal_avg = state.ema[:, start + first - 1], state.signal[:, start + first - 1]
+            step = state.step if first == kept else state.before_last
+            ema_parts = [state.ema[:, start:start + first]]
+            signal_parts = [state.signal[:, start:start + first]]
+            rsi, adx = state.indicators['rsi'], state.indicators['adx']
+            before_last = state.before_last
+            end = start + first
+            tp_vol_sum = (state.tp_vol_sum - float(state.tp_vol[:start].sum()) - float(state.tp_vol[end:].sum())
+                          + float(tp_vol[first:].sum()))
+            vol_sum = (state.vol_sum - float(state.volume[:start].sum()) - float(state.volume[end:].sum())
+                       + float(volume[first:].sum()))
+        
+        # Up to the bar before last, then the last bar, keeping the state in between
+        for a, b in ((first, n - 1), (max(first, n - 1), n)):
+            if a < b:
+                new_ema, new_signal, rsi, adx, step = self._step_bars(arrays, a, b, ema_avg, signal_avg, step)
+                ema_parts.append(new_ema)
+                signal_parts.append(new_signal)
+                ema_avg, signal_avg = new_ema[:, -1], new_signal[:, -1]
+            if b == n - 1 and a <= b:
+                before_last = step
+        ema = np.concatenate(ema_parts, axis=1)
+        signal = np.concatenate(signal_parts, axis=1)
+        macd_line = ema[-2] - ema[-1]
+        
+        tail = slice(max(0, n - INDICATOR_TAIL), n)
+        atr = rolling_mean(true_range(high[tail], low[tail], close[tail]), ATR_PERIOD)
+        
+        indicators = {
+            'emas': dict(zip(EMA_STACK_KEYS, ema)),
+            'macd': {
+                'macd': macd_line,
+                'signal': signal[0],
+                'histogram': macd_line - signal[0]
+            },
+            'rsi': float(rsi),
+            'atr': float(atr[-1]),
+            'adx': float(adx),
+            'vwap': tp_vol_sum / vol_sum if vol_sum else float('nan'),
+            'vol_sma': self._volume_sma(volume),
+            'arrays': arrays
+        }
+        
+        self.indicator_state[symbol] = IndicatorState(
+            index=index, ema=ema, signal=signal, tp_vol=tp_vol, volume=volume,
+            tp_vol_sum=tp_vol_sum, vol_sum=vol_sum, step=step, before_last=before_last,
+            arrays=arrays, indicators=indicators
+        )
+        return indicators
+    
+    @staticmethod
+    def _step_bars(arrays: BarArrays, a: int, b: int, ema_avg: np.ndarray,
+                   signal_avg: Optional[np.ndarray], step: StepState) -> Tuple:
+        """
+        Step the EMA stack, MACD signal, Wilder RSI and ADX over bars [a, b)
+        from their values after bar a - 1 (a = 0: ema_avg is close[0] and
+        signal_avg None). Returns the EMA and signal rows of those bars, RSI
+        and ADX at bar b - 1 and the state after it; the inputs are left as is.
+        """
+        _, high, low, close, _ = arrays
+        ema_wt = step.ema_wt.copy()
+        ema = ewm_step_noadjust(close[a:b], STATE_EMA_ALPHAS, ema_avg.copy(), ema_wt)
+        macd_line = ema[-2] - ema[-1]
+        signal_wt = step.signal_wt.copy()
+        signal_avg = macd_line[:1].copy() if signal_avg is None else signal_avg.copy()
+        signal = ewm_step_noadjust(macd_line, MACD_SIGNAL_ALPHA, signal_avg, signal_wt)
+        
+        # The Wilder kernels take bar a - 1 for the first change; RSI without
+        # history yet is seeded from the start of the frame
+        prev = max(a - 1, 0)
+        rsi_avg = step.rsi_avg.copy()
+        lo = 0 if np.isnan(rsi_avg[0]) else prev
+        rsi = rsi_wilder(close[lo:b], RSI_PERIOD, rsi_avg, np.empty(b - lo))[-1]
+        adx_state = step.adx_state.copy()
+        adx = adx_wilder(high[prev:b], low[prev:b], close[prev:b], ADX_PERIOD,
+                         adx_state, np.empty(b - prev))[-1]
+        return ema, signal, rsi, adx, StepState(ema_wt, signal_wt, rsi_avg, adx_state)
+    
+    def add_levels(self, symbol: str, df: pd.DataFrame, indicators: Dict) -> Dict:
+        """
+        Add the pivot and ORB levels to a compute_indicators dict
+        
+        The scores don't use them, so the scan only adds them for symbols
+        that pass its filters.
+        """
+        if 'pivots' not in indicators:
+            indicators['pivots'] = self.calculate_pivots(symbol)
+            indicators['orb'] = self.calculate_orb(symbol, df, self.config.orb_minutes)
+        return indicators
+    
+    @staticmethod
+    def _arrays(df: pd.DataFrame, indicators: Optional[Dict] = None) -> BarArrays:
+        """
+        OHLCV columns of df as float64 arrays, extracted once per set of bars
+        compute_indicators keeps them under indicators['arrays'], so the
+        scoring methods that get the same indicators share them
+        """
+        if indicators is not None and 'arrays' in indicators:
+            return indicators['arrays']
+        if tuple(df.columns[:5]) == OHLCV_COLUMNS:
+            # fetch_bars' column order: one block copy instead of five column lookups
+            return BarArrays(*np.ascontiguousarray(df.to_numpy(dtype=np.float64)[:, :5].T))
+        return BarArrays(*(df[col].to_numpy(dtype=np.float64) for col in OHLCV_COLUMNS))
+    
+    @staticmethod
+    def _volume_sma(volume: np.ndarray) -> float:
+        """Volume SMA at the last bar: just the last VOLUME_SMA_PERIOD bars, not a rolling series"""
+        if len(volume) < VOLUME_SMA_PERIOD:
+            return float('nan')
+        return float(volume[-VOLUME_SMA_PERIOD:].mean())
     
     # =========================================================================
     # STRENGTH & QUALITY SCORES (From Pine Script)
     # =========================================================================
     
+    @staticmethod
+    def _hist_tail(indicators: Dict) -> Tuple[float, float]:
+        """Last two MACD histogram values (NaN where missing)"""
+        hist = indicators.get('macd', {}).get('histogram')
+        if hist is None:
+            return np.nan, np.nan
+        return float(hist[-1]), float(hist[-2]) if len(hist) > 1 else np.nan
+    
     def calculate_strength_score(self, df: pd.DataFrame, 
                                   indicators: Dict) -> int:
         """
         Calculate Strength Score (0-10)
         Based on Ultimate 0DTE Machine Pine Script
         """
-        score = 0
-        close = df['close'].iloc[-1]
+        a = self._arrays(df, indicators)
+        close = float(a.c[-1])
         
         emas = indicators.get('emas', {})
-        macd = indicators.get('macd', {})
-        rsi = indicators.get('rsi', 50)
-        vwap = indicators.get('vwap', close)
-        adx = indicators.get('adx', 20)
-        
-        # 1. Price vs VWAP
-        if close > vwap:
-            score += 1
-        
-        # 2. Price vs EMA9
-        if 'ema9' in emas and close > emas['ema9'].iloc[-1]:
-            score += 1
-        
-        # 3. Price vs EMA21
-        if 'ema21' in emas and close > emas['ema21'].iloc[-1]:
-            score += 1
-        
-        # 4. Price vs EMA50
-        if 'ema50' in emas and close > emas['ema50'].iloc[-1]:
-            score += 1
-        
-        # 5. EMA9 > EMA21 (short-term trend)
-        if 'ema9' in emas and 'ema21' in emas:
-            if emas['ema9'].iloc[-1] > emas['ema21'].iloc[-1]:
-                score += 1
-        
-        # 6. EMA21 > EMA50 (medium-term trend)
-        if 'ema21' in emas and 'ema50' in emas:
-            if emas['ema21'].iloc[-1] > emas['ema50'].iloc[-1]:
-                score += 1
-        
-        # 7. MACD positive
-        if 'histogram' in macd and macd['histogram'].iloc[-1] > 0:
-            score += 1
-        
-        # 8. MACD rising
-        if 'histogram' in macd and len(macd['histogram']) > 1:
-            if macd['histogram'].iloc[-1] > macd['histogram'].iloc[-2]:
-                score += 1
-        
-        # 9. RSI favorable (40-70 for calls, 30-60 for puts)
-        if 40 <= rsi <= 70:
-            score += 1
-        
-        # 10. Volume confirmation
-        if len(df) > 20:
-            vol_sma = df['volume'].rolling(20).mean().iloc[-1]
-            if df['volume'].iloc[-1] > vol_sma * 1.2:
-                score += 1
-        
-        return min(score, 10)
+        ema9, ema21, ema50 = (float(emas[k][-1]) if k in emas else np.nan
+                              for k in ('ema9', 'ema21', 'ema50'))
+        hist, hist_prev = self._hist_tail(indicators)
+        
+        # Volume confirmation needs more than 20 bars
+        vol_sma = np.nan
+        if len(a.c) > 20:
+            vol_sma = indicators.get('vol_sma')
+            if vol_sma is None:
+                vol_sma = self._volume_sma(a.v)
+        
+        return int(strength_score(
+            close, float(indicators.get('vwap', close)), ema9, ema21, ema50,
+            hist, hist_prev, float(indicators.get('rsi', 50)), float(a.v[-1]), float(vol_sma)
+        ))
+    
+    def record_strength(self, symbol: str, score: int):
+        """Append a strength score to the symbol's history row"""
+        row = self.strength_rows.get(symbol)
+        if row is None:
+            row = len(self.strength_rows)
+            if row == len(self.strength_history):
+                # More symbols than rows (queries outside the universe): double the buffer
+                self.strength_history = np.concatenate((self.strength_history, np.zeros_like(self.strength_history)))
+                self.strength_count = np.concatenate((self.strength_count, np.zeros_like(self.strength_count)))
+            self.strength_rows[symbol] = row
+        self.strength_history[row, self.strength_count[row] % STRENGTH_HISTORY_LEN] = score
+        self.strength_count[row] += 1
+    
+    def get_strength_history(self, symbol: str) -> np.ndarray:
+        """Recorded strength scores for a symbol, oldest first (at most STRENGTH_HISTORY_LEN)"""
+        row = self.strength_rows.get(symbol)
+        if row is None:
+            return np.zeros(0, dtype=np.int8)
+        count = self.strength_count[row]
+        if count < STRENGTH_HISTORY_LEN:
+            return self.strength_history[row, :count].copy()
+        return np.roll(self.strength_history[row], -(count % STRENGTH_HISTORY_LEN))
     
     def calculate_quality_score(self, strength: int, indicators: Dict,
                                  option_flow: Dict, market_state: MarketState) -> int:
@@ -562,174 +1095,145 @@ class BeastEngine:
         Calculate Quality Score (0-100)
         Based on Ultimate 0DTE Machine + God Mode
         """
-        score = 0
-        
-        # Base from strength (0-10 -> 0-50)
-        score += strength * 5
-        
-        # ADX trend strength (0-15)
-        adx = indicators.get('adx', 20)
-        if adx > 25:
-            score += 10
-        elif adx > 20:
-            score += 7
-        elif adx > 15:
-            score += 5
-        
-        # RSI position (0-10)
-        rsi = indicators.get('rsi', 50)
-        if 30 <= rsi <= 70:
-            score += 5
-        if 40 <= rsi <= 60:
-            score += 5
-        
-        # MACD confirmation (0-10)
-        macd = indicators.get('macd', {})
-        if 'histogram' in macd:
-            hist = macd['histogram'].iloc[-1]
-            if abs(hist) > 0.1:
-                score += 5
-            if len(macd['histogram']) > 1:
-                if (hist > 0 and hist > macd['histogram'].iloc[-2]) or \
-                   (hist < 0 and hist < macd['histogram'].iloc[-2]):
-                    score += 5
-        
-        # Option flow confirmation (0-10)
-        call_pct = option_flow.get('call_pct', 50)
-        if call_pct > 60:  # Bullish flow
-            score += 5
-        if option_flow.get('unusual_activity', False):
-            score += 5
-        
-        # Market regime adjustment
-        if market_state.regime == MarketRegime.GREEN:
-            score = int(score * 1.1)
-        elif market_state.regime == MarketRegime.RED:
-            score = int(score * 0.7)
-        
-        # Time phase bonus
-        if market_state.phase == TimePhase.POWER:
-            score += 10  # Power hour bonus
-        elif market_state.phase == TimePhase.ORB:
-            score += 5   # ORB bonus
-        
-        return min(score, 100)
+        hist, hist_prev = self._hist_tail(indicators)
+        return int(quality_score(
+            int(strength), float(indicators.get('adx', 20)), float(indicators.get('rsi', 50)),
+            hist, hist_prev, float(option_flow.get('call_pct', 50)),
+            bool(option_flow.get('unusual_activity', False)),
+            REGIME_QUALITY_MULT.get(market_state.regime, 1.0),
+            PHASE_QUALITY_BONUS.get(market_state.phase, 0)
+        ))
     
     # =========================================================================
     # AI PREDICTION
     # =========================================================================
     
-    def ai_predict(self, features: Dict[str, float]) -> Tuple[Direction, float]:
+    def ai_predict(self, X: np.ndarray) -> Tuple[Direction, float]:
         """
         Get AI prediction from ensemble model
+        X is the (1, n_features) row from prepare_ai_features
         Returns: (Direction, Confidence%)
         """
+        return self.ai_predict_batch(X)[0]
+    
+    def ai_predict_batch(self, X: np.ndarray) -> List[Tuple[Direction, float]]:
+        """
+        AI predictions for many symbols at once
+        
+        X is an (n_symbols, n_features) matrix; each model is called once
+        for all rows. Returns one (Direction, Confidence%) per row.
+        """
         if '0dte' not in self.models:
-            return Direction.NEUTRAL, 50.0
+            return [(Direction.NEUTRAL, 50.0)] * len(X)
+        if len(X) == 0:
+            return []
         
         model_data = self.models['0dte']
-        feature_names = model_data.get('features', [])
-        
-        # Prepare feature vector
-        X = np.zeros((1, len(feature_names)))
-        for i, name in enumerate(feature_names):
-            X[0, i] = features.get(name, 0)
         
         predictions = []
         confidences = []
         
-        # Random Forest
-        if model_data.get('rf'):
-            try:
-                pred = model_data['rf'].predict(X)[0]
-                proba = model_data['rf'].predict_proba(X)[0]
-                predictions.append(pred)
-                confidences.append(max(proba) * 100)
-            except:
-                pass
-        
-        # XGBoost
-        if model_data.get('xgb'):
-            try:
-                pred = model_data['xgb'].predict(X)[0]
-                proba = model_data['xgb'].predict_proba(X)[0]
-                predictions.append(pred)
-                confidences.append(max(proba) * 100)
-            except:
-                pass
-        
-        # LightGBM
-        if model_data.get('lgb'):
-            try:
-                pred = model_data['lgb'].predict(X)[0]
-                proba = model_data['lgb'].predict_proba(X)[0]
-                predictions.append(pred)
-                confidences.append(max(proba) * 100)
-            except:
-                pass
+        compiled = model_data.get('compiled', {})
+        
+        # Random Forest, XGBoost, LightGBM
+        for key in ('rf', 'xgb', 'lgb'):
+            model = model_data.get(key)
+            if model:
+                try:
+                    predictor = compiled.get(key)
+                    if predictor is not None:
+                        proba = predictor.predict(tl2cgen.DMatrix(X)).reshape(len(X), -1)
+                    else:
+                        proba = model.predict_proba(X)
+                    # Same label predict() would give, without running the trees twice
+                    pred = model.classes_[proba.argmax(axis=1)]
+                    predictions.append(pred)
+                    confidences.append(proba.max(axis=1) * 100)
+                except:
+                    pass
         
         if not predictions:
-            return Direction.NEUTRAL, 50.0
+            return [(Direction.NEUTRAL, 50.0)] * len(X)
         
-        # Ensemble voting
-        avg_pred = np.mean(predictions)
-        avg_conf = np.mean(confidences)
+        # Ensemble voting (per row)
+        avg_pred = np.mean(predictions, axis=0)
+        avg_conf = np.mean(confidences, axis=0)
         
-        # Map to direction (assuming 0=down, 1=neutral, 2=up)
-        if avg_pred >= 1.5:
-            return Direction.CALL, avg_conf
-        elif avg_pred <= 0.5:
-            return Direction.PUT, avg_conf
-        else:
-            return Direction.NEUTRAL, avg_conf
+        # Map to direction (assuming 0=down, 1=neutral, 2=up):
+        # <= 0.5 -> PUT, >= 1.5 -> CALL, in between NEUTRAL
+        votes = (avg_pred > 0.5).astype(np.intp) + (avg_pred >= 1.5)
+        return [(ENSEMBLE_DIRECTIONS[v], conf) for v, conf in zip(votes, avg_conf)]
     
-    def prepare_ai_features(self, df: pd.DataFrame, 
-                            indicators: Dict) -> Dict[str, float]:
-        """Prepare features for AI model"""
-        features = {}
+    def prepare_ai_features(self, df: pd.DataFrame, indicators: Dict,
+                            out: Optional[np.ndarray] = None) -> np.ndarray:
+        """
+        Prepare features for AI model
         
-        close = df['close']
-        volume = df['volume']
+        Values are written by column index into a float32 feature row:
+        ``out`` (a row of a batch matrix) or the model's (1, n_features)
+        buffer, which is reused across calls and returned. Features the
+        model doesn't use are skipped; the ones that can't be computed
+        stay 0.
+        """
+        X = self.feature_buffer if out is None else out
+        X.fill(0)
+        row = X.reshape(-1)
+        index = self.feature_index
+        
+        def put(name: str, value: float):
+            i = index.get(name)
+            if i is not None:
+                row[i] = value
+        
+        a = self._arrays(df, indicators)
+        close, volume = a.c, a.v
+        price = close[-1]
         
         # Price features
-        features['close'] = float(close.iloc[-1])
-        features['returns_1'] = float(close.pct_change().iloc[-1] * 100) if len(close) > 1 else 0
-        features['returns_5'] = float(close.pct_change(5).iloc[-1] * 100) if len(close) > 5 else 0
-        features['returns_10'] = float(close.pct_change(10).iloc[-1] * 100) if len(close) > 10 else 0
+        put('close', price)
+        if len(close) > 1:
+            put('returns_1', (price / close[-2] - 1) * 100)
+        if len(close) > 5:
+            put('returns_5', (price / close[-6] - 1) * 100)
+        if len(close) > 10:
+            put('returns_10', (price / close[-11] - 1) * 100)
         
         # Technical indicators
         emas = indicators.get('emas', {})
         macd = indicators.get('macd', {})
         
-        features['rsi'] = float(indicators.get('rsi', 50))
-        features['adx'] = float(indicators.get('adx', 20))
+        put('rsi', indicators.get('rsi', 50))
+        put('adx', indicators.get('adx', 20))
         
         if 'ema9' in emas:
-            features['price_to_ema9'] = float(close.iloc[-1] / emas['ema9'].iloc[-1])
+            put('price_to_ema9', price / emas['ema9'][-1])
         if 'ema21' in emas:
-            features['price_to_ema21'] = float(close.iloc[-1] / emas['ema21'].iloc[-1])
+            put('price_to_ema21', price / emas['ema21'][-1])
         if 'ema50' in emas:
-            features['price_to_ema50'] = float(close.iloc[-1] / emas['ema50'].iloc[-1])
+            put('price_to_ema50', price / emas['ema50'][-1])
         
         if 'histogram' in macd:
-            features['macd_hist'] = float(macd['histogram'].iloc[-1])
+            put('macd_hist', macd['histogram'][-1])
         
         # Volume features
         if len(volume) > 20:
-            vol_sma = volume.rolling(20).mean().iloc[-1]
-            features['volume_ratio'] = float(volume.iloc[-1] / vol_sma) if vol_sma > 0 else 1.0
+            vol_sma = indicators.get('vol_sma')
+            if vol_sma is None:
+                vol_sma = self._volume_sma(volume)
+            put('volume_ratio', volume[-1] / vol_sma if vol_sma > 0 else 1.0)
         
         # Volatility
-        features['atr'] = float(indicators.get('atr', 1.0))
-        features['atr_pct'] = float(features['atr'] / close.iloc[-1] * 100)
+        atr = float(indicators.get('atr', 1.0))
+        put('atr', atr)
+        put('atr_pct', atr / price * 100)
         
-        # Time features
-        now = datetime.now()
-        features['hour'] = float(now.hour)
-        features['minute'] = float(now.minute)
-        features['minutes_to_close'] = float(max(0, (16 * 60 - (now.hour * 60 + now.minute))))
+        # Time features (ET, like the training bars)
+        now = datetime.now(ET)
+        put('hour', now.hour)
+        put('minute', now.minute)
+        put('minutes_to_close', max(0, (16 * 60 - (now.hour * 60 + now.minute))))
         
-        return features
+        return X
     
     # =========================================================================
     # OPTION FLOW ANALYSIS
@@ -749,62 +1253,47 @@ class BeastEngine:
         try:
             # Try yfinance first
             if YF_AVAILABLE:
-                ticker = yf.Ticker(symbol)
-                
-                # Get 0DTE expiration
-                expirations = ticker.options
-                if not expirations:
+                # Blocking HTTP (or a cache read) off the event loop, so the
+                # scan can have several chains in flight
+                chain = await asyncio.to_thread(self._load_flow_chain, symbol)
+                if chain is None:
                     return result
                 
-                # Find today's expiration or nearest
-                today = datetime.now().strftime('%Y-%m-%d')
-                target_exp = expirations[0]  # Default to nearest
-                
-                for exp in expirations:
-                    if exp == today:
-                        target_exp = exp
-                        break
-                
-                # Get option chain
-                chain = ticker.option_chain(target_exp)
                 calls = chain.calls
                 puts = chain.puts
                 
-                if calls.empty or puts.empty:
+                if len(calls['strike']) == 0 or len(puts['strike']) == 0:
                     return result
                 
-                # Filter strikes near current price (+/- 5%)
+                # Filter strikes near current price (+/- 5%); strikes are sorted,
+                # so each side's window is one slice
                 strike_range = current_price * 0.05
-                calls = calls[(calls['strike'] >= current_price - strike_range) & 
-                             (calls['strike'] <= current_price + strike_range)]
-                puts = puts[(puts['strike'] >= current_price - strike_range) & 
-                           (puts['strike'] <= current_price + strike_range)]
+                call_win = strike_window(calls, current_price - strike_range, current_price + strike_range)
+                put_win = strike_window(puts, current_price - strike_range, current_price + strike_range)
+                call_vol = calls['volume'][call_win]
+                put_vol = puts['volume'][put_win]
                 
                 # Calculate call/put ratio
-                total_call_vol = float(calls['volume'].sum()) if not calls.empty else 0
-                total_put_vol = float(puts['volume'].sum()) if not puts.empty else 0
+                total_call_vol = float(call_vol.sum())
+                total_put_vol = float(put_vol.sum())
                 total_vol = total_call_vol + total_put_vol
                 
                 if total_vol > 0:
                     result['call_pct'] = total_call_vol / total_vol * 100
                     result['put_pct'] = total_put_vol / total_vol * 100
                 
-                # Find magnet strike (highest open interest)
-                if not calls.empty and not puts.empty:
-                    all_strikes = pd.concat([
-                        calls[['strike', 'openInterest']],
-                        puts[['strike', 'openInterest']]
-                    ])
-                    
-                    if not all_strikes.empty and all_strikes['openInterest'].sum() > 0:
-                        magnet_idx = all_strikes['openInterest'].idxmax()
-                        result['magnet_strike'] = float(all_strikes.loc[magnet_idx, 'strike'])
+                # Find magnet strike (highest open interest, calls first on ties)
+                if len(call_vol) and len(put_vol):
+                    oi = np.concatenate((calls['openInterest'][call_win], puts['openInterest'][put_win]))
+                    if oi.sum() > 0:
+                        strikes = np.concatenate((calls['strike'][call_win], puts['strike'][put_win]))
+                        result['magnet_strike'] = float(strikes[np.argmax(oi)])
                 
                 # Detect unusual activity
-                num_options = len(calls) + len(puts)
+                num_options = len(call_vol) + len(put_vol)
                 avg_vol = total_vol / num_options if num_options > 0 else 0
-                max_call_vol = float(calls['volume'].max()) if not calls.empty and len(calls) > 0 else 0
-                max_put_vol = float(puts['volume'].max()) if not puts.empty and len(puts) > 0 else 0
+                max_call_vol = float(call_vol.max()) if len(call_vol) else 0
+                max_put_vol = float(put_vol.max()) if len(put_vol) else 0
                 max_vol = max(max_call_vol, max_put_vol)
                 
                 if max_vol > avg_vol * 3:
@@ -821,17 +1310,48 @@ class BeastEngine:
         
         return result
     
+    def _load_flow_chain(self, symbol: str):
+        """Today's option chain (nearest expiration if none today), None without options"""
+        expirations = get_expirations(symbol)
+        if not expirations:
+            return None
+        
+        today = datetime.now().strftime('%Y-%m-%d')
+        target_exp = today if today in expirations else expirations[0]
+        return load_chain(symbol, target_exp)
+    
     # =========================================================================
     # SIGNAL DETECTION
     # =========================================================================
     
+    @staticmethod
+    def trap_masks(high: np.ndarray, low: np.ndarray,
+                   close: np.ndarray) -> Tuple[np.ndarray, np.ndarray]:
+        """
+        Failed-breakout flags for many symbols at once
+        high/low/close are (n_symbols, 5) windows of the last 5 bars
+        Returns: (bull_trap, bear_trap) boolean arrays
+        """
+        # Bull trap: broke high then reversed down
+        bull = (high[:, -3] >= high.max(axis=1)) & (close[:, -1] < close[:, -3])
+        # Bear trap: broke low then reversed up
+        bear = (low[:, -3] <= low.min(axis=1)) & (close[:, -1] > close[:, -3])
+        return bull, bear
+    
     def detect_signal_type(self, df: pd.DataFrame, indicators: Dict,
-                           strength_score: int) -> Tuple[SignalType, List[str]]:
-        """Detect the type of signal based on conditions"""
+                           strength_score: int,
+                           trap: Optional[Tuple[bool, bool]] = None) -> Tuple[SignalType, List[str]]:
+        """
+        Detect the type of signal based on conditions
+        trap is the symbol's (bull_trap, bear_trap) from trap_masks when
+        the scan already computed it for the whole batch
+        """
         reasons = []
-        now = datetime.now()
+        now = datetime.now(ET)
         
-        close = df['close'].iloc[-1]
+        a = self._arrays(df, indicators)
+        c = a.c
+        close = c[-1]
         
         # Check Power Hour (3 PM - 4 PM ET)
         if now.hour >= 15:
@@ -849,24 +1369,22 @@ class BeastEngine:
                 return SignalType.ORB_BREAKOUT, reasons
         
         # Check for Trap (failed breakout reversal)
-        if len(df) >= 5:
-            recent_high = df['high'].iloc[-5:].max()
-            recent_low = df['low'].iloc[-5:].min()
-            
-            # Bull trap: broke high then reversed down
-            if df['high'].iloc[-3] >= recent_high and close < df['close'].iloc[-3]:
+        if trap is None and len(c) >= 5:
+            bull, bear = self.trap_masks(a.h[None, -5:], a.l[None, -5:], c[None, -5:])
+            trap = (bull[0], bear[0])
+        if trap is not None:
+            bull_trap, bear_trap = trap
+            if bull_trap:
                 reasons.append("Bull Trap detected - reversal signal")
                 return SignalType.TRAP, reasons
-            
-            # Bear trap: broke low then reversed up
-            if df['low'].iloc[-3] <= recent_low and close > df['close'].iloc[-3]:
+            if bear_trap:
                 reasons.append("Bear Trap detected - reversal signal")
                 return SignalType.TRAP, reasons
         
         # Check for Early Warning (divergence)
         rsi = indicators.get('rsi', 50)
-        if len(df) >= 10:
-            price_trend = df['close'].iloc[-1] > df['close'].iloc[-10]
+        if len(c) >= 10:
+            price_trend = c[-1] > c[-10]
             rsi_trend = rsi > 50
             
             if price_trend and not rsi_trend:
@@ -898,7 +1416,8 @@ class BeastEngine:
         bullish_votes = 0
         bearish_votes = 0
         
-        close = df['close'].iloc[-1]
+        c = self._arrays(df, indicators).c
+        close = c[-1]
         emas = indicators.get('emas', {})
         macd = indicators.get('macd', {})
         rsi = indicators.get('rsi', 50)
@@ -922,8 +1441,8 @@ class BeastEngine:
         
         # 3. EMA alignment (weight: 2)
         if 'ema9' in emas and 'ema21' in emas:
-            ema9 = emas['ema9'].iloc[-1]
-            ema21 = emas['ema21'].iloc[-1]
+            ema9 = emas['ema9'][-1]
+            ema21 = emas['ema21'][-1]
             
             if ema9 > ema21 and close > ema9:
                 bullish_votes += 2
@@ -934,7 +1453,7 @@ class BeastEngine:
         
         # 4. MACD (weight: 2)
         if 'histogram' in macd:
-            hist = macd['histogram'].iloc[-1]
+            hist = macd['histogram'][-1]
             if hist > 0:
                 bullish_votes += 2
                 reasons.append("MACD bullish")
@@ -960,8 +1479,8 @@ class BeastEngine:
             reasons.append(f"Options: {100-call_pct:.0f}% puts")
         
         # 7. Recent momentum (weight: 1)
-        if len(df) >= 5:
-            momentum = (close - df['close'].iloc[-5]) / df['close'].iloc[-5] * 100
+        if len(c) >= 5:
+            momentum = (close - c[-5]) / c[-5] * 100
             if momentum > 0.1:
                 bullish_votes += 1
                 reasons.append(f"Momentum +{momentum:.1f}%")
@@ -984,63 +1503,54 @@ class BeastEngine:
     
     def calculate_targets(self, df: pd.DataFrame, direction: Direction,
                           indicators: Dict) -> Tuple[float, float]:
-        """Calculate target and stop prices"""
-        close = float(df['close'].iloc[-1])
+        """
+        Calculate target and stop prices
+        Unrounded: alerts and queries format them to cents
+        """
+        close = self._arrays(df, indicators).c[-1]
         atr = indicators.get('atr', close * 0.01)
         
         # Ensure ATR is at least 0.3% of price for 0DTE
-        min_atr = close * 0.003
-        atr = max(float(atr), min_atr)
-        
-        if direction == Direction.CALL:
-            target = close + (atr * 2.0)   # 2 ATR target
-            stop = close - (atr * 1.0)     # 1 ATR stop
-        else:
-            target = close - (atr * 2.0)
-            stop = close + (atr * 1.0)
+        atr = max(atr, close * 0.003)
         
-        return round(target, 2), round(stop, 2)
+        # 2 ATR target, 1 ATR stop, on the side of the trade
+        side = 1.0 if direction == Direction.CALL else -1.0
+        return float(close + side * 2.0 * atr), float(close - side * atr)
     
     # =========================================================================
     # MARKET STATE
     # =========================================================================
     
-    async def update_market_state(self) -> MarketState:
-        """Update current market state"""
-        now = datetime.now()
+    async def update_market_state(self, force: bool = False) -> MarketState:
+        """
+        Update current market state
+        A state less than MARKET_STATE_TTL seconds old is returned as is
+        (no VIX/SPY requests) unless force is set
+        """
+        if (not force and self.market_state_time is not None
+                and time.monotonic() - self.market_state_time < MARKET_STATE_TTL):
+            return self.market_state
         
-        # Get VIX
-        vix = await self.get_vix()
+        now = datetime.now(ET)
         
-        # Determine regime
-        if vix <= self.config.vix_green_max:
-            regime = MarketRegime.GREEN
-        elif vix <= self.config.vix_yellow_max:
-            regime = MarketRegime.YELLOW
-        else:
+        # Get VIX and SPY bars (fetched concurrently)
+        vix, spy_df = await asyncio.gather(
+            self.get_vix(),
+            self.fetch_bars("SPY", "1Min", 1)
+        )
+        
+        # Determine regime (a VIX at a threshold stays in the lower regime; NaN is RED)
+        if np.isnan(vix):
             regime = MarketRegime.RED
+        else:
+            regime = REGIMES[bisect_left((self.config.vix_green_max, self.config.vix_yellow_max), vix)]
         
         # Determine time phase
-        hour = now.hour
-        minute = now.minute
-        
-        if hour < 9 or (hour == 9 and minute < 30):
-            phase = TimePhase.PREMARKET
-        elif hour == 9 and minute < 45:
-            phase = TimePhase.ORB
-        elif hour < 11:
-            phase = TimePhase.BREAKOUT
-        elif hour < 15:
-            phase = TimePhase.REVERSAL
-        elif hour < 16:
-            phase = TimePhase.POWER
-        else:
-            phase = TimePhase.CLOSED
+        phase = PHASE_BY_MINUTE[now.hour * 60 + now.minute]
         
-        # Get SPY data
-        spy_df = await self.fetch_bars("SPY", "1Min", 1)
-        spy_price = float(spy_df['close'].iloc[-1]) if not spy_df.empty else 0
-        spy_open = float(spy_df['open'].iloc[0]) if not spy_df.empty else spy_price
+        # SPY data
+        spy_price = float(spy_df['close'].iat[-1]) if not spy_df.empty else 0
+        spy_open = float(spy_df['open'].iat[0]) if not spy_df.empty else spy_price
         spy_change = ((spy_price - spy_open) / spy_open * 100) if spy_open > 0 else 0
         
         self.market_state = MarketState(
@@ -1051,6 +1561,7 @@ class BeastEngine:
             phase=phase,
             is_trading_day=True  # TODO: Check trading calendar
         )
+        self.market_state_time = time.monotonic()
         
         return self.market_state
     
@@ -1087,102 +1598,127 @@ class BeastEngine:
     async def scan_symbol(self, symbol: str) -> Optional[Signal]:
         """Scan a single symbol for trading opportunities"""
         try:
-            # Fetch data
-            df = await self.fetch_bars(symbol, "1Min", 2)
-            if df.empty or len(df) < 50:
-                return None
-            
-            # Calculate indicators
-            emas = self.calculate_ema_stack(df)
-            macd = self.calculate_macd(df['close'])
-            rsi = float(self.calculate_rsi(df['close']).iloc[-1])
-            atr = float(self.calculate_atr(df).iloc[-1])
-            adx = float(self.calculate_adx(df).iloc[-1])
-            vwap = float(self.calculate_vwap(df).iloc[-1])
-            pivots = self.calculate_pivots(df)
-            orb = self.calculate_orb(df, self.config.orb_minutes)
-            
-            indicators = {
-                'emas': emas,
-                'macd': macd,
-                'rsi': rsi,
-                'atr': atr,
-                'adx': adx,
-                'vwap': vwap,
-                'pivots': pivots,
-                'orb': orb
-            }
-            
-            # Calculate strength score
-            strength_score = self.calculate_strength_score(df, indicators)
-            
-            # Quick filter - minimum strength
-            if strength_score < self.config.min_strength_score:
+            await self.load_prev_sessions([symbol])
+            candidate = await self._scan_candidate(symbol)
+            if candidate is None:
                 return None
-            
-            # Get option flow
-            current_price = float(df['close'].iloc[-1])
-            option_flow = await self.analyze_option_flow(symbol, current_price)
-            
-            # AI prediction
-            ai_features = self.prepare_ai_features(df, indicators)
-            ai_direction, ai_confidence = self.ai_predict(ai_features)
-            
-            # Determine final direction
-            direction, direction_reasons = self.determine_direction(
-                df, indicators, option_flow, ai_direction, ai_confidence
-            )
-            
-            # Skip neutral
-            if direction == Direction.NEUTRAL:
-                return None
-            
-            # Calculate quality score
-            quality_score = self.calculate_quality_score(
-                strength_score, indicators, option_flow, self.market_state
-            )
-            
-            # Filter by minimum quality
-            if quality_score < self.config.min_quality_score:
-                return None
-            
-            # Detect signal type
-            signal_type, type_reasons = self.detect_signal_type(
-                df, indicators, strength_score
-            )
-            
-            # Calculate targets
-            target_price, stop_price = self.calculate_targets(df, direction, indicators)
-            
-            # Build signal
-            signal = Signal(
-                symbol=symbol,
-                direction=direction,
-                signal_type=signal_type,
-                strength_score=strength_score,
-                quality_score=quality_score,
-                ai_confidence=ai_confidence,
-                entry_price=current_price,
-                target_price=target_price,
-                stop_price=stop_price,
-                reasons=direction_reasons + type_reasons,
-                call_pct=option_flow.get('call_pct', 50),
-                put_pct=option_flow.get('put_pct', 50),
-                magnet_strike=option_flow.get('magnet_strike'),
-                unusual_activity=option_flow.get('unusual_activity', False),
-                vwap=vwap,
-                orb_high=orb.get('orb_high', 0),
-                orb_low=orb.get('orb_low', 0),
-                pivot=pivots.get('pivot', 0),
-                r1=pivots.get('r1', 0),
-                s1=pivots.get('s1', 0)
-            )
-            
-            return signal
-            
+            X = self.prepare_ai_features(candidate.df, candidate.indicators)
+            ai_direction, ai_confidence = self.ai_predict(X)
+            return self._build_signal(candidate, ai_direction, ai_confidence)
         except Exception as e:
-            self.logger.error(f"[SCAN] Error scanning {symbol}: {e}")
+            self.logger.error(f"[SCAN] Error scanning {symbol}: {e}", exc_info=e)
+            return None
+    
+    async def _scan_candidate(self, symbol: str,
+                              df: Optional[pd.DataFrame] = None) -> Optional[ScanCandidate]:
+        """
+        Data, indicators, strength filter and option flow for one symbol
+        df is the symbol's bars when the scan already fetched them
+        Errors propagate; the caller logs them with the symbol
+        """
+        # Fetch data
+        if df is None:
+            df = await self.fetch_bars(symbol, "1Min", 2)
+        if df.empty or len(df) < 50:
+            return None
+        
+        # Calculate indicators (stepped from the previous scan when possible)
+        indicators = self.compute_indicators(symbol, df)
+        
+        # Calculate strength score
+        strength_score = self.calculate_strength_score(df, indicators)
+        
+        self.record_strength(symbol, strength_score)
+        
+        # Quick filter - minimum strength
+        if strength_score < self.config.min_strength_score:
+            return None
+        
+        # Quality ceiling: with the best possible option flow. If even
+        # that misses the cutoff, skip the flow fetch and the AI
+        max_quality = self.calculate_quality_score(
+            strength_score, indicators, BEST_CASE_FLOW, self.market_state
+        )
+        if max_quality < self.config.min_quality_score:
             return None
+        
+        # Pivot / ORB levels for the signal
+        self.add_levels(symbol, df, indicators)
+        
+        # Get option flow
+        current_price = float(indicators['arrays'].c[-1])
+        option_flow = await self.analyze_option_flow(symbol, current_price)
+        
+        return ScanCandidate(symbol, df, indicators, strength_score, current_price, option_flow)
+    
+    def _build_signal(self, candidate: ScanCandidate, ai_direction: Direction,
+                      ai_confidence: float,
+                      trap: Optional[Tuple[bool, bool]] = None) -> Optional[Signal]:
+        """
+        Direction, quality filter and signal for a candidate with its AI prediction
+        trap is the candidate's (bull_trap, bear_trap) when computed for the batch
+        Errors propagate; the caller logs them with the symbol
+        """
+        symbol = candidate.symbol
+        df = candidate.df
+        indicators = candidate.indicators
+        strength_score = candidate.strength_score
+        option_flow = candidate.option_flow
+        vwap = indicators['vwap']
+        pivots = indicators['pivots']
+        orb = indicators['orb']
+        
+        # Determine final direction
+        direction, direction_reasons = self.determine_direction(
+            df, indicators, option_flow, ai_direction, ai_confidence
+        )
+        
+        # Skip neutral
+        if direction == Direction.NEUTRAL:
+            return None
+        
+        # Calculate quality score
+        quality_score = self.calculate_quality_score(
+            strength_score, indicators, option_flow, self.market_state
+        )
+        
+        # Filter by minimum quality
+        if quality_score < self.config.min_quality_score:
+            return None
+        
+        # Detect signal type
+        signal_type, type_reasons = self.detect_signal_type(
+            df, indicators, strength_score, trap
+        )
+        
+        # Calculate targets
+        target_price, stop_price = self.calculate_targets(df, direction, indicators)
+        
+        # Build signal
+        signal = Signal(
+            symbol=symbol,
+            direction=direction,
+            signal_type=signal_type,
+            strength_score=strength_score,
+            quality_score=quality_score,
+            ai_confidence=ai_confidence,
+            entry_price=candidate.current_price,
+            target_price=target_price,
+            stop_price=stop_price,
+            reasons=(*direction_reasons, *type_reasons),
+            call_pct=option_flow.get('call_pct', 50),
+            put_pct=option_flow.get('put_pct', 50),
+            magnet_strike=option_flow.get('magnet_strike'),
+            unusual_activity=option_flow.get('unusual_activity', False),
+            vwap=vwap,
+            orb_high=orb.get('orb_high', 0),
+            orb_low=orb.get('orb_low', 0),
+            pivot=pivots.get('pivot', 0),
+            r1=pivots.get('r1', 0),
+            s1=pivots.get('s1', 0)
+        )
+        
+        return signal
     
     async def scan_market(self) -> List[Signal]:
         """Scan entire market for opportunities"""
@@ -1211,11 +1747,61 @@ class BeastEngine:
         if not self.universe:
             await self.load_universe()
         
-        # Scan all symbols
+        # Previous-session levels for the whole universe in one request (once a day)
+        await self.load_prev_sessions(self.universe)
+        
+        # Bars for the whole universe in one request (only the new ones
+        # after the first scan). If that comes back empty, each symbol falls
+        # back to its own fetch
+        frames = await self.update_universe_bars(self.universe, "1Min", 2)
+        missing = pd.DataFrame() if frames else None
+        
+        # Scan all symbols: candidates first (option-flow fetches overlap),
+        # then one AI call for all of them
+        semaphore = asyncio.Semaphore(FLOW_CONCURRENCY)
+        
+        async def scan_candidate(symbol: str) -> Optional[ScanCandidate]:
+            async with semaphore:
+                return await self._scan_candidate(symbol, frames.get(symbol, missing))
+        
+        # A failing symbol is logged (with its traceback) and left out
+        candidates: List[ScanCandidate] = []
+        results = await asyncio.gather(*map(scan_candidate, self.universe), return_exceptions=True)
+        for symbol, result in zip(self.universe, results):
+            if isinstance(result, Exception):
+                self.logger.error(f"[SCAN] Error scanning {symbol}: {result}", exc_info=result)
+            elif isinstance(result, BaseException):
+                raise result
+            elif result is not None:
+                candidates.append(result)
+        
+        X = np.zeros((len(candidates), len(self.feature_index)), dtype=np.float32)
+        for row, candidate in zip(X, candidates):
+            self.prepare_ai_features(candidate.df, candidate.indicators, out=row)
+        predictions = self.ai_predict_batch(X)
+        
+        # Trap patterns for the whole batch over each candidate's last 5 bars
+        traps: List[Optional[Tuple[bool, bool]]] = [None] * len(candidates)
+        rows = [i for i, candidate in enumerate(candidates) if len(candidate.df) >= 5]
+        if rows:
+            arrays = [self._arrays(candidates[i].df, candidates[i].indicators) for i in rows]
+            bull, bear = self.trap_masks(
+                np.stack([a.h[-5:] for a in arrays]),
+                np.stack([a.l[-5:] for a in arrays]),
+                np.stack([a.c[-5:] for a in arrays])
+            )
+            for i, b, s in zip(rows, bull, bear):
+                traps[i] = (b, s)
+        
         signals: List[Signal] = []
         
-        for symbol in self.universe:
-            signal = await self.scan_symbol(symbol)
+        for candidate, (ai_direction, ai_confidence), trap in zip(candidates, predictions, traps):
+            symbol = candidate.symbol
+            try:
+                signal = self._build_signal(candidate, ai_direction, ai_confidence, trap)
+            except Exception as e:
+                self.logger.error(f"[SCAN] Error scanning {symbol}: {e}", exc_info=e)
+                continue
             if signal:
                 signals.append(signal)
                 self.logger.info(f"[SIGNAL] {symbol}: {signal.direction.value} | "
@@ -1240,62 +1826,40 @@ class BeastEngine:
             return
         
         try:
-            url = f"https://api.telegram.org/bot{self.config.telegram_bot_token}/sendMessage"
+            # One pooled session for all sends: no new TCP/TLS handshake per message
+            if self.http_session is None or self.http_session.closed:
+                self.http_session = aiohttp.ClientSession(timeout=aiohttp.ClientTimeout(total=10))
             
-            async with aiohttp.ClientSession() as session:
-                await session.post(url, json={
-                    'chat_id': self.config.telegram_chat_id,
-                    'text': message,
-                    'parse_mode': 'HTML'
-                })
+            payload = {
+                'chat_id': self.config.telegram_chat_id,
+                'text': message,
+                'parse_mode': 'HTML'
+            }
+            body = orjson.dumps(payload) if ORJSON_AVAILABLE else json.dumps(payload).encode()
+            async with self.http_session.post(self.telegram_url, data=body,
+                                              headers=JSON_HEADERS) as response:
+                await response.read()
                 
         except Exception as e:
             self.logger.error(f"[TELEGRAM] Error: {e}")
     
+    async def close(self):
+        """Close the Telegram HTTP session"""
+        if self.http_session is not None and not self.http_session.closed:
+            await self.http_session.close()
+        self.http_session = None
+    
     def format_signal_alert(self, signal: Signal) -> str:
         """Format signal for Telegram alert"""
         emoji = "[CALL]" if signal.direction == Direction.CALL else "[PUT]"
-        type_emoji = {
-            SignalType.POWER_HOUR: "[PWR]",
-            SignalType.ORB_BREAKOUT: "[ORB]",
-            SignalType.TRAP: "[TRAP]",
-            SignalType.CAPITULATION: "[CAP]",
-            SignalType.EARLY_WARNING: "[WARN]",
-            SignalType.REGULAR: "[REG]"
-        }
-        
-        msg = f"""
-{emoji} <b>BEAST SIGNAL: {signal.symbol}</b> {emoji}
-
-<b>Direction:</b> {signal.direction.value}
-<b>Signal Type:</b> {type_emoji.get(signal.signal_type, "[REG]")} {signal.signal_type.value}
-
-<b>Scores:</b>
-- Strength: {signal.strength_score}/10
-- Quality: {signal.quality_score}/100
-- AI Confidence: {signal.ai_confidence:.0f}%
-
-<b>Levels:</b>
-- Entry: ${signal.entry_price:.2f}
-- Target: ${signal.target_price:.2f}
-- Stop: ${signal.stop_price:.2f}
-
-<b>Option Flow:</b>
-- Calls: {signal.call_pct:.0f}% | Puts: {signal.put_pct:.0f}%
-- Magnet Strike: ${'%.0f' % signal.magnet_strike if signal.magnet_strike else 'N/A'}
-- Unusual Activity: {'YES!' if signal.unusual_activity else 'No'}
-
-<b>Key Levels:</b>
-- VWAP: ${signal.vwap:.2f}
-- ORB: ${signal.orb_low:.2f} - ${signal.orb_high:.2f}
-- Pivot: ${signal.pivot:.2f}
-
-<b>Reasons:</b>
-{chr(10).join(['* ' + r for r in signal.reasons[:5]])}
-
-Time: {signal.timestamp.strftime('%H:%M:%S')}
-"""
-        return msg
+        return ALERT_TEMPLATE.format(
+            s=signal,
+            emoji=emoji,
+            type_tag=SIGNAL_TYPE_TAGS.get(signal.signal_type, "[REG]"),
+            magnet='%.0f' % signal.magnet_strike if signal.magnet_strike else 'N/A',
+            unusual='YES!' if signal.unusual_activity else 'No',
+            reasons="\n".join(['* ' + r for r in signal.reasons[:5]])
+        )
     
     async def send_signal_alert(self, signal: Signal):
         """Send signal alert via Telegram"""
@@ -1308,39 +1872,31 @@ Time: {signal.timestamp.strftime('%H:%M:%S')}
     
     async def generate_morning_brief(self) -> str:
         """Generate morning intelligence brief"""
-        await self.update_market_state()
+        # Fresh VIX/SPY for the brief, never a cached state
+        await self.update_market_state(force=True)
+        now = datetime.now(ET)
         
         # Get key market data
-        spy_df = await self.fetch_bars("SPY", "1Day", 5)
-        qqq_df = await self.fetch_bars("QQQ", "1Day", 5)
-        
-        # Calculate key metrics
-        spy_5d_change = 0
-        qqq_5d_change = 0
-        
-        if not spy_df.empty and len(spy_df) >= 5:
-            spy_5d_change = ((spy_df['close'].iloc[-1] - spy_df['close'].iloc[0]) / 
-                           spy_df['close'].iloc[0] * 100)
-        
-        if not qqq_df.empty and len(qqq_df) >= 5:
-            qqq_5d_change = ((qqq_df['close'].iloc[-1] - qqq_df['close'].iloc[0]) / 
-                           qqq_df['close'].iloc[0] * 100)
+        spy_df, qqq_df = await asyncio.gather(
+            self.fetch_bars("SPY", "1Day", 5),
+            self.fetch_bars("QQQ", "1Day", 5)
+        )
         
-        regime_emoji = {
-            MarketRegime.GREEN: "[GREEN]",
-            MarketRegime.YELLOW: "[YELLOW]",
-            MarketRegime.RED: "[RED]"
-        }
+        # Calculate key metrics: first to last close of the 5 days (0 with fewer bars)
+        spy_5d_change, qqq_5d_change = (
+            self._change_pct(df['close'].to_numpy(), 0) if len(df) >= 5 else 0
+            for df in (spy_df, qqq_df)
+        )
         
         brief = f"""
 ===================================
     BEAST MORNING BRIEF
 ===================================
 
-{datetime.now().strftime('%A, %B %d, %Y')}
-{datetime.now().strftime('%H:%M:%S')} ET
+{now:%A, %B %d, %Y}
+{now:%H:%M:%S} ET
 
-<b>MARKET REGIME:</b> {regime_emoji[self.market_state.regime]} {self.market_state.regime.value}
+<b>MARKET REGIME:</b> {REGIME_TAGS[self.market_state.regime]} {self.market_state.regime.value}
 <b>VIX:</b> {self.market_state.vix:.1f}
 
 <b>INDICES:</b>
@@ -1350,42 +1906,15 @@ Time: {signal.timestamp.strftime('%H:%M:%S')}
 <b>TODAY'S PLAYBOOK:</b>
 """
         
-        if self.market_state.regime == MarketRegime.GREEN:
-            brief += """
-[OK] Full risk-on mode
-[OK] Normal position sizes
-[OK] All signal types valid
-"""
-        elif self.market_state.regime == MarketRegime.YELLOW:
-            brief += """
-[!!] Elevated volatility
-[!!] Reduce position sizes 50%
-[!!] Focus on Power Hour signals only
-"""
-        else:
-            brief += """
-[XX] HIGH VOLATILITY - CAUTION
-[XX] No new trades recommended
-[XX] Wait for VIX to cool down
-"""
-        
-        brief += """
-<b>KEY TIMES TODAY:</b>
-- 9:30-9:45: ORB Phase (watch breakouts)
-- 9:45-11:00: Breakout Phase (best momentum)
-- 11:00-15:00: Reversal Phase (mean reversion)
-- 15:00-16:00: Power Hour (highest conviction)
-
-<b>FOCUS SYMBOLS:</b>
-SPY, QQQ, NVDA, TSLA, AMD, META
-
-===================================
-        BEAST ENGINE READY
-===================================
-"""
+        brief += BRIEF_PLAYBOOK[self.market_state.regime] + BRIEF_FOOTER
         
         return brief
     
+    @staticmethod
+    def _change_pct(close: np.ndarray, i: int) -> float:
+        """% change from close[i] to the last close"""
+        return float((close[-1] - close[i]) / close[i] * 100)
+    
     async def send_morning_brief(self):
         """Send morning brief via Telegram"""
         brief = await self.generate_morning_brief()
@@ -1396,6 +1925,42 @@ SPY, QQQ, NVDA, TSLA, AMD, META
     # MAIN LOOP
     # =========================================================================
     
+    def _session_times(self, day) -> Tuple[datetime, datetime, datetime]:
+        """Market open, scan cutoff and market close (ET) on a given day"""
+        cutoff = dtime(self.config.cutoff_hour, self.config.cutoff_minute)
+        return tuple(datetime.combine(day, t, tzinfo=ET) for t in (MARKET_OPEN, cutoff, MARKET_CLOSE))
+    
+    def _next_tick(self, now: datetime, next_scan_at: Optional[datetime] = None) -> datetime:
+        """
+        When the main loop should wake next (now is ET-aware)
+        
+        Weekends sleep to Monday 00:00; before the open the loop wakes for
+        the morning brief and then the open; during the session it wakes
+        for the next scan, or at the close once that scan would fall past
+        the cutoff.
+        """
+        if now.weekday() >= 5:
+            return datetime.combine(now.date() + timedelta(days=7 - now.weekday()), dtime(), tzinfo=ET)
+        market_open, cutoff, market_close = self._session_times(now.date())
+        if now < market_open - MORNING_BRIEF_LEAD:
+            return market_open - MORNING_BRIEF_LEAD
+        if now < market_open:
+            return market_open
+        if next_scan_at is not None and now < next_scan_at <= cutoff:
+            return next_scan_at
+        return market_close
+    
+    @staticmethod
+    async def _sleep_until(when: datetime):
+        """
+        Sleep until the clock reaches when (re-checked, so never wakes early)
+        Measured in epoch seconds, so a DST change in between doesn't skew it
+        """
+        delay = when.timestamp() - datetime.now(ET).timestamp()
+        while delay > 0:
+            await asyncio.sleep(delay)
+            delay = when.timestamp() - datetime.now(ET).timestamp()
+    
     async def run(self):
         """Main execution loop"""
         self.logger.info("=" * 60)
@@ -1406,59 +1971,60 @@ SPY, QQQ, NVDA, TSLA, AMD, META
         await self.load_universe()
         
         # Send morning brief if market is about to open
-        now = datetime.now()
+        now = datetime.now(ET)
+        brief_date = None
         if now.hour == 9 and now.minute < 30:
             await self.send_morning_brief()
+            brief_date = now.date()
         
-        # Main scanning loop
+        # Main scanning loop: each pass handles the current event, then
+        # sleeps straight to the next one (brief, open, scan, close)
+        next_scan_at = None
         while True:
             try:
-                now = datetime.now()
+                now = datetime.now(ET)
                 
-                # Check if market is open
-                if now.weekday() >= 5:  # Weekend
-                    self.logger.info("[MARKET] Weekend - sleeping 1 hour")
-                    await asyncio.sleep(3600)
+                if now.weekday() >= 5:
+                    self.logger.info("[MARKET] Weekend - sleeping until Monday")
+                    await self._sleep_until(self._next_tick(now))
                     continue
                 
                 # Market hours check (9:30 AM - 4:00 PM ET)
-                market_open = dtime(9, 30)
-                market_close = dtime(16, 0)
-                current_time = now.time()
-                
-                if current_time < market_open:
-                    wait_seconds = (datetime.combine(now.date(), market_open) - now).seconds
-                    self.logger.info(f"[MARKET] Pre-market - waiting {wait_seconds//60} minutes")
-                    
-                    # Send morning brief 5 min before open
-                    if wait_seconds <= 300:
-                        await self.send_morning_brief()
-                    
-                    await asyncio.sleep(min(wait_seconds, 300))
-                    continue
+                market_open, cutoff, market_close = self._session_times(now.date())
                 
-                if current_time > market_close:
+                if now >= market_close:
                     self.logger.info("[MARKET] Market closed - done for today")
                     break
                 
-                # Cutoff time - no new scans
-                cutoff = dtime(self.config.cutoff_hour, self.config.cutoff_minute)
-                if current_time > cutoff:
-                    self.logger.info("[MARKET] Past cutoff - no new scans")
-                    await asyncio.sleep(60)
-                    continue
+                if now < market_open:
+                    self.logger.info(f"[MARKET] Pre-market - waiting {(market_open - now).seconds//60} minutes")
+                    
+                    # Send morning brief 5 min before open (once a day)
+                    if market_open - now <= MORNING_BRIEF_LEAD and brief_date != now.date():
+                        await self.send_morning_brief()
+                        brief_date = now.date()
                 
-                # Run scan
-                signals = await self.scan_market()
+                elif now <= cutoff:
+                    next_scan_at = now + timedelta(seconds=self.config.scan_interval_seconds)
+                    
+                    # Run scan
+                    signals = await self.scan_market()
+                    
+                    # Send alerts for top signals
+                    for signal in signals[:3]:  # Top 3 signals
+                        await self.send_signal_alert(signal)
+                        self.signals_today.append(signal)
+                    
+                    if next_scan_at <= cutoff:
+                        self.logger.info(f"[SCAN] Next scan in {self.config.scan_interval_seconds} seconds")
+                    else:
+                        self.logger.info("[MARKET] Past cutoff - no new scans")
                 
-                # Send alerts for top signals
-                for signal in signals[:3]:  # Top 3 signals
-                    await self.send_signal_alert(signal)
-                    self.signals_today.append(signal)
+                else:
+                    # Cutoff time - no new scans
+                    self.logger.info("[MARKET] Past cutoff - no new scans")
                 
-                # Wait for next scan
-                self.logger.info(f"[SCAN] Next scan in {self.config.scan_interval_seconds} seconds")
-                await asyncio.sleep(self.config.scan_interval_seconds)
+                await self._sleep_until(self._next_tick(now, next_scan_at))
                 
             except KeyboardInterrupt:
                 self.logger.info("[ENGINE] Shutdown requested")
@@ -1494,24 +2060,17 @@ Possible reasons:
 """
         
         # Get additional data
-        df = await self.fetch_bars(symbol, "1Min", 2)
-        daily = await self.fetch_bars(symbol, "1Day", 30)
-        
-        # Calculate more metrics
-        daily_change = 0
-        weekly_change = 0
-        monthly_change = 0
-        
-        if not daily.empty:
-            if len(daily) >= 2:
-                daily_change = ((daily['close'].iloc[-1] - daily['close'].iloc[-2]) / 
-                               daily['close'].iloc[-2] * 100)
-            if len(daily) >= 5:
-                weekly_change = ((daily['close'].iloc[-1] - daily['close'].iloc[-5]) / 
-                                daily['close'].iloc[-5] * 100)
-            if len(daily) >= 22:
-                monthly_change = ((daily['close'].iloc[-1] - daily['close'].iloc[-22]) / 
-                                 daily['close'].iloc[-22] * 100)
+        df, daily = await asyncio.gather(
+            self.fetch_bars(symbol, "1Min", 2),
+            self.fetch_bars(symbol, "1Day", 30)
+        )
+        
+        # Calculate more metrics: change over the last 2 / 5 / 22 daily closes (0 with fewer)
+        daily_close = daily['close'].to_numpy() if not daily.empty else np.empty(0)
+        daily_change, weekly_change, monthly_change = (
+            self._change_pct(daily_close, -bars) if len(daily_close) >= bars else 0
+            for bars in (2, 5, 22)
+        )
         
         analysis = f"""
 ===================================
@@ -1569,24 +2128,23 @@ def load_config() -> Config:
     """Load configuration from yaml or environment"""
     config = Config()
     
-    # Try to load from config.yaml
-    if os.path.exists("config.yaml"):
-        with open("config.yaml", 'r') as f:
-            yaml_config = yaml.safe_load(f)
-            
-            if 'alpaca' in yaml_config:
-                config.alpaca_api_key = yaml_config['alpaca'].get('api_key', '')
-                config.alpaca_api_secret = yaml_config['alpaca'].get('api_secret', '')
-                config.alpaca_paper = yaml_config['alpaca'].get('paper', True)
-            
-            if 'telegram' in yaml_config:
-                config.telegram_bot_token = yaml_config['telegram'].get('bot_token', '')
-                config.telegram_chat_id = yaml_config['telegram'].get('chat_id', '')
-            
-            if 'trading' in yaml_config:
-                config.min_quality_score = yaml_config['trading'].get('min_quality_score', 18)
-                config.min_strength_score = yaml_config['trading'].get('min_strength_score', 6)
-                config.min_confidence = yaml_config['trading'].get('min_confidence', 65.0)
+    # Try to load from config.yaml (parsed once, shared with the patterns command)
+    if os.path.exists(CONFIG_PATH):
+        yaml_config = load_yaml_config() or {}
+        
+        if 'alpaca' in yaml_config:
+            config.alpaca_api_key = yaml_config['alpaca'].get('api_key', '')
+            config.alpaca_api_secret = yaml_config['alpaca'].get('api_secret', '')
+            config.alpaca_paper = yaml_config['alpaca'].get('paper', True)
+        
+        if 'telegram' in yaml_config:
+            config.telegram_bot_token = yaml_config['telegram'].get('bot_token', '')
+            config.telegram_chat_id = yaml_config['telegram'].get('chat_id', '')
+        
+        if 'trading' in yaml_config:
+            config.min_quality_score = yaml_config['trading'].get('min_quality_score', 18)
+            config.min_strength_score = yaml_config['trading'].get('min_strength_score', 6)
+            config.min_confidence = yaml_config['trading'].get('min_confidence', 65.0)
     
     # Override with environment variables
     config.alpaca_api_key = os.getenv('ALPACA_API_KEY', config.alpaca_api_key)
@@ -1619,61 +2177,71 @@ async def main():
     # Initialize engine
     engine = BeastEngine(config)
     
-    # Check for command line arguments
-    if len(sys.argv) > 1:
-        command = sys.argv[1].lower()
-        
-        if command == "scan":
-            # Single scan
-            signals = await engine.scan_market()
-            for signal in signals:
-                print(engine.format_signal_alert(signal))
-        
-        elif command == "query" and len(sys.argv) > 2:
-            # Query specific symbol
-            symbol = sys.argv[2].upper()
-            analysis = await engine.query_symbol(symbol)
-            print(analysis)
-        
-        elif command == "brief":
-            # Send morning brief
-            await engine.send_morning_brief()
-        
-        elif command == "patterns":
-            # Run pattern scanner
-            from pattern_scanner import PatternScanner
-            scanner = PatternScanner(yaml.safe_load(open("config.yaml")))
+    try:
+        # Check for command line arguments
+        if len(sys.argv) > 1:
+            command = sys.argv[1].lower()
             
-            # Quick scan (top 50 stocks)
-            symbols = scanner._get_fallback_universe()[:50]
-            all_patterns = []
+            if command == "scan":
+                # Single scan
+                signals = await engine.scan_market()
+                for signal in signals:
+                    print(engine.format_signal_alert(signal))
             
-            print(f"\nScanning {len(symbols)} stocks for chart patterns...")
+            elif command == "query" and len(sys.argv) > 2:
+                # Query specific symbol
+                symbol = sys.argv[2].upper()
+                analysis = await engine.query_symbol(symbol)
+                print(analysis)
             
-            for symbol in symbols:
-                df = await scanner.fetch_data(symbol, days=5)
-                if not df.empty:
-                    patterns = await scanner.scan_symbol(symbol, df)
-                    all_patterns.extend(patterns)
+            elif command == "brief":
+                # Send morning brief
+                await engine.send_morning_brief()
             
-            # Sort by confidence
-            all_patterns.sort(key=lambda p: p.confidence, reverse=True)
+            elif command == "patterns":
+                # Run pattern scanner
+                from pattern_scanner import PatternScanner
+                scanner = PatternScanner(load_yaml_config())
+                
+                # Quick scan (top 50 stocks)
+                symbols = scanner._get_fallback_universe()[:50]
+                all_patterns = []
+                
+                print(f"\nScanning {len(symbols)} stocks for chart patterns...")
+                
+                # Fetches overlap (up to PATTERN_CONCURRENCY); results keep the symbol order
+                semaphore = asyncio.Semaphore(PATTERN_CONCURRENCY)
+                
+                async def scan_patterns(symbol: str) -> list:
+                    async with semaphore:
+                        df = await scanner.fetch_data(symbol, days=5)
+                    if df.empty:
+                        return []
+                    return await scanner.scan_symbol(symbol, df)
+                
+                for patterns in await asyncio.gather(*map(scan_patterns, symbols)):
+                    all_patterns.extend(patterns)
+                
+                # Sort by confidence
+                all_patterns.sort(key=lambda p: p.confidence, reverse=True)
+                
+                # Display results
+                results = scanner.format_scan_results(all_patterns[:20])
+                print(results)
             
-            # Display results
-            results = scanner.format_scan_results(all_patterns[:20])
-            print(results)
-        
+            else:
+                print(f"Unknown command: {command}")
+                print("Usage:")
+                print("  python beast_engine.py           # Run continuous scanning")
+                print("  python beast_engine.py scan      # Single scan")
+                print("  python beast_engine.py query SPY # Query specific symbol")
+                print("  python beast_engine.py brief     # Send morning brief")
+                print("  python beast_engine.py patterns  # Scan for chart patterns")
         else:
-            print(f"Unknown command: {command}")
-            print("Usage:")
-            print("  python beast_engine.py           # Run continuous scanning")
-            print("  python beast_engine.py scan      # Single scan")
-            print("  python beast_engine.py query SPY # Query specific symbol")
-            print("  python beast_engine.py brief     # Send morning brief")
-            print("  python beast_engine.py patterns  # Scan for chart patterns")
-    else:
-        # Run continuous scanning
-        await engine.run()
+            # Run continuous scanning
+            await engine.run()
+    finally:
+        await engine.close()
 
 
 if __name__ == "__main__":
@@ -30,6 +30,9 @@ from alpaca.data.historical import StockHistoricalDataClient
 from alpaca.data.requests import StockBarsRequest
 from alpaca.data.timeframe import TimeFrame, TimeFrameUnit
 
+from data_cache import bar_columns
+from indicators import NUMBA_AVAILABLE, compute_all, warmup
+
 
 # =============================================================================
 # CONFIGURACION MULTI-PERIODO VALIDADA (90 dias backtest)
@@ -49,6 +52,17 @@ PERIOD_CONFIGS = {
 
 UNIVERSE = ["SPY", "QQQ", "AAPL", "MSFT", "NVDA", "TSLA", "AMD", "META", "GOOGL", "AMZN"]
 
+# Ventana de barras de 15 min que se analiza (dias)
+BARS_DAYS = 3
+
+# Campos de cada barra que pasan al DataFrame
+BAR_FIELDS = ('open', 'high', 'low', 'close', 'volume', 'vwap')
+
+# Columnas de la ultima/penultima barra que usan el conteo de senales y los filtros
+SIGNAL_COLUMNS = ('close', 'vwap', 'ema9', 'ema21', 'ema50', 'macd_hist', 'rsi', 'mom', 'vol_ratio', 'atr', 'adx')
+# Posicion de cada columna en las filas de SIGNAL_COLUMNS
+C_CLOSE, C_VWAP, C_EMA9, C_EMA21, C_EMA50, C_MACD, C_RSI, C_MOM, C_VOL, C_ATR, C_ADX = range(len(SIGNAL_COLUMNS))
+
 # Intervalo de escaneo - cada 15 segundos para captar movimientos rapidos
 SCAN_INTERVAL = 15  # segundos
 
@@ -92,11 +106,17 @@ class BeastFinal:
         tg = config.get('telegram', {})
         self.tg_token = tg.get('bot_token', '')
         self.tg_chat = tg.get('chat_id', '')
+        self.tg_url = f"https://api.telegram.org/bot{self.tg_token}/sendMessage"
+        self.http_session: Optional[aiohttp.ClientSession] = None
         
         self.signals_today: List[Signal] = []
         self.alerts_sent = 0
         self.last_alerts: Dict[str, datetime] = {}  # Para evitar spam - 1 alerta por simbolo cada 5 min
         
+        # Barras e indicadores guardados entre scans (las barras de 15 min casi no cambian cada 15 seg)
+        self.bar_cache: Dict[str, pd.DataFrame] = {}
+        self.indicator_cache: Dict[str, Tuple[pd.DataFrame, np.ndarray]] = {}
+        
         os.makedirs("logs", exist_ok=True)
     
     def log(self, msg: str):
@@ -112,276 +132,301 @@ class BeastFinal:
         """Obtiene configuracion para la hora actual (ET)"""
         return PERIOD_CONFIGS.get(hour_et)
     
-    async def fetch_data(self, symbol: str) -> pd.DataFrame:
+    @staticmethod
+    def bars_to_df(bar_list) -> pd.DataFrame:
+        """Lista de barras de Alpaca -> DataFrame OHLCV + vwap indexado por timestamp"""
+        # Columnas extraidas en bloque (sin un dict por barra ni inferencia de tipos)
+        cols = bar_columns(bar_list, *BAR_FIELDS)
+        index = pd.DatetimeIndex([b.timestamp for b in bar_list], name='timestamp')
+        return pd.DataFrame(dict(zip(BAR_FIELDS, cols)), index=index)
+    
+    async def fetch_all(self, symbols: List[str], start: Optional[datetime] = None) -> Dict[str, pd.DataFrame]:
+        """
+        Barras de 15 min de todos los simbolos en UNA sola peticion a Alpaca
+        (un round-trip por scan en vez de uno por simbolo), de los ultimos
+        BARS_DAYS dias o desde start
+        Devuelve {simbolo: df} en el orden de symbols; los que no traen barras se omiten
+        """
+        req = StockBarsRequest(
+            symbol_or_symbols=list(symbols),
+            timeframe=TimeFrame(15, TimeFrameUnit.Minute),
+            start=start if start is not None else datetime.now() - timedelta(days=BARS_DAYS)
+        )
         try:
-            req = StockBarsRequest(
-                symbol_or_symbols=symbol,
-                timeframe=TimeFrame(15, TimeFrameUnit.Minute),
-                start=datetime.now() - timedelta(days=3)
-            )
-            bars = self.client.get_stock_bars(req)
-            
-            if symbol in bars.data:
-                df = pd.DataFrame([{
-                    'timestamp': b.timestamp,
-                    'open': b.open, 'high': b.high, 'low': b.low,
-                    'close': b.close, 'volume': b.volume, 'vwap': b.vwap
-                } for b in bars.data[symbol]])
-                df['timestamp'] = pd.to_datetime(df['timestamp'])
-                df.set_index('timestamp', inplace=True)
-                return df
-            return pd.DataFrame()
-        except:
-            return pd.DataFrame()
+            # El SDK de Alpaca es sincrono: se corre en un thread para no bloquear el event loop
+            bars = await asyncio.to_thread(self.client.get_stock_bars, req)
+        except Exception as e:
+            self.log(f"[ERROR] Barras: {e}")
+            return {}
+        
+        return {symbol: self.bars_to_df(bars.data[symbol]) for symbol in symbols if bars.data.get(symbol)}
+    
+    async def update_bars(self, symbols: List[str]) -> Dict[str, pd.DataFrame]:
+        """
+        Barras de los ultimos BARS_DAYS dias, guardadas entre scans
+        
+        La primera vez baja la ventana completa. Despues solo pide desde la
+        ultima barra guardada mas vieja, pega esas barras sobre las guardadas
+        (las re-descargadas reemplazan a las viejas, asi la barra en curso se
+        actualiza) y descarta las que salieron de la ventana. Los simbolos que
+        no estan guardados piden la ventana completa en su propia peticion
+        """
+        cached = [symbol for symbol in symbols if symbol in self.bar_cache]
+        missing = [symbol for symbol in symbols if symbol not in self.bar_cache]
+        if not cached:
+            self.bar_cache = await self.fetch_all(symbols)
+            return self.bar_cache
+        
+        since = min(self.bar_cache[symbol].index[-1] for symbol in cached)
+        fetches = [self.fetch_all(cached, start=since.to_pydatetime())]
+        if missing:
+            # Sin barras guardadas (no vinieron antes o salieron de la ventana):
+            # solo desde `since` quedarian sin historia para EMA50/ADX
+            fetches.append(self.fetch_all(missing))
+        new = {}
+        for fetched in await asyncio.gather(*fetches):
+            new.update(fetched)
+        
+        # Mismo inicio de ventana que la peticion completa (Alpaca toma las horas naive como UTC)
+        window_start = pd.Timestamp(datetime.now() - timedelta(days=BARS_DAYS), tz='UTC')
+        frames = {}
+        for symbol in symbols:
+            old, df = self.bar_cache.get(symbol), new.get(symbol)
+            if old is None:
+                if df is None:
+                    continue
+            elif df is not None:
+                df = pd.concat((old, df))
+                df = df[~df.index.duplicated(keep='last')]
+            else:
+                df = old
+            df = df[df.index >= window_start]
+            if len(df):
+                frames[symbol] = df
+        self.bar_cache = frames
+        return frames
     
     def calc_indicators(self, df: pd.DataFrame) -> pd.DataFrame:
         if df.empty or len(df) < 30:
             return df
         
-        close = df['close']
-        high = df['high']
-        low = df['low']
-        volume = df['volume']
-        
-        # RSI
-        delta = close.diff()
-        gain = delta.where(delta > 0, 0).rolling(7).mean()
-        loss = (-delta.where(delta < 0, 0)).rolling(7).mean()
-        rs = gain / loss.replace(0, np.nan)
-        df['rsi'] = 100 - (100 / (1 + rs))
-        
-        # MACD
-        ema_fast = close.ewm(span=6).mean()
-        ema_slow = close.ewm(span=13).mean()
-        df['macd_hist'] = ema_fast - ema_slow - (ema_fast - ema_slow).ewm(span=5).mean()
-        
-        # EMAs
-        df['ema9'] = close.ewm(span=9).mean()
-        df['ema21'] = close.ewm(span=21).mean()
-        df['ema50'] = close.ewm(span=50).mean()
-        
-        # ATR
-        tr = pd.concat([high - low, abs(high - close.shift()), abs(low - close.shift())], axis=1).max(axis=1)
-        df['atr'] = tr.rolling(14).mean()
-        
-        # ADX
-        plus_dm = high.diff()
-        minus_dm = -low.diff()
-        plus_dm = plus_dm.where((plus_dm > minus_dm) & (plus_dm > 0), 0)
-        minus_dm = minus_dm.where((minus_dm > plus_dm) & (minus_dm > 0), 0)
-        atr = df['atr'].replace(0, np.nan)
-        plus_di = 100 * (plus_dm.rolling(14).mean() / atr)
-        minus_di = 100 * (minus_dm.rolling(14).mean() / atr)
-        dx = 100 * abs(plus_di - minus_di) / (plus_di + minus_di).replace(0, np.nan)
-        df['adx'] = dx.rolling(14).mean()
-        
-        # Volume
-        df['vol_sma'] = volume.rolling(20).mean()
-        df['vol_ratio'] = volume / df['vol_sma'].replace(0, np.nan)
-        
-        # Momentum
-        df['mom'] = close.pct_change(5) * 100
-        
-        return df
+        # RSI (Wilder), MACD, EMAs, ATR, ADX, volumen y momentum sobre arrays NumPy
+        # (sin Series intermedias); se pegan al df en un solo concat al final
+        ind = compute_all(
+            df['high'].to_numpy(), df['low'].to_numpy(),
+            df['close'].to_numpy(), df['volume'].to_numpy(),
+            wilder_rsi=True
+        )
+        return pd.concat([df, pd.DataFrame(ind, index=df.index)], axis=1)
     
-    def count_signals(self, row, prev_row=None) -> Tuple[int, int, Dict]:
+    def signal_rows(self, symbol: str, df: pd.DataFrame) -> np.ndarray:
         """
-        Cuenta senales bullish y bearish
+        Penultima y ultima barra de SIGNAL_COLUMNS como array (2, columnas)
+        Se extraen una sola vez con to_numpy y se guardan: si las barras no
+        cambiaron desde el scan anterior, no se recalcula nada
+        """
+        hit = self.indicator_cache.get(symbol)
+        if hit is not None and hit[0].equals(df):
+            return hit[1]
+        
+        rows = self.calc_indicators(df)[list(SIGNAL_COLUMNS)].to_numpy()[-2:]
+        self.indicator_cache[symbol] = (df, rows)
+        return rows
+    
+    @staticmethod
+    def count_signals(cur: np.ndarray, prev: np.ndarray) -> Tuple[np.ndarray, np.ndarray]:
+        """
+        Cuenta senales bullish y bearish de TODOS los simbolos a la vez
+        cur / prev: arrays (n_simbolos, SIGNAL_COLUMNS) con la ultima y la penultima barra
         INCLUYE deteccion de cruces en tiempo real
+        Devuelve (b, s) como arrays de enteros (puntos truncados)
         """
-        b, s = 0, 0
-        factors = {}
+        price, vwap = cur[:, C_CLOSE], cur[:, C_VWAP]
+        ema9, ema21, ema50 = cur[:, C_EMA9], cur[:, C_EMA21], cur[:, C_EMA50]
+        macd, prev_macd = cur[:, C_MACD], prev[:, C_MACD]
+        rsi, mom, vol = cur[:, C_RSI], cur[:, C_MOM], cur[:, C_VOL]
+        
+        b = np.zeros(len(price))
+        s = np.zeros(len(price))
+        
+        # VWAP - con deteccion de cruce (cruce fresco = senal mas fuerte)
+        above_vwap = price > vwap
+        b += above_vwap
+        b += above_vwap & (prev[:, C_CLOSE] <= prev[:, C_VWAP])
+        s += ~above_vwap
+        s += ~above_vwap & (prev[:, C_CLOSE] >= prev[:, C_VWAP])
+        
+        # EMA trend
+        bull_ema = ema9 > ema21
+        b += bull_ema
+        s += ~bull_ema
         
-        price = row['close']
-        vwap = row['vwap']
-        ema9 = row['ema9']
-        ema21 = row['ema21']
+        # Precio vs EMA9 - reaccion rapida
+        above_ema9 = price > ema9
+        b += 0.5 * above_ema9
+        s += 0.5 * ~above_ema9
         
-        # VWAP - con deteccion de cruce
-        if price > vwap:
-            b += 1
+        # EMA stack
+        b += bull_ema & (ema21 > ema50)
+        s += (ema9 < ema21) & (ema21 < ema50)
+        
+        # MACD y su cruce de cero
+        b += macd > 0
+        s += macd < 0
+        b += (macd > 0) & (prev_macd <= 0)
+        s += (macd < 0) & (prev_macd >= 0)
+        
+        # RSI, con extremos para reversiones
+        b += (rsi > 50) & (rsi < 70)
+        s += (rsi > 30) & (rsi < 50)
+        b += rsi < 25  # Oversold reversal
+        s += rsi > 75  # Overbought reversal
+        
+        # Momentum - movimiento reciente; fuerte = mas puntos
+        b += mom > 0.1
+        s += mom < -0.1
+        b += 0.5 * (mom > 0.3)
+        s += 0.5 * (mom < -0.3)
+        
+        # Volume: alto volumen confirma la direccion que va ganando
+        boost = np.where(vol > 1.5, 1.0, np.where(vol > 1.2, 0.5, 0.0))
+        b_leads, s_leads = b > s, s > b
+        b += boost * b_leads
+        s += boost * s_leads
+        
+        return b.astype(np.int64), s.astype(np.int64)
+    
+    @staticmethod
+    def signal_factors(row: np.ndarray, prev_row: np.ndarray) -> Dict:
+        """Factores (texto) de la alerta de un simbolo - solo para los que pasan los filtros"""
+        factors = {}
+        price = row[C_CLOSE]
+        
+        if price > row[C_VWAP]:
             factors['vwap'] = 'ABOVE'
-            # BONUS: Recien cruzo VWAP hacia arriba?
-            if prev_row is not None and prev_row['close'] <= prev_row['vwap']:
-                b += 1  # Cruce fresco = senal mas fuerte
+            if prev_row[C_CLOSE] <= prev_row[C_VWAP]:
                 factors['vwap_cross'] = 'FRESH!'
         else:
-            s += 1
             factors['vwap'] = 'BELOW'
-            if prev_row is not None and prev_row['close'] >= prev_row['vwap']:
-                s += 1
+            if prev_row[C_CLOSE] >= prev_row[C_VWAP]:
                 factors['vwap_cross'] = 'FRESH!'
         
-        # EMA trend - con deteccion de cruce
-        if ema9 > ema21:
-            b += 1
-            factors['ema'] = 'BULL'
-        else:
-            s += 1
-            factors['ema'] = 'BEAR'
-        
-        # Precio vs EMA9 - reaccion rapida
-        if price > ema9:
-            b += 0.5
-            factors['price_ema9'] = 'ABOVE'
-        else:
-            s += 0.5
-            factors['price_ema9'] = 'BELOW'
-        
-        # EMA stack
-        ema50 = row['ema50']
-        if ema9 > ema21 > ema50:
-            b += 1
-            factors['stack'] = 'ALIGNED'
-        elif ema9 < ema21 < ema50:
-            s += 1
+        ema9, ema21, ema50 = row[C_EMA9], row[C_EMA21], row[C_EMA50]
+        factors['ema'] = 'BULL' if ema9 > ema21 else 'BEAR'
+        factors['price_ema9'] = 'ABOVE' if price > ema9 else 'BELOW'
+        if ema9 > ema21 > ema50 or ema9 < ema21 < ema50:
             factors['stack'] = 'ALIGNED'
         
-        # MACD
-        macd = row['macd_hist']
+        macd, prev_macd = row[C_MACD], prev_row[C_MACD]
         if macd > 0:
-            b += 1
             factors['macd'] = 'BULL'
         elif macd < 0:
-            s += 1
             factors['macd'] = 'BEAR'
+        if (macd > 0 and prev_macd <= 0) or (macd < 0 and prev_macd >= 0):
+            factors['macd_cross'] = 'FRESH!'
         
-        # MACD cruce de cero
-        if prev_row is not None:
-            prev_macd = prev_row['macd_hist']
-            if macd > 0 and prev_macd <= 0:
-                b += 1
-                factors['macd_cross'] = 'FRESH!'
-            elif macd < 0 and prev_macd >= 0:
-                s += 1
-                factors['macd_cross'] = 'FRESH!'
-        
-        # RSI
-        rsi = row['rsi']
+        rsi = row[C_RSI]
         factors['rsi'] = f'{rsi:.0f}'
-        if 50 < rsi < 70:
-            b += 1
-        elif 30 < rsi < 50:
-            s += 1
-        # Extremos para reversiones
         if rsi < 25:
-            b += 1  # Oversold reversal
             factors['rsi_extreme'] = 'OVERSOLD'
         elif rsi > 75:
-            s += 1  # Overbought reversal
             factors['rsi_extreme'] = 'OVERBOUGHT'
         
-        # Momentum - movimiento reciente
-        mom = row['mom']
+        mom = row[C_MOM]
         factors['mom'] = f'{mom:+.2f}%'
-        if mom > 0.1:
-            b += 1
-        elif mom < -0.1:
-            s += 1
-        
-        # Momentum fuerte = mas puntos
-        if mom > 0.3:
-            b += 0.5
-            factors['mom_strong'] = 'YES'
-        elif mom < -0.3:
-            s += 0.5
+        if mom > 0.3 or mom < -0.3:
             factors['mom_strong'] = 'YES'
         
-        # Volume
-        vol = row['vol_ratio']
+        vol = row[C_VOL]
         factors['vol'] = f'{vol:.1f}x'
         if vol > 1.5:
-            # Alto volumen confirma direccion
-            if b > s:
-                b += 1
-            elif s > b:
-                s += 1
             factors['vol_confirm'] = 'HIGH'
-        elif vol > 1.2:
-            if b > s:
-                b += 0.5
-            elif s > b:
-                s += 0.5
         
-        factors['adx'] = f'{row["adx"]:.0f}'
-        
-        return int(b), int(s), factors
+        factors['adx'] = f'{row[C_ADX]:.0f}'
+        return factors
     
-    async def analyze_symbol(self, symbol: str, period_cfg: Dict) -> Optional[Signal]:
-        """Analiza un simbolo con la config del periodo actual - detecta cruces en tiempo real"""
-        df = await self.fetch_data(symbol)
-        if df.empty or len(df) < 50:
-            return None
-        
-        df = self.calc_indicators(df)
-        row = df.iloc[-1]
-        prev_row = df.iloc[-2] if len(df) > 1 else None  # Para detectar cruces
+    def analyze_universe(self, frames: Dict[str, pd.DataFrame], period_cfg: Dict) -> List[Signal]:
+        """Analiza todos los simbolos con la config del periodo actual - detecta cruces en tiempo real"""
+        symbols, rows = [], []
+        for symbol, df in frames.items():
+            if len(df) < 50:
+                continue
+            # Un simbolo con datos malos se salta, no tumba el scan de los demas
+            try:
+                row = self.signal_rows(symbol, df)
+            except Exception as e:
+                self.log(f"[ERROR] {symbol}: {e}")
+                continue
+            symbols.append(symbol)
+            rows.append(row)
+        if not symbols:
+            return []
         
-        # Filtro ADX
-        adx = row['adx']
-        if pd.isna(adx) or adx < period_cfg['adx']:
-            return None
+        # Ultima y penultima barra de todos los simbolos apiladas (para detectar cruces)
+        tails = np.stack(rows)
+        cur, prev = tails[:, 1], tails[:, 0]
         
         # Contar senales - incluye deteccion de cruces frescos
-        b, s, factors = self.count_signals(row, prev_row)
+        b, s = self.count_signals(cur, prev)
         min_score = period_cfg['score']
         
-        # Determinar direccion
-        if b > s and b >= min_score:
-            # Verificar condiciones obligatorias para CALL
-            if row['close'] <= row['vwap'] or row['ema9'] <= row['ema21']:
-                return None
-            direction = 'CALL'
-            score = b
-        elif s > b and s >= min_score:
-            # Verificar condiciones obligatorias para PUT
-            if row['close'] >= row['vwap'] or row['ema9'] >= row['ema21']:
-                return None
-            direction = 'PUT'
-            score = s
-        else:
-            return None
+        # Filtro ADX (NaN no pasa)
+        adx_ok = cur[:, C_ADX] >= period_cfg['adx']
         
-        # Calcular targets
-        entry = float(row['close'])
-        atr = float(row['atr'])
+        # Direccion + condiciones obligatorias: CALL arriba de VWAP con EMA9 > EMA21, PUT al reves
+        price, vwap, ema9, ema21 = cur[:, C_CLOSE], cur[:, C_VWAP], cur[:, C_EMA9], cur[:, C_EMA21]
+        is_call = adx_ok & (b > s) & (b >= min_score) & ~(price <= vwap) & ~(ema9 <= ema21)
+        is_put = adx_ok & (s > b) & (s >= min_score) & ~(price >= vwap) & ~(ema9 >= ema21)
         
-        if direction == 'CALL':
-            target = entry + atr * period_cfg['target']
-            stop = entry - atr * period_cfg['stop']
-        else:
-            target = entry - atr * period_cfg['target']
-            stop = entry + atr * period_cfg['stop']
-        
-        return Signal(
-            symbol=symbol,
-            direction=direction,
-            score=score,
-            min_score=min_score,
-            entry=round(entry, 2),
-            target=round(target, 2),
-            stop=round(stop, 2),
-            adx=round(adx, 1),
-            rsi=round(row['rsi'], 1),
-            period=period_cfg['name'],
-            ev=period_cfg['ev'],
-            factors=factors
-        )
+        signals = []
+        for i in np.flatnonzero(is_call | is_put):
+            direction = 'CALL' if is_call[i] else 'PUT'
+            
+            # Calcular targets
+            entry = float(price[i])
+            atr = float(cur[i, C_ATR])
+            side = 1 if direction == 'CALL' else -1
+            target = entry + side * atr * period_cfg['target']
+            stop = entry - side * atr * period_cfg['stop']
+            
+            signals.append(Signal(
+                symbol=symbols[i],
+                direction=direction,
+                score=int(b[i] if direction == 'CALL' else s[i]),
+                min_score=min_score,
+                entry=round(entry, 2),
+                target=round(target, 2),
+                stop=round(stop, 2),
+                adx=round(cur[i, C_ADX], 1),
+                rsi=round(cur[i, C_RSI], 1),
+                period=period_cfg['name'],
+                ev=period_cfg['ev'],
+                factors=self.signal_factors(cur[i], prev[i])
+            ))
+        return signals
     
     async def send_telegram(self, msg: str):
         if not self.tg_token or not self.tg_chat:
             return
         try:
-            url = f"https://api.telegram.org/bot{self.tg_token}/sendMessage"
-            async with aiohttp.ClientSession() as session:
-                await session.post(url, json={
-                    'chat_id': self.tg_chat,
-                    'text': msg,
-                    'parse_mode': 'HTML'
-                })
+            # Una sola sesion para todos los envios: sin handshake TCP/TLS nuevo por mensaje
+            if self.http_session is None or self.http_session.closed:
+                self.http_session = aiohttp.ClientSession(timeout=aiohttp.ClientTimeout(total=10))
+            async with self.http_session.post(self.tg_url, json={
+                'chat_id': self.tg_chat,
+                'text': msg,
+                'parse_mode': 'HTML'
+            }) as response:
+                await response.read()
         except:
             pass
     
+    async def close(self):
+        """Cierra la sesion HTTP de Telegram"""
+        if self.http_session is not None and not self.http_session.closed:
+            await self.http_session.close()
+        self.http_session = None
+    
     def format_alert(self, sig: Signal) -> str:
         pct_target = abs(sig.target - sig.entry) / sig.entry * 100
         pct_stop = abs(sig.stop - sig.entry) / sig.entry * 100
@@ -433,15 +478,12 @@ ADX: {sig.adx} | RSI: {sig.rsi}
         
         self.log(f"[SCAN] {period_cfg['name']} | ADX>{period_cfg['adx']} Score>{period_cfg['score']}")
         
-        signals = []
-        
-        for symbol in UNIVERSE:
-            try:
-                sig = await self.analyze_symbol(symbol, period_cfg)
-                if sig:
-                    signals.append(sig)
-            except:
-                continue
+        frames = await self.update_bars(UNIVERSE)
+        try:
+            signals = self.analyze_universe(frames, period_cfg)
+        except Exception as e:
+            self.log(f"[ERROR] Analisis: {e}")
+            return []
         
         signals.sort(key=lambda s: s.score, reverse=True)
         return signals
@@ -480,6 +522,10 @@ ADX: {sig.adx} | RSI: {sig.rsi}
         self.log("    BEAST FINAL - MULTI-PERIODO")
         self.log("=" * 60)
         
+        # Compilar (o cargar del cache de Numba) los kernels antes del primer scan
+        warmup()
+        self.log(f"[INIT] Kernels de indicadores {'Numba' if NUMBA_AVAILABLE else 'Python'} listos")
+        
         startup = f"""
 <b>BEAST MULTI-PERIODO INICIADO</b>
 
@@ -582,6 +628,7 @@ EV: +{sig.ev:.4f}%
         await beast.send_telegram(beast.format_alert(signals[0]))
         print("[TEST] Enviada!")
     
+    await beast.close()
     return signals
 
 
@@ -593,7 +640,10 @@ async def main():
             config = yaml.safe_load(f)
         
         beast = BeastFinal(config)
-        await beast.run()
+        try:
+            await beast.run()
+        finally:
+            await beast.close()
 
 
 if __name__ == "__main__":
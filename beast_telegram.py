@@ -11,17 +11,28 @@ Uso:
   python beast_telegram.py
 """
 
-import yaml
 import asyncio
 import logging
 from datetime import datetime, timedelta
 from typing import Optional
 import pytz
+import numpy as np
 
 from telegram import Update
 from telegram.ext import Application, CommandHandler, MessageHandler, filters, ContextTypes
 
 from beast_assistant import BeastAssistant
+from data_cache import strike_window
+from indicators import ewm_last, ewm_weights, rsi_sma_last, span_to_alpha
+from session import load_config
+
+# EMA9/21/50 y EMA12/26 (MACD) del cierre; solo se usa el ultimo valor
+ALERT_EMA_ALPHAS = span_to_alpha((9, 21, 50, 12, 26))
+ALERT_EMA_WEIGHTS = ewm_weights(ALERT_EMA_ALPHAS, 121)  # 120 min de barras de 1 minuto
+
+# Simbolos que vigila el scan de alertas y cuantos se analizan a la vez
+ALERT_SYMBOLS = ['SPY', 'QQQ', 'TSLA', 'NVDA', 'AAPL', 'AMD']
+SCAN_CONCURRENCY = 10
 
 # Configurar logging
 logging.basicConfig(
@@ -35,8 +46,7 @@ class BeastTelegramBot:
     """Bot de Telegram con chat interactivo y alertas inteligentes"""
     
     def __init__(self):
-        with open('config.yaml', 'r') as f:
-            self.config = yaml.safe_load(f)
+        self.config = load_config()
         
         self.assistant = BeastAssistant()
         # Support both config formats
@@ -55,6 +65,9 @@ class BeastTelegramBot:
         self.min_score_for_alert = 7  # De 10
         self.min_confidence = 0.80  # 80%
         
+        # Limita las consultas simultaneas a Alpaca/Yahoo durante el scan
+        self.scan_semaphore = asyncio.Semaphore(SCAN_CONCURRENCY)
+        
     async def start(self, update: Update, context: ContextTypes.DEFAULT_TYPE):
         """Comando /start"""
         welcome = """
@@ -97,8 +110,8 @@ Preguntame algo! 🚀
         query = update.message.text
         logger.info(f"Query recibido: {query}")
         
-        # Procesar con el asistente
-        response = self.assistant.process_query(query)
+        # Procesar con el asistente (bloqueante: en un hilo, fuera del event loop)
+        response = await asyncio.to_thread(self.assistant.process_query, query)
         
         # Enviar respuesta (dividir si es muy larga)
         if len(response) > 4000:
@@ -161,18 +174,32 @@ Ultima alerta: {self.last_alert.get('SPY', 'Ninguna')}
     
     async def check_for_alerts(self, app: Application):
         """Revisa el mercado y envia alertas si hay setup perfecto"""
-        symbols = ['SPY', 'QQQ', 'TSLA', 'NVDA', 'AAPL', 'AMD']
+        # Verificar cooldown
+        now = datetime.now()
+        symbols = [
+            s for s in ALERT_SYMBOLS
+            if s not in self.last_alert or (now - self.last_alert[s]).total_seconds() >= self.alert_cooldown
+        ]
         
-        for symbol in symbols:
+        async def analyze(symbol: str):
+            async with self.scan_semaphore:
+                return await asyncio.to_thread(self.analyze_for_alert, symbol)
+        
+        # Las barras de todos los simbolos en una sola peticion; quedan en el
+        # cache del asistente y cada analisis las toma de ahi
+        if symbols:
             try:
-                # Verificar cooldown
-                if symbol in self.last_alert:
-                    elapsed = (datetime.now() - self.last_alert[symbol]).seconds
-                    if elapsed < self.alert_cooldown:
-                        continue
-                
-                # Analizar
-                analysis = self.analyze_for_alert(symbol)
+                await asyncio.to_thread(self.assistant.get_price_data_bulk, symbols, 120)
+            except Exception as e:
+                logger.error(f"Error fetching bars for scan: {e}")
+        
+        # Analizar todos a la vez; el tiempo del scan es el del simbolo mas lento
+        results = await asyncio.gather(*map(analyze, symbols), return_exceptions=True)
+        
+        for symbol, analysis in zip(symbols, results):
+            try:
+                if isinstance(analysis, Exception):
+                    raise analysis
                 
                 if analysis and analysis['should_alert']:
                     await self.send_alert(app, analysis)
@@ -184,40 +211,28 @@ Ultima alerta: {self.last_alert.get('SPY', 'Ninguna')}
     def analyze_for_alert(self, symbol: str) -> Optional[dict]:
         """Analiza un simbolo y determina si merece alerta"""
         try:
-            df = self.assistant.get_price_data(symbol, 120)
-            if df.empty:
+            bars = self.assistant.get_price_data(symbol, 120)
+            if bars is None:
                 return None
             
-            price = df['close'].iloc[-1]
-            vwap = df['vwap'].iloc[-1]
+            close = bars.close
+            price = close[-1]
+            vwap = bars.vwap[-1]
             
             # Calculos tecnicos
-            df['ema9'] = df['close'].ewm(span=9).mean()
-            df['ema21'] = df['close'].ewm(span=21).mean()
-            df['ema50'] = df['close'].ewm(span=50).mean()
-            
-            ema9 = df['ema9'].iloc[-1]
-            ema21 = df['ema21'].iloc[-1]
-            ema50 = df['ema50'].iloc[-1]
+            ema9, ema21, ema50, ema12, ema26 = ewm_last(close, ALERT_EMA_ALPHAS, ALERT_EMA_WEIGHTS)
             
             # RSI
-            delta = df['close'].diff()
-            gain = (delta.where(delta > 0, 0)).rolling(window=14).mean()
-            loss = (-delta.where(delta < 0, 0)).rolling(window=14).mean()
-            rs = gain / loss
-            rsi = (100 - (100 / (1 + rs))).iloc[-1]
+            rsi = rsi_sma_last(close)
             
             # Momentum
-            momentum = ((price - df['close'].iloc[-10]) / df['close'].iloc[-10]) * 100
+            momentum = ((price - close[-10]) / close[-10]) * 100
             
             # MACD
-            ema12 = df['close'].ewm(span=12).mean()
-            ema26 = df['close'].ewm(span=26).mean()
-            macd = (ema12 - ema26).iloc[-1]
+            macd = ema12 - ema26
             
             # ADX (simplificado)
-            tr = df['high'] - df['low']
-            atr = tr.rolling(14).mean().iloc[-1]
+            atr = (bars.high[-14:] - bars.low[-14:]).mean() if len(close) >= 14 else np.nan
             adx = min(abs(momentum) * 10, 50)  # Aproximacion
             
             # Score tecnico
@@ -277,11 +292,8 @@ Ultima alerta: {self.last_alert.get('SPY', 'Ninguna')}
                 calls = opts['calls']
                 puts = opts['puts']
                 
-                calls_near = calls[(calls['strike'] >= price - 10) & (calls['strike'] <= price + 10)]
-                puts_near = puts[(puts['strike'] >= price - 10) & (puts['strike'] <= price + 10)]
-                
-                call_vol = calls_near['volume'].sum()
-                put_vol = puts_near['volume'].sum()
+                call_vol = calls['volume'][strike_window(calls, price - 10, price + 10)].sum()
+                put_vol = puts['volume'][strike_window(puts, price - 10, price + 10)].sum()
                 pcr = put_vol / call_vol if call_vol > 0 else 1
                 
                 if direction == "CALL" and pcr < 0.9:
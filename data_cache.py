@@ -0,0 +1,206 @@
+#!/usr/bin/env python3
+"""
+================================================================================
+    DATA CACHE - Shared market-data cache for the analysis scripts
+================================================================================
+
+    Option chains are reduced to the handful of columns the scripts read,
+    stored as JSON under .cache/ with a short TTL, and handed back as
+    dicts of NumPy arrays sorted by strike. Expiration lists are cached
+    the same way, and Alpaca bar requests are memoized in-process for a
+    few seconds.
+
+    yfinance (and with it pandas) is imported only on a cache miss, so a
+    script whose chain is already cached never loads either.
+================================================================================
+"""
+
+import os
+import json
+import time
+import tempfile
+from operator import attrgetter, methodcaller
+from pathlib import Path
+from types import SimpleNamespace
+from datetime import date, datetime
+from typing import Any, Dict, Optional, Tuple
+
+import numpy as np
+from alpaca.data.requests import StockBarsRequest
+
+CACHE_DIR = Path('.cache')
+
+# Chain columns the scripts actually read
+CHAIN_COLUMNS = ('strike', 'lastPrice', 'bid', 'ask', 'volume', 'openInterest', 'impliedVolatility')
+
+
+class FileCache:
+    """JSON file cache; entries expire ttl_seconds after being written"""
+
+    def __init__(self, directory: Path, ttl_seconds: float = 60):
+        self.directory = Path(directory)
+        self.ttl_seconds = ttl_seconds
+
+    def _path(self, key: str) -> Path:
+        return self.directory / f'{key}.json'
+
+    def get(self, key: str) -> Optional[Any]:
+        path = self._path(key)
+        try:
+            if time.time() - path.stat().st_mtime > self.ttl_seconds:
+                return None
+            with open(path, 'r') as f:
+                return json.load(f)
+        except (OSError, ValueError):
+            return None
+
+    def set(self, key: str, value: Any):
+        self.directory.mkdir(parents=True, exist_ok=True)
+        path = self._path(key)
+        # Unique temp file per write: threads writing the same key never share it
+        fd, tmp = tempfile.mkstemp(dir=path.parent, prefix=f'{key}.', suffix='.tmp')
+        try:
+            with os.fdopen(fd, 'w') as f:
+                json.dump(value, f)
+            os.replace(tmp, path)
+        except BaseException:
+            os.unlink(tmp)
+            raise
+
+
+_chain_cache = FileCache(CACHE_DIR / 'options', ttl_seconds=60)
+_expirations_cache = FileCache(CACHE_DIR / 'expirations', ttl_seconds=60)
+
+BARS_TTL_SECONDS = 30
+BARS_CACHE_SIZE = 32
+_bars_cache: Dict[Tuple[str, str, str], Tuple[float, Any]] = {}
+_tickers: Dict[str, Tuple[date, Any]] = {}  # symbol -> (day, yf.Ticker)
+
+
+def _frame_to_columns(frame) -> Dict[str, list]:
+    """yfinance chain DataFrame -> {column: list}, sorted by strike"""
+    # Drop the unused columns (contractSymbol, currency, ...) before sorting copies the frame
+    frame = frame[list(CHAIN_COLUMNS)].sort_values('strike').fillna(0)
+    return {col: frame[col].tolist() for col in CHAIN_COLUMNS}
+
+
+def _columns_to_arrays(columns: Dict[str, list]) -> Dict[str, np.ndarray]:
+    return {col: np.asarray(values) for col, values in columns.items()}
+
+
+def _ticker(symbol: str, fresh: bool = False):
+    """
+    yf.Ticker per symbol, reused for the rest of the day. A Ticker
+    downloads its expiration list once and never refreshes it, so a new
+    one is made each day and on every expirations refresh (fresh=True).
+    """
+    import yfinance as yf
+    today = date.today()
+    hit = _tickers.get(symbol)
+    if fresh or hit is None or hit[0] != today:
+        hit = (today, yf.Ticker(symbol))
+        _tickers[symbol] = hit
+    return hit[1]
+
+
+def get_expirations(symbol: str) -> Tuple[str, ...]:
+    """Option expiration dates (YYYY-MM-DD), nearest first"""
+    exps = _expirations_cache.get(symbol)
+    if exps is None:
+        exps = list(_ticker(symbol, fresh=True).options)
+        _expirations_cache.set(symbol, exps)
+    return tuple(exps)
+
+
+def load_chain(symbol: str, exp: str) -> SimpleNamespace:
+    """
+    Option chain for one expiration as SimpleNamespace(calls=..., puts=...),
+    each side a dict of NumPy arrays keyed by CHAIN_COLUMNS.
+    """
+    key = f'{symbol}_{exp}'
+    raw = _chain_cache.get(key)
+    if raw is None:
+        chain = _ticker(symbol).option_chain(exp)
+        raw = {
+            'calls': _frame_to_columns(chain.calls),
+            'puts': _frame_to_columns(chain.puts),
+        }
+        _chain_cache.set(key, raw)
+    return SimpleNamespace(
+        calls=_columns_to_arrays(raw['calls']),
+        puts=_columns_to_arrays(raw['puts'])
+    )
+
+
+def get_front_month_chain(symbol: str) -> Tuple[str, SimpleNamespace]:
+    """(nearest expiration, its chain)"""
+    exp = get_expirations(symbol)[0]
+    return exp, load_chain(symbol, exp)
+
+
+def contract(side: Dict[str, np.ndarray], i: int) -> SimpleNamespace:
+    """Row i of a chain side as attributes (c.strike, c.bid, ...)"""
+    return SimpleNamespace(**{col: values[i] for col, values in side.items()})
+
+
+def strike_row(side: Dict[str, np.ndarray], strike: float) -> Optional[SimpleNamespace]:
+    """Contract at an exact strike (binary search on the sorted strikes)"""
+    strikes = side['strike']
+    i = int(np.searchsorted(strikes, strike))
+    if i < len(strikes) and strikes[i] == strike:
+        return contract(side, i)
+    return None
+
+
+def strike_window(side: Dict[str, np.ndarray], lo: float, hi: float) -> slice:
+    """Slice of the contracts with lo <= strike <= hi (strikes are sorted)"""
+    strikes = side['strike']
+    return slice(
+        int(np.searchsorted(strikes, lo)),
+        int(np.searchsorted(strikes, hi, side='right'))
+    )
+
+
+def get_bars(client, symbol: str, timeframe, start: datetime):
+    """
+    client.get_stock_bars() memoized for BARS_TTL_SECONDS.
+
+    The key truncates start to the minute, so back-to-back calls built
+    from datetime.now() share one response.
+    """
+    key = (symbol, timeframe.value, start.isoformat()[:16])
+    now = time.monotonic()
+    hit = _bars_cache.get(key)
+    if hit is not None and now - hit[0] < BARS_TTL_SECONDS:
+        return hit[1]
+
+    bars = client.get_stock_bars(StockBarsRequest(
+        symbol_or_symbols=symbol,
+        timeframe=timeframe,
+        start=start
+    ))
+
+    for k in [k for k, (ts, _) in _bars_cache.items() if now - ts >= BARS_TTL_SECONDS]:
+        del _bars_cache[k]
+    if len(_bars_cache) >= BARS_CACHE_SIZE:
+        del _bars_cache[next(iter(_bars_cache))]
+    _bars_cache[key] = (now, bars)
+    return bars
+
+
+def bar_columns(bar_list, *fields: str) -> np.ndarray:
+    """
+    Float fields of Alpaca bars as a C-contiguous (len(fields), n) array.
+
+    attrgetter pulls all fields of a bar in one C call, so the per-bar
+    work never runs Python bytecode; each row unpacks to a contiguous
+    column (h, l, c = bar_columns(bars, 'high', 'low', 'close')).
+    """
+    rows = np.array(list(map(attrgetter(*fields), bar_list)), dtype=np.float64)
+    return np.ascontiguousarray(rows.reshape(len(bar_list), len(fields)).T)
+
+
+def bar_epochs(bar_list) -> np.ndarray:
+    """Bar timestamps as float64 epoch seconds"""
+    stamps = map(methodcaller('timestamp'), map(attrgetter('timestamp'), bar_list))
+    return np.fromiter(stamps, dtype=np.float64, count=len(bar_list))
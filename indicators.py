@@ -0,0 +1,562 @@
+#!/usr/bin/env python3
+"""
+================================================================================
+    INDICATORS - Shared NumPy / Numba indicator kernels
+================================================================================
+
+    Kernels operate on contiguous float64 NumPy arrays and return NumPy
+    arrays. Numba is optional: without it the same loops run as plain
+    Python, which is fine for the intraday windows these scripts use.
+
+    Kernels are compiled with cache=True, so Numba writes the machine
+    code to __pycache__ and later runs load it instead of recompiling.
+    ``make precompile`` calls warmup() to fill the cache ahead of time.
+    They also release the GIL (nogil=True), so a kernel running on the
+    engine's event loop doesn't block the threads loading option chains.
+
+    Without Numba, the EMA kernels run through scipy.signal.lfilter
+    (the same first-order recurrence, looped in C) when SciPy is there.
+
+    The scanner's strength and quality scores are here too, as scalar
+    kernels over the last-bar indicator values.
+================================================================================
+"""
+
+from typing import Dict, Tuple
+
+import numpy as np
+
+try:
+    from numba import njit
+    NUMBA_AVAILABLE = True
+except ImportError:
+    NUMBA_AVAILABLE = False
+
+    def njit(*args, **kwargs):
+        """No-op stand-in for numba.njit"""
+        if len(args) == 1 and callable(args[0]):
+            return args[0]
+        return lambda func: func
+
+try:
+    from scipy.signal import lfilter
+    SCIPY_AVAILABLE = True
+except ImportError:
+    SCIPY_AVAILABLE = False
+
+
+def span_to_alpha(spans) -> np.ndarray:
+    """EWM span(s) -> smoothing factor(s), alpha = 2 / (span + 1)"""
+    return 2.0 / (np.asarray(spans, dtype=np.float64) + 1.0)
+
+
+@njit(cache=True, nogil=True, fastmath=True)
+def ewm_multi(x, alphas):
+    """
+    Several EMAs of the same series in one sweep.
+
+    Matches pandas ``x.ewm(alpha=a).mean()`` (adjust=True) for every alpha;
+    returns a (len(alphas), len(x)) array, one row per alpha.
+    """
+    n = x.shape[0]
+    k = alphas.shape[0]
+    out = np.empty((k, n))
+    num = np.zeros(k)
+    den = np.zeros(k)
+    for i in range(n):
+        xi = x[i]
+        for j in range(k):
+            decay = 1.0 - alphas[j]
+            num[j] = xi + decay * num[j]
+            den[j] = 1.0 + decay * den[j]
+            out[j, i] = num[j] / den[j]
+    return out
+
+
+@njit(cache=True, nogil=True, fastmath=True)
+def macd_hist(close, fast_alpha, slow_alpha, signal_alpha):
+    """
+    MACD histogram in one sweep: fast EMA - slow EMA, minus the signal
+    EMA of that difference, all adjust=True like ewm_multi. The EMAs and
+    the MACD line are carried as scalars, so only the histogram is stored.
+    """
+    n = close.shape[0]
+    out = np.empty(n)
+    fast_decay = 1.0 - fast_alpha
+    slow_decay = 1.0 - slow_alpha
+    signal_decay = 1.0 - signal_alpha
+    fast_num = fast_den = slow_num = slow_den = signal_num = signal_den = 0.0
+    for i in range(n):
+        x = close[i]
+        fast_num = x + fast_decay * fast_num
+        fast_den = 1.0 + fast_decay * fast_den
+        slow_num = x + slow_decay * slow_num
+        slow_den = 1.0 + slow_decay * slow_den
+        line = fast_num / fast_den - slow_num / slow_den
+        signal_num = line + signal_decay * signal_num
+        signal_den = 1.0 + signal_decay * signal_den
+        out[i] = line - signal_num / signal_den
+    return out
+
+
+@njit(cache=True, nogil=True)
+def ewm_step_noadjust(x, alphas, avg, old_wt):
+    """
+    Advance recursive (adjust=False) EMAs over the values x.
+
+    avg and old_wt carry each EMA's running value and pending weight
+    between calls and are updated in place, so feeding a series in pieces
+    gives the same values as one call. Start a series with avg = x[0]
+    and old_wt = 1. Returns a (len(alphas), len(x)) array.
+    """
+    n = x.shape[0]
+    k = alphas.shape[0]
+    out = np.empty((k, n))
+    for i in range(n):
+        xi = x[i]
+        for j in range(k):
+            a = alphas[j]
+            if avg[j] == avg[j]:
+                old_wt[j] *= 1.0 - a
+                if xi == xi:
+                    if avg[j] != xi:
+                        avg[j] = (old_wt[j] * avg[j] + a * xi) / (old_wt[j] + a)
+                    old_wt[j] = 1.0
+            elif xi == xi:
+                avg[j] = xi
+            out[j, i] = avg[j]
+    return out
+
+
+@njit(cache=True, nogil=True)
+def ewm_multi_noadjust(x, alphas):
+    """
+    Several recursive EMAs of the same series in one sweep.
+
+    Matches pandas ``x.ewm(alpha=a, adjust=False).mean()`` for every alpha,
+    including its NaN handling (leading NaNs stay NaN, later NaNs repeat
+    the previous value and stretch the decay); returns a
+    (len(alphas), len(x)) array, one row per alpha.
+    """
+    k = alphas.shape[0]
+    if x.shape[0] == 0:
+        return np.empty((k, 0))
+    return ewm_step_noadjust(x, alphas, np.full(k, x[0]), np.ones(k))
+
+
+if not NUMBA_AVAILABLE and SCIPY_AVAILABLE:
+    _ewm_multi_loop = ewm_multi
+    _ewm_step_loop = ewm_step_noadjust
+
+    def ewm_multi(x, alphas):
+        """ewm_multi via lfilter: numerator and weight total are both IIR filters"""
+        out = np.empty((alphas.shape[0], x.shape[0]))
+        ones = np.ones_like(x)
+        for j, a in enumerate(alphas):
+            den = [1.0, a - 1.0]
+            out[j] = lfilter([1.0], den, x) / lfilter([1.0], den, ones)
+        return out
+
+    def macd_hist(close, fast_alpha, slow_alpha, signal_alpha):
+        """macd_hist from the lfilter EMAs"""
+        emas = ewm_multi(close, np.array([fast_alpha, slow_alpha]))
+        line = emas[0] - emas[1]
+        return line - ewm_multi(line, np.array([signal_alpha]))[0]
+
+    def ewm_step_noadjust(x, alphas, avg, old_wt):
+        """ewm_step_noadjust via lfilter; NaNs (pandas' special cases) take the loop"""
+        if np.isnan(x).any() or np.isnan(avg).any():
+            return _ewm_step_loop(x, alphas, avg, old_wt)
+        out = np.empty((alphas.shape[0], x.shape[0]))
+        if x.shape[0] == 0:
+            return out
+        for j, a in enumerate(alphas):
+            out[j] = lfilter([a], [1.0, a - 1.0], x, zi=[(1.0 - a) * avg[j]])[0]
+        avg[:] = out[:, -1]
+        old_wt[:] = 1.0
+        return out
+
+
+def ewm_weights(alphas, n: int) -> np.ndarray:
+    """
+    (len(alphas), n) adjust=True EWM weights, oldest bar first:
+    row j is (1 - alphas[j]) ** (n - 1 - i) for bars i = 0..n-1.
+    """
+    decay = 1.0 - np.asarray(alphas, dtype=np.float64)
+    return decay[:, None] ** np.arange(n - 1, -1, -1, dtype=np.float64)
+
+
+def ewm_last(x: np.ndarray, alphas, weights: np.ndarray = None) -> np.ndarray:
+    """
+    Last value of ewm_multi(x, alphas) for every alpha, without the full series.
+
+    The adjust=True EMA at the last bar is a weighted mean of x, so it is
+    one matrix-vector product plus the closed-form weight total
+    (1 - decay**n) / alpha. ``weights`` may be precomputed with
+    ewm_weights() for the longest expected series; only its last len(x)
+    columns are used, and it is rebuilt if x is longer.
+    """
+    alphas = np.asarray(alphas, dtype=np.float64)
+    n = x.shape[0]
+    if weights is None or weights.shape[1] < n:
+        weights = ewm_weights(alphas, n)
+    w = weights[:, weights.shape[1] - n:]
+    return (w @ x) * alphas / (1.0 - (1.0 - alphas) ** n)
+
+
+@njit(cache=True, nogil=True)
+def rolling_mean(x, period):
+    """
+    Running-sum equivalent of pandas ``x.rolling(period).mean()``.
+
+    NaN until the window holds ``period`` valid values. The sum is reset
+    whenever the window holds no non-zero values, so an all-zero window
+    yields exactly 0.0 rather than accumulated rounding error.
+    """
+    n = x.shape[0]
+    out = np.full(n, np.nan)
+    total = 0.0
+    count = 0
+    nonzero = 0
+    for i in range(n):
+        v = x[i]
+        if not np.isnan(v):
+            total += v
+            count += 1
+            if v != 0.0:
+                nonzero += 1
+        if i >= period:
+            old = x[i - period]
+            if not np.isnan(old):
+                total -= old
+                count -= 1
+                if old != 0.0:
+                    nonzero -= 1
+        if nonzero == 0:
+            total = 0.0
+        if count == period:
+            out[i] = total / period
+    return out
+
+
+@njit(cache=True, nogil=True)
+def rsi_sma(close, period):
+    """
+    RSI with gains and losses averaged by rolling means (not Wilder).
+
+    NaN until the first full window and wherever the average loss is 0.
+    """
+    n = close.shape[0]
+    gain = np.zeros(n)
+    loss = np.zeros(n)
+    for i in range(1, n):
+        d = close[i] - close[i - 1]
+        if d > 0:
+            gain[i] = d
+        elif d < 0:
+            loss[i] = -d
+
+    avg_gain = rolling_mean(gain, period)
+    avg_loss = rolling_mean(loss, period)
+    rsi = np.full(n, np.nan)
+    for i in range(n):
+        if avg_loss[i] != 0.0:
+            rsi[i] = 100.0 - 100.0 / (1.0 + avg_gain[i] / avg_loss[i])
+    return rsi
+
+
+@njit(cache=True, nogil=True)
+def rsi_wilder(close, period, avg, out):
+    """
+    RSI with Wilder smoothing, avg = (avg * (period - 1) + x) / period,
+    of the gains and losses. Writes into out (len(close)) and returns it.
+
+    avg holds (avg_gain, avg_loss) at close[0] and is left at the last
+    bar, so passing it back with close starting at that bar continues
+    the series. NaN averages mean no history: they are seeded with the
+    mean of the first period changes and out is NaN before that.
+    out is NaN wherever both averages are 0.
+    """
+    n = close.shape[0]
+    out[:] = np.nan
+    start = 1
+    if np.isnan(avg[0]):
+        if n <= period:
+            return out
+        gain = 0.0
+        loss = 0.0
+        for i in range(1, period + 1):
+            d = close[i] - close[i - 1]
+            if d > 0:
+                gain += d
+            elif d < 0:
+                loss -= d
+        avg[0] = gain / period
+        avg[1] = loss / period
+        start = period + 1
+    if avg[0] + avg[1] > 0.0:
+        out[start - 1] = 100.0 * avg[0] / (avg[0] + avg[1])
+
+    for i in range(start, n):
+        d = close[i] - close[i - 1]
+        gain = d if d > 0 else 0.0
+        loss = -d if d < 0 else 0.0
+        avg[0] = (avg[0] * (period - 1) + gain) / period
+        avg[1] = (avg[1] * (period - 1) + loss) / period
+        if avg[0] + avg[1] > 0.0:
+            out[i] = 100.0 * avg[0] / (avg[0] + avg[1])
+    return out
+
+
+@njit(cache=True, nogil=True)
+def adx_sma(high, low, atr, period):
+    """
+    ADX from rolling-mean +DM/-DM over the given ATR; DX is averaged
+    with another rolling mean. NaN where ATR or +DI + -DI is 0.
+    """
+    n = high.shape[0]
+    plus_dm = np.zeros(n)
+    minus_dm = np.zeros(n)
+    for i in range(1, n):
+        up = high[i] - high[i - 1]
+        down = low[i - 1] - low[i]
+        if up > down and up > 0:
+            plus_dm[i] = up
+        # -DM is compared against the already-filtered +DM (ties go to -DM)
+        if down > plus_dm[i] and down > 0:
+            minus_dm[i] = down
+
+    avg_plus = rolling_mean(plus_dm, period)
+    avg_minus = rolling_mean(minus_dm, period)
+    dx = np.full(n, np.nan)
+    for i in range(n):
+        if atr[i] != 0.0:
+            plus_di = 100.0 * avg_plus[i] / atr[i]
+            minus_di = 100.0 * avg_minus[i] / atr[i]
+            di_sum = plus_di + minus_di
+            if di_sum != 0.0:
+                dx[i] = 100.0 * abs(plus_di - minus_di) / di_sum
+    return rolling_mean(dx, period)
+
+
+@njit(cache=True, nogil=True)
+def adx_wilder(high, low, close, period, state, out):
+    """
+    ADX with Wilder smoothing in one pass: TR and +DM/-DM are summed
+    with sum = sum - sum / period + x, DI = 100 * DM sum / TR sum, and
+    ADX is the Wilder average of DX, seeded with the mean of the first
+    period DX values. Writes into out (len(close)) and returns it.
+
+    state is (TR sum, +DM sum, -DM sum, ADX, changes seen), all 0 for no
+    history, updated in place. Bar 0 only provides the previous H/L/C,
+    so passing state back with the arrays starting at the last bar
+    continues the series. out is NaN until the first ADX (2 * period - 1
+    changes in). DX is 0 where +DI + -DI is 0.
+    """
+    n = close.shape[0]
+    out[:] = np.nan
+    if state[4] >= 2 * period - 1:
+        out[0] = state[3]
+
+    for i in range(1, n):
+        tr = max(high[i] - low[i], abs(high[i] - close[i - 1]), abs(low[i] - close[i - 1]))
+        up = high[i] - high[i - 1]
+        down = low[i - 1] - low[i]
+        plus_dm = up if up > down and up > 0 else 0.0
+        # -DM is compared against the already-filtered +DM (as in adx_sma)
+        minus_dm = down if down > plus_dm and down > 0 else 0.0
+
+        k = state[4] + 1
+        state[4] = k
+        if k <= period:
+            state[0] += tr
+            state[1] += plus_dm
+            state[2] += minus_dm
+        else:
+            state[0] += tr - state[0] / period
+            state[1] += plus_dm - state[1] / period
+            state[2] += minus_dm - state[2] / period
+        if k < period:
+            continue
+
+        dx = 0.0
+        if state[0] != 0.0:
+            plus_di = 100.0 * state[1] / state[0]
+            minus_di = 100.0 * state[2] / state[0]
+            if plus_di + minus_di != 0.0:
+                dx = 100.0 * abs(plus_di - minus_di) / (plus_di + minus_di)
+
+        j = k - period + 1  # DX values so far
+        if j < period:
+            state[3] += dx
+        elif j == period:
+            state[3] = (state[3] + dx) / period
+            out[i] = state[3]
+        else:
+            state[3] = (state[3] * (period - 1) + dx) / period
+            out[i] = state[3]
+    return out
+
+
+@njit(cache=True, nogil=True)
+def rsi_adx(close, high, low, atr, rsi_period, adx_period):
+    """
+    SMA-smoothed RSI and ADX in a single compiled call.
+
+    Same definitions as the pandas version in analyze_spy.py: gains/losses
+    and +DM/-DM are averaged with rolling means, DI uses the given ATR and
+    ADX is the rolling mean of DX. Returns (rsi, adx).
+    """
+    return rsi_sma(close, rsi_period), adx_sma(high, low, atr, adx_period)
+
+
+def rsi_sma_last(close: np.ndarray, period: int = 14) -> float:
+    """
+    Last value of the SMA-smoothed RSI: the mean gain and loss of the last
+    `period` changes, without building the series. NaN until there are
+    `period + 1` closes; 100 when the window has gains but no losses.
+    """
+    if len(close) <= period:
+        return np.nan
+    delta = np.diff(close[-period - 1:])
+    gain = np.maximum(delta, 0.0).mean()
+    loss = np.maximum(-delta, 0.0).mean()
+    with np.errstate(divide='ignore', invalid='ignore'):
+        rs = gain / loss
+    return 100 - (100 / (1 + rs))
+
+
+def true_range(high: np.ndarray, low: np.ndarray, close: np.ndarray) -> np.ndarray:
+    """max(H-L, |H-Cprev|, |L-Cprev|); the first bar has no previous close, so TR = H-L"""
+    c_prev = np.empty_like(close)
+    c_prev[0] = np.nan
+    c_prev[1:] = close[:-1]
+    tr = high - low
+    # Both gaps reuse c_prev and are folded into tr in place (no 3 x n stack);
+    # fmax skips the NaN previous close, like pandas' NaN-skipping max
+    gap = np.abs(high - c_prev)
+    np.fmax(tr, gap, out=tr)
+    np.subtract(low, c_prev, out=gap)
+    np.abs(gap, out=gap)
+    return np.fmax(tr, gap, out=tr)
+
+
+def compute_all(high: np.ndarray, low: np.ndarray, close: np.ndarray, volume: np.ndarray,
+                rsi_period: int = 7, atr_period: int = 14, adx_period: int = 14,
+                ema_spans: Tuple[int, ...] = (9, 21, 50), macd_spans: Tuple[int, int, int] = (6, 13, 5),
+                vol_period: int = 20, mom_period: int = 5,
+                wilder_rsi: bool = False) -> Dict[str, np.ndarray]:
+    """
+    Full indicator stack on float64 column arrays (struct-of-arrays).
+
+    Returns one array per indicator, aligned with the input bars:
+    ema{span} for each span, macd_hist, rsi, atr, adx, vol_ratio and
+    mom (% change over mom_period bars). Defaults are the intraday
+    settings used by analyze_spy.py; wilder_rsi=True swaps the
+    SMA-smoothed RSI for the standard Wilder one.
+    """
+    fast, slow, signal = span_to_alpha(macd_spans)
+    hist = macd_hist(close, fast, slow, signal)
+    emas = ewm_multi(close, span_to_alpha(ema_spans))
+
+    atr = rolling_mean(true_range(high, low, close), atr_period)
+    if wilder_rsi:
+        rsi = rsi_wilder(close, rsi_period, np.full(2, np.nan), np.empty_like(close))
+        adx = adx_sma(high, low, atr, adx_period)
+    else:
+        rsi, adx = rsi_adx(close, high, low, atr, rsi_period, adx_period)
+
+    vol_sma = rolling_mean(volume, vol_period)
+    mom = np.full_like(close, np.nan)
+    with np.errstate(divide='ignore', invalid='ignore'):
+        vol_ratio = np.where(vol_sma != 0, volume / vol_sma, np.nan)
+        mom[mom_period:] = (close[mom_period:] / close[:-mom_period] - 1) * 100
+
+    out = {f'ema{span}': emas[i] for i, span in enumerate(ema_spans)}
+    out.update(macd_hist=hist, rsi=rsi, atr=atr, adx=adx, vol_ratio=vol_ratio, mom=mom)
+    return out
+
+
+@njit(cache=True, nogil=True)
+def strength_score(close, vwap, ema9, ema21, ema50, hist, hist_prev, rsi, volume, vol_sma):
+    """
+    Strength score (0-10) of the last bar, one point per check (Ultimate
+    0DTE Machine Pine Script). A NaN input fails its checks, so pass NaN
+    for what isn't available (hist_prev with one bar, vol_sma without
+    enough history).
+    """
+    score = 0
+    if close > vwap:
+        score += 1
+    if close > ema9:
+        score += 1
+    if close > ema21:
+        score += 1
+    if close > ema50:
+        score += 1
+    if ema9 > ema21:
+        score += 1
+    if ema21 > ema50:
+        score += 1
+    if hist > 0:
+        score += 1
+    if hist > hist_prev:
+        score += 1
+    if 40.0 <= rsi <= 70.0:
+        score += 1
+    if volume > vol_sma * 1.2:
+        score += 1
+    return min(score, 10)
+
+
+@njit(cache=True, nogil=True)
+def quality_score(strength, adx, rsi, hist, hist_prev, call_pct, unusual,
+                  regime_mult, phase_bonus):
+    """
+    Quality score (0-100): strength * 5 plus ADX, RSI, MACD and option
+    flow points, scaled by the regime multiplier (truncated), plus the
+    time-phase bonus. NaN inputs fail their checks.
+    """
+    score = strength * 5
+    if adx > 25:
+        score += 10
+    elif adx > 20:
+        score += 7
+    elif adx > 15:
+        score += 5
+    if 30.0 <= rsi <= 70.0:
+        score += 5
+    if 40.0 <= rsi <= 60.0:
+        score += 5
+    if abs(hist) > 0.1:
+        score += 5
+    if (hist > 0 and hist > hist_prev) or (hist < 0 and hist < hist_prev):
+        score += 5
+    if call_pct > 60:
+        score += 5
+    if unusual:
+        score += 5
+    score = int(score * regime_mult) + phase_bonus
+    return min(score, 100)
+
+
+def warmup():
+    """
+    Compile (or load from cache) every kernel for both writable and
+    read-only float64 inputs; pandas hands out read-only arrays from
+    to_numpy() under copy-on-write.
+    """
+    x = np.linspace(1.0, 2.0, 32)
+    frozen = x.copy()
+    frozen.setflags(write=False)
+    for arr in (x, frozen):
+        ewm_multi(arr, span_to_alpha([9]))
+        macd_hist(arr, 0.3, 0.15, 0.3)
+        ewm_multi_noadjust(arr, span_to_alpha([9]))
+        rolling_mean(arr, 14)
+        rsi_adx(arr, arr, arr, arr, 7, 14)
+        rsi_wilder(arr, 7, np.full(2, np.nan), np.empty(len(arr)))
+        adx_wilder(arr, arr, arr, 14, np.zeros(5), np.empty(len(arr)))
+        compute_all(arr, arr, arr, arr)
+    strength_score(1.0, 1.0, 1.0, 1.0, 1.0, 1.0, 1.0, 50.0, 1.0, 1.0)
+    quality_score(5, 20.0, 50.0, 0.1, 0.0, 50.0, False, 1.0, 0)
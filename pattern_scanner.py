@@ -1039,7 +1039,8 @@ class PatternScanner:
                 start=datetime.now() - timedelta(days=days)
             )
             
-            bars = self.stock_client.get_stock_bars(request)
+            # Blocking HTTP call: run it off the event loop so concurrent fetches overlap
+            bars = await asyncio.to_thread(self.stock_client.get_stock_bars, request)
             
             if symbol in bars.data:
                 df = pd.DataFrame([{
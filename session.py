@@ -0,0 +1,45 @@
+#!/usr/bin/env python3
+"""
+================================================================================
+    SESSION - Shared config and Alpaca client for the analysis scripts
+================================================================================
+
+    Both are built lazily on first use and reused afterwards, so scripts
+    imported into the same process (or called from a dashboard) parse
+    config.yaml and open the Alpaca client only once.
+================================================================================
+"""
+
+from typing import Any, Dict, Optional
+
+import yaml
+from alpaca.data.historical import StockHistoricalDataClient
+
+# libyaml's C loader when PyYAML was built with it, else the pure-Python one
+SafeLoader = getattr(yaml, 'CSafeLoader', yaml.SafeLoader)
+
+CONFIG_PATH = 'config.yaml'
+
+_config: Optional[Dict[str, Any]] = None
+_client: Optional[StockHistoricalDataClient] = None
+
+
+def load_config() -> Dict[str, Any]:
+    """Parsed config.yaml (read once per process)"""
+    global _config
+    if _config is None:
+        with open(CONFIG_PATH, 'r') as f:
+            _config = yaml.load(f, Loader=SafeLoader)
+    return _config
+
+
+def get_client() -> StockHistoricalDataClient:
+    """Process-wide Alpaca historical data client"""
+    global _client
+    if _client is None:
+        config = load_config()
+        _client = StockHistoricalDataClient(
+            config['alpaca']['api_key'],
+            config['alpaca']['api_secret']
+        )
+    return _client